@@ -0,0 +1,86 @@
+"""Decode time per action: linear ABI scan vs. the shared selector index.
+
+Usage:
+    python benchmarks/bench_decode_input.py [--actions 1000]
+"""
+import argparse
+import json
+import time
+from types import SimpleNamespace
+
+from ethpm_types import ContractType, HexBytes
+
+from curve_dao.abi_registry import ABIS_DIR
+from curve_dao.decoder_utils import (
+    _CONTRACT_TYPE_INDEXES,
+    _SELECTOR_INDEXES,
+    build_function_selector,
+    decode_calldata,
+    decode_input,
+)
+
+
+def load_contract(path: str):
+    contract_type = ContractType(abi=json.loads(ABIS_DIR.joinpath(path).read_text()))
+    return SimpleNamespace(contract_type=contract_type)
+
+
+def decode_input_linear(contract, calldata):
+    """The pre-index implementation of `decode_input`, kept as a baseline."""
+    fn_selector = calldata[:4].hex()
+    abi = next(
+        (
+            i
+            for i in contract.contract_type.abi
+            if i.type == "function" and build_function_selector(i) == fn_selector
+        ),
+        None,
+    )
+    return abi, decode_calldata(abi, calldata[4:])
+
+
+def build_actions(contracts, num_actions):
+    # zero-filled calldata for the *last* function of each ABI: worst case for a scan
+    samples = []
+    for contract in contracts:
+        fn = [i for i in contract.contract_type.abi if i.type == "function"][-1]
+        selector = HexBytes(build_function_selector(fn))
+        calldata = HexBytes(selector + b"\x00" * 32 * len(fn.inputs))
+        samples.append((contract, calldata))
+
+    return [samples[i % len(samples)] for i in range(num_actions)]
+
+
+def bench(decode_fn, actions):
+    start = time.perf_counter()
+    for contract, calldata in actions:
+        decode_fn(contract, calldata)
+    return (time.perf_counter() - start) / len(actions)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--actions", type=int, default=1000)
+    args = parser.parse_args()
+
+    contracts = [
+        load_contract("VotingEscrow.json"),
+        load_contract("aragon_interfaces/Voting.json"),
+        load_contract("aragon_interfaces/TokenManager.json"),
+    ]
+    actions = build_actions(contracts, args.actions)
+
+    linear = bench(decode_input_linear, actions)
+
+    _SELECTOR_INDEXES.clear()
+    _CONTRACT_TYPE_INDEXES.clear()
+    indexed = bench(decode_input, actions)
+
+    print(f"actions: {args.actions}")
+    print(f"linear scan:    {linear * 1e6:10.1f} us/action")
+    print(f"selector index: {indexed * 1e6:10.1f} us/action")
+    print(f"speedup:        {linear / indexed:10.1f}x")
+
+
+if __name__ == "__main__":
+    main()
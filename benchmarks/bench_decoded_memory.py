@@ -0,0 +1,82 @@
+"""Memory held by decoded vote history: compact records vs. converted dicts.
+
+Decodes every ownership and parameter vote, then measures (tracemalloc) the
+memory retained by the list of `DecodedVote` records and by the same votes
+as the plain dicts that `to_dict()` returns.
+Descriptions are left out: they are the same text in both forms.
+
+Usage:
+    python benchmarks/bench_decoded_memory.py [--network ethereum:mainnet:alchemy]
+"""
+import argparse
+import gc
+import tracemalloc
+
+import ape
+
+from curve_dao.decoded import DecodedVote
+from curve_dao.vote_reader import get_votes, get_voting_params
+from curve_dao.vote_utils import decode_vote_data, decode_vote_script, get_vote_data
+
+VOTE_TYPES = ("ownership", "parameter")
+
+
+def decode_history(votes):
+    records = []
+    for vote_type, vote_id, vote in votes:
+        try:
+            actions = decode_vote_script(vote["script"])
+        except Exception:
+            # unverified targets: not decodable in either form
+            continue
+        data = get_vote_data(vote_id, vote_type, vote=vote)
+        records.append(
+            DecodedVote(
+                vote_type=vote_type,
+                vote_id=vote_id,
+                description=None,
+                actions=actions,
+                results=decode_vote_data(data, vote_type),
+            )
+        )
+
+    return records
+
+
+def retained(build):
+    gc.collect()
+    tracemalloc.start()
+    value = build()
+    gc.collect()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return value, size
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--network", default="ethereum:mainnet:alchemy")
+    args = parser.parse_args()
+
+    with ape.networks.parse_network_choice(args.network):
+        votes = []
+        for vote_type in VOTE_TYPES:
+            votes_length = get_voting_params(vote_type).votes_length
+            for vote_id, vote in get_votes(vote_type, range(votes_length)).items():
+                votes.append((vote_type, vote_id, vote))
+
+        # first pass warms the contract cache and selector indexes
+        decode_history(votes)
+        records, records_size = retained(lambda: decode_history(votes))
+
+    dicts, dicts_size = retained(lambda: [record.to_dict() for record in records])
+    num_actions = sum(len(record.actions) for record in records)
+
+    print(f"votes:   {len(records)} ({num_actions} actions)")
+    print(f"records: {records_size / 2**20:10.2f} MiB")
+    print(f"dicts:   {dicts_size / 2**20:10.2f} MiB")
+    print(f"ratio:   {dicts_size / records_size:10.2f}x")
+
+
+if __name__ == "__main__":
+    main()
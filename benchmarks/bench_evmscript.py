@@ -0,0 +1,75 @@
+"""EVM script build / parse: bytes concatenation and slicing vs. `evmscript`.
+
+Usage:
+    python benchmarks/bench_evmscript.py [--actions 50 200 1000]
+"""
+import argparse
+import time
+
+from ethpm_types import HexBytes
+
+from curve_dao.addresses import CURVE_DAO_OWNERSHIP
+from curve_dao.evmscript import decode_evm_script, encode_evm_script
+
+AGENT = CURVE_DAO_OWNERSHIP["agent"]
+# agent.execute(gauge proxy, 0, set_killed(gauge, True)) is 228 bytes
+CALLDATA = bytes.fromhex("b61d27f6") + b"\x11" * 224
+
+
+def build_concat(calls):
+    """The pre-codec `prepare_vote_script` loop, kept as a baseline."""
+    evm_script = bytes.fromhex("00000001")
+    for address, agent_calldata in calls:
+        length = bytes.fromhex(hex(len(agent_calldata.hex()) // 2)[2:].zfill(8))
+        evm_script = evm_script + bytes.fromhex(address[2:]) + length + agent_calldata
+    return evm_script
+
+
+def parse_slicing(script):
+    """The pre-codec `decode_vote_script` loop, kept as a baseline."""
+    idx = 4
+    calls = []
+    while idx < len(script):
+        address = script[idx : idx + 20]
+        idx += 20
+        length = int(script[idx : idx + 4].hex(), 16)
+        idx += 4
+        calls.append((address, script[idx : idx + length]))
+        idx += length
+    return calls
+
+
+def bench(fn, arg, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn(arg)
+    return (time.perf_counter() - start) / repeat
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--actions", type=int, nargs="+", default=[50, 200, 1000])
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    print(
+        f"{'actions':>8} {'build (concat)':>15} {'build (codec)':>15} "
+        f"{'parse (slice)':>15} {'parse (codec)':>15}"
+    )
+    for num_actions in args.actions:
+        calls = [(AGENT, CALLDATA)] * num_actions
+        # `getVote` returns the script as HexBytes, whose slices are HexBytes too
+        script = HexBytes(encode_evm_script(calls))
+        assert build_concat(calls) == script
+
+        timings = [
+            bench(build_concat, calls, args.repeat),
+            bench(encode_evm_script, calls, args.repeat),
+            bench(parse_slicing, script, args.repeat),
+            bench(decode_evm_script, script, args.repeat),
+        ]
+        print(f"{num_actions:>8} " + " ".join(f"{t * 1e3:>12.3f} ms" for t in timings))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+"""Import time of the CLI entry points, from `python -X importtime`.
+
+Usage:
+    python benchmarks/bench_import_time.py [--module curve_dao.__main__] [--top 15]
+"""
+import argparse
+import subprocess
+import sys
+
+
+def import_times(module: str):
+    """Returns {imported module: cumulative µs} for a fresh `import module`."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:") :].split("|")
+        times[name.strip()] = int(cumulative)
+    return times
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--module", nargs="+", default=["curve_dao.__main__"])
+    parser.add_argument("--top", type=int, default=15)
+    args = parser.parse_args()
+
+    for module in args.module:
+        times = import_times(module)
+        print(f"{module}: {times[module] / 1000:.1f} ms")
+        slowest = sorted(times.items(), key=lambda item: item[1], reverse=True)
+        slowest = [item for item in slowest if item[0] != module]
+        for name, cumulative in slowest[: args.top]:
+            print(f"  {cumulative / 1000:>8.1f} ms  {name}")
+
+
+if __name__ == "__main__":
+    main()
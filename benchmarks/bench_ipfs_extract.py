@@ -0,0 +1,77 @@
+"""IPFS description extraction: char-by-char scan vs. streaming `extract_json`.
+
+Usage:
+    python benchmarks/bench_ipfs_extract.py [--size-kb 500]
+"""
+import argparse
+import io
+import json
+import tarfile
+import time
+
+from curve_dao.ipfs import IPFS_CHUNK_SIZE, extract_json
+
+
+def build_tar_response(description: str) -> bytes:
+    """Mimics an `api/v0/get` response: the description file in a tar archive."""
+    data = json.dumps({"text": description}).encode()
+    buffer = io.BytesIO()
+    with tarfile.open(fileobj=buffer, mode="w") as tar:
+        info = tarfile.TarInfo("QmBenchmark")
+        info.size = len(data)
+        tar.addfile(info, io.BytesIO(data))
+    return buffer.getvalue()
+
+
+def extract_json_char_scan(content: bytes):
+    """The pre-streaming implementation, kept as a baseline."""
+    response_string = content.decode("utf-8")
+    json_string = []
+    in_json = False
+    for c in response_string:
+        if c == "{":
+            in_json = True
+        if in_json:
+            json_string.append(c)
+        if c == "}":
+            break
+    json_string = "".join(json_string)
+    return json.loads(json_string)
+
+
+def chunked(content: bytes):
+    for i in range(0, len(content), IPFS_CHUNK_SIZE):
+        yield content[i : i + IPFS_CHUNK_SIZE]
+
+
+def bench(fn, *args, repeat=20):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn(*args)
+    return (time.perf_counter() - start) / repeat
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--size-kb", type=int, default=500)
+    args = parser.parse_args()
+
+    line = "Kill gauges of deprecated pools and ramp A for the remaining ones.\n"
+    description = line * (args.size_kb * 1024 // len(line))
+    content = build_tar_response(description)
+
+    scan = bench(extract_json_char_scan, content)
+    streaming = bench(lambda: extract_json(chunked(content)))
+
+    print(f"response size: {len(content) / 1024:.0f} KiB")
+    print(f"char scan:     {scan * 1e3:8.2f} ms")
+    print(f"extract_json:  {streaming * 1e3:8.2f} ms")
+    print(f"speedup:       {scan / streaming:8.1f}x")
+
+    # descriptions with braces: the scan stops at the first "}" and fails
+    content = build_tar_response("set {A: 100} and {fee: 0.04%}")
+    assert extract_json(chunked(content)) == {"text": "set {A: 100} and {fee: 0.04%}"}
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,16 @@
 __all__ = ["smartwallet_checker", "make_vote"]
 
-from curve_dao.modules import smartwallet_checker
 
-from .vote_utils import make_vote
+def __getattr__(name):
+    # resolved on first use, so importing a submodule stays cheap
+    if name == "smartwallet_checker":
+        from curve_dao.modules import smartwallet_checker
+
+        return smartwallet_checker
+
+    if name == "make_vote":
+        from .vote_utils import make_vote
+
+        return make_vote
+
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,112 @@
+"""Standalone decoder: `python -m curve_dao` (or `curve-dao`), without `ape run`.
+
+Only click is imported up front; ape, rich and the decoder are imported by
+the command that needs them, so `--help` and offline decoding start fast.
+"""
+import click
+
+from .decoded import OUTPUT_FORMATS, to_json
+
+NETWORK = "ethereum:mainnet:alchemy"
+
+
+def _console():
+    from rich.console import Console
+
+    return Console()
+
+
+@click.group(short_help="Curve DAO proposal decoder")
+def cli():
+    """
+    Decode Curve DAO proposals
+    """
+
+
+@cli.command(name="decode", short_help="Decode Curve DAO proposal by Vote ID")
+@click.option(
+    "--vote-type",
+    "-t",
+    type=click.Choice(["ownership", "parameter", "emergency"]),
+    required=True,
+)
+@click.option("--vote-id", "-v", type=int, required=True)
+@click.option("--network", default=NETWORK, show_default=True)
+@click.option("--offline", is_flag=True, help="Never fetch the description from IPFS.")
+@click.option(
+    "--format", "output_format", type=click.Choice(OUTPUT_FORMATS), default="rich"
+)
+@click.option("--no-cache", is_flag=True, help="Decode again, ignoring cached votes.")
+def decode(
+    vote_type: str,
+    vote_id: int,
+    network: str,
+    offline: bool,
+    output_format: str,
+    no_cache: bool,
+):
+    import ape
+
+    from .vote_utils import MissingVote, decode_vote
+
+    with ape.networks.parse_network_choice(network):
+        try:
+            decoded = decode_vote(
+                vote_id, vote_type, offline=offline, use_cache=not no_cache
+            )
+        except MissingVote as e:
+            if output_format == "rich":
+                raise click.ClickException(
+                    f"VoteID {vote_id} not found in the {vote_type} DAO voting contract"
+                )
+            click.echo(
+                to_json({"vote_type": vote_type, "vote_id": vote_id, "error": repr(e)})
+            )
+            raise SystemExit(1)
+
+    if output_format == "json":
+        click.echo(to_json(decoded, indent=2))
+    elif output_format == "ndjson":
+        for action in decoded.actions:
+            click.echo(to_json(action))
+    else:
+        _console().log(decoded)
+
+
+@cli.command(
+    name="decode-script",
+    short_help="Decode a raw EVM script offline from the local ABI registry",
+)
+@click.argument("script")
+@click.option(
+    "--bundle",
+    "-b",
+    type=click.Path(exists=True, dir_okay=False),
+    default=None,
+    help="Contract bundle to add to the registry.",
+)
+@click.option(
+    "--format", "output_format", type=click.Choice(OUTPUT_FORMATS), default="rich"
+)
+def decode_script(script: str, bundle, output_format: str):
+    from ethpm_types import HexBytes
+
+    from .abi_registry import get_default_registry
+    from .vote_utils import decode_vote_script
+
+    registry = get_default_registry(bundle_path=bundle)
+    actions = decode_vote_script(HexBytes(script), registry=registry)
+
+    if output_format == "json":
+        click.echo(to_json(actions, indent=2))
+    elif output_format == "ndjson":
+        for action in actions:
+            click.echo(to_json(action))
+    else:
+        console = _console()
+        for action in actions:
+            console.log(action)
+
+
+if __name__ == "__main__":
+    cli()
@@ -0,0 +1,142 @@
+import json
+from importlib.resources import files
+from pathlib import Path
+from typing import Callable, Dict, List, NamedTuple, Optional, Union
+
+from eth_utils import to_checksum_address
+from ethpm_types import ContractType
+
+try:
+    from importlib.resources.abc import Traversable
+except ImportError:
+    from importlib.abc import Traversable
+
+from .addresses import (
+    CURVE_DAO_OWNERSHIP,
+    CURVE_DAO_PARAM,
+    EMERGENCY_DAO,
+    VOTING_ESCROW,
+)
+
+# interfaces shipped as package data, so they load outside the repo checkout
+ABIS_DIR = files(__package__) / "abis"
+
+# bundled interfaces in `ABIS_DIR` and the addresses they describe
+BUNDLED_ABIS = {
+    "aragon_interfaces/Agent.json": [
+        CURVE_DAO_OWNERSHIP["agent"],
+        CURVE_DAO_PARAM["agent"],
+        EMERGENCY_DAO["agent"],
+    ],
+    "aragon_interfaces/Voting.json": [
+        CURVE_DAO_OWNERSHIP["voting"],
+        CURVE_DAO_PARAM["voting"],
+        EMERGENCY_DAO["voting"],
+    ],
+    "VotingEscrow.json": [VOTING_ESCROW],
+}
+
+
+class UnknownContract(KeyError):
+    """Exception raised when the registry holds no ABI for an address."""
+
+
+class OfflineContract(NamedTuple):
+    """Minimal stand-in for an ape `ContractInstance` used by the decoder."""
+
+    address: str
+    contract_type: ContractType
+
+    def __str__(self) -> str:
+        return self.address
+
+
+class AbiRegistry:
+    """Address -> contract type registry for decoding without a provider.
+
+    Contract types are parsed once when registered, and contracts sharing
+    an ABI share one selector index in `decoder_utils`, so lookups are
+    plain dict reads.
+    """
+
+    def __init__(self):
+        self._contracts: Dict[str, OfflineContract] = {}
+
+    def __len__(self) -> int:
+        return len(self._contracts)
+
+    def __contains__(self, address) -> bool:
+        return to_checksum_address(address) in self._contracts
+
+    def register(self, address, contract_type: Union[ContractType, List, Dict]):
+        """Registers an ABI (list), contract type JSON (dict) or ContractType."""
+        if isinstance(contract_type, list):
+            contract_type = ContractType(abi=contract_type)
+        elif isinstance(contract_type, dict):
+            contract_type = ContractType.parse_obj(contract_type)
+
+        address = to_checksum_address(address)
+        self._contracts[address] = OfflineContract(address, contract_type)
+
+    def get_contract(self, address) -> OfflineContract:
+        address = to_checksum_address(address)
+        try:
+            return self._contracts[address]
+        except KeyError:
+            raise UnknownContract(f"No ABI registered for {address}") from None
+
+    def load_bundled_abis(self, abis_dir: Traversable = ABIS_DIR):
+        for path, addresses in BUNDLED_ABIS.items():
+            abi = json.loads(abis_dir.joinpath(path).read_text())
+            contract_type = ContractType(abi=abi)
+            for address in addresses:
+                self.register(address, contract_type)
+
+    def load_contract_bundle(self, bundle_path: Path, chain_id: int = 1):
+        """Loads a bundle written by `contract_cache.export_contract_cache`."""
+        bundle = json.loads(Path(bundle_path).read_text())
+        contract_types = bundle.get("contract_types", {})
+        self._load_entries(bundle["contracts"], chain_id, contract_types.get)
+
+    def load_contract_cache(self, chain_id: int = 1):
+        """Loads every contract type in the local contract cache."""
+        from .contract_cache import CONTRACT_CACHE, get_contract_type
+
+        self._load_entries(
+            (entry for _, entry in CONTRACT_CACHE.items()), chain_id, get_contract_type
+        )
+
+    def _load_entries(self, entries, chain_id: int, get_contract_type: Callable):
+        # entries sharing a codehash share one parsed contract type
+        contract_types: Dict[str, ContractType] = {}
+        for entry in entries:
+            if entry["chain_id"] != chain_id:
+                continue
+
+            codehash = entry.get("codehash")
+            if codehash is None:
+                self.register(entry["address"], entry["contract_type"])
+                continue
+
+            contract_type = contract_types.get(codehash)
+            if contract_type is None:
+                contract_type = get_contract_type(codehash)
+                if contract_type is None:
+                    continue
+                if isinstance(contract_type, dict):
+                    contract_type = ContractType.parse_obj(contract_type)
+                contract_types[codehash] = contract_type
+            self.register(entry["address"], contract_type)
+
+
+def get_default_registry(
+    bundle_path: Optional[Path] = None, chain_id: int = 1
+) -> AbiRegistry:
+    """Registry seeded from the bundled ABIs, the contract cache and a bundle."""
+    registry = AbiRegistry()
+    registry.load_bundled_abis()
+    registry.load_contract_cache(chain_id)
+    if bundle_path is not None:
+        registry.load_contract_bundle(bundle_path, chain_id)
+
+    return registry
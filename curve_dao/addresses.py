@@ -27,6 +27,7 @@ CONVEX_VOTERPROXY = "0x989AEB4D175E16225E39E87D0D97A3360524AD80"
 # 2-coin factory cryptopools only;
 # tricrypto-ng factory admin is already the OWNERSHIP agent
 CRYPTOSWAP_OWNER_PROXY = "0x5a8fdC979ba9b6179916404414F7BA4D8B77C8A1"
+MULTICALL3 = "0xcA11bde05977b3631167028862bE2a173976CA11"
 
 
 def get_dao_voting_contract(vote_type: str):
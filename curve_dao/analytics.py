@@ -0,0 +1,136 @@
+from dataclasses import asdict
+from typing import Iterable, Sequence
+
+import numpy as np
+import pandas as pd
+
+from .decoded import PCT_BASE, VOTE_TIME, is_value_pct
+from .vote_reader import VoteRecord, get_votes, get_voting_params
+
+# wei and percentage columns: object dtype keeps exact python ints (> int64)
+_INT_COLUMNS = ("yea", "nay", "voting_power", "support_required", "min_accept_quorum")
+
+
+def votes_frame(records: Iterable[VoteRecord]) -> pd.DataFrame:
+    """Builds a one-row-per-vote frame from VoteRecords (see `vote_reader`)."""
+    rows = [asdict(record) for record in records]
+    for row in rows:
+        del row["script"]
+
+    df = pd.DataFrame(rows)
+    for column in _INT_COLUMNS:
+        df[column] = df[column].astype(object)
+
+    return df
+
+
+def tally_votes(df: pd.DataFrame) -> pd.DataFrame:
+    """Computes support, quorum and pass / fail status for every vote at once.
+
+    Thresholds are each vote's own `supportRequired` / `minAcceptQuorum`.
+    Pass / fail follows Aragon's `_isValuePct` (see `decoded.is_value_pct`):
+    yes votes must be strictly above `supportRequired` of the votes cast
+    and strictly above `minAcceptQuorum` of the voting power. `quorum` is
+    therefore yes votes over voting power. The float `support` and `quorum`
+    columns are for display and plotting.
+
+    Returns:
+        pd.DataFrame: `df` with tally columns added.
+    """
+    df = df.copy()
+    total = df["yea"] + df["nay"]
+    has_votes = (total > 0) & (df["voting_power"] > 0)
+    # avoid dividing by zero: votes without any votes get 0 support / quorum
+    safe_total = total.where(has_votes, 1)
+    safe_power = df["voting_power"].where(has_votes, 1)
+
+    df["total"] = total
+    df["support_pct"] = (df["yea"] * PCT_BASE // safe_total).where(has_votes, 0)
+    df["quorum_pct"] = (df["yea"] * PCT_BASE // safe_power).where(has_votes, 0)
+    df["support"] = df["support_pct"].astype(float) / PCT_BASE
+    df["quorum"] = df["quorum_pct"].astype(float) / PCT_BASE
+
+    support_met = has_votes & is_value_pct(
+        df["yea"], safe_total, df["support_required"]
+    )
+    quorum_met = has_votes & is_value_pct(
+        df["yea"], safe_power, df["min_accept_quorum"]
+    )
+    support_met = support_met.astype(bool)
+    quorum_met = quorum_met.astype(bool)
+
+    df["passed"] = ~df["open"] & support_met & quorum_met
+    df["status"] = np.select(
+        [
+            df["open"],
+            ~has_votes,
+            df["passed"],
+            ~support_met & ~quorum_met,
+            ~support_met,
+        ],
+        [
+            "Voting Ongoing",
+            "Vote Invalid: No Votes",
+            "Vote Passed",
+            "Vote Failed: Both Support and Quorum Not Met",
+            "Vote Failed: Support Not Met",
+        ],
+        default="Vote Failed: Quorum Not Met",
+    )
+    df["end_date"] = df["start_date"] + VOTE_TIME
+
+    return df
+
+
+def turnout_series(df: pd.DataFrame, freq: str = "MS") -> pd.DataFrame:
+    """Turnout per DAO over time, from a frame returned by `tally_votes`.
+
+    Returns:
+        pd.DataFrame: indexed by (vote_type, period start), with the number
+            of votes, passed votes and the mean / median quorum per period.
+    """
+    start = pd.to_datetime(df["start_date"], unit="s")
+    grouped = df.assign(period=start).groupby(
+        ["vote_type", pd.Grouper(key="period", freq=freq)]
+    )
+    return grouped.agg(
+        votes=("vote_id", "count"),
+        passed=("passed", "sum"),
+        mean_quorum=("quorum", "mean"),
+        median_quorum=("quorum", "median"),
+    )
+
+
+def summarize(df: pd.DataFrame) -> pd.DataFrame:
+    """Per-DAO summary of a frame returned by `tally_votes`."""
+    closed = ~df["open"]
+    return (
+        df.assign(
+            closed=closed,
+            failed=closed & ~df["passed"],
+            executed_passed=df["passed"] & df["executed"],
+        )
+        .groupby("vote_type")
+        .agg(
+            votes=("vote_id", "count"),
+            open=("open", "sum"),
+            passed=("passed", "sum"),
+            failed=("failed", "sum"),
+            executed=("executed_passed", "sum"),
+            mean_support=("support", "mean"),
+            mean_quorum=("quorum", "mean"),
+            max_quorum=("quorum", "max"),
+        )
+    )
+
+
+def get_vote_history(
+    vote_types: Sequence[str] = ("ownership", "parameter", "emergency")
+) -> pd.DataFrame:
+    """Reads every vote of every DAO (batched) and tallies them."""
+    records = []
+    for vote_type in vote_types:
+        votes_length = get_voting_params(vote_type).votes_length
+        records.extend(get_votes(vote_type, range(votes_length)).values())
+
+    return tally_votes(votes_frame(records))
@@ -0,0 +1,121 @@
+import asyncio
+from typing import AsyncIterator, Dict, Mapping, Optional, Sequence, Union
+
+from .decoded import DecodedVote
+from .ipfs import get_description_from_ipfs_hash, get_ipfs_hash_from_vote_id
+from .vote_utils import (
+    decode_vote_script,
+    get_vote,
+    get_vote_script,
+    load_decoded_vote,
+    store_decoded_vote,
+)
+
+# votes decoded concurrently by `decode_votes_async`
+DECODE_CONCURRENCY = 8
+
+
+def _get_description(vote_id, vote_type, snapshot_block, offline, gateways):
+    ipfs_hash = get_ipfs_hash_from_vote_id(
+        vote_type, vote_id, snapshot_block=snapshot_block
+    )
+    description = get_description_from_ipfs_hash(
+        ipfs_hash, offline=offline, gateways=gateways
+    )
+    return ipfs_hash, description
+
+
+async def decode_vote_async(
+    vote_id: int,
+    vote_type: str,
+    vote=None,
+    offline: bool = False,
+    gateways: Sequence[str] = (),
+    use_cache: bool = True,
+) -> DecodedVote:
+    """Async version of `vote_utils.decode_vote`.
+
+    The IPFS description fetch and the script decode are independent, so
+    they run concurrently. ape and requests are blocking, so every stage
+    runs in the default thread pool via `asyncio.to_thread`.
+
+    Returns:
+        DecodedVote: the same result as `vote_utils.decode_vote`.
+    """
+    if vote is None:
+        vote = await asyncio.to_thread(get_vote, vote_id, vote_type)
+
+    cached = load_decoded_vote(vote_id, vote_type, vote, use_cache)
+    if cached is None:
+        (ipfs_hash, description), actions = await asyncio.gather(
+            asyncio.to_thread(
+                _get_description,
+                vote_id,
+                vote_type,
+                vote["snapshotBlock"],
+                offline,
+                gateways,
+            ),
+            asyncio.to_thread(
+                decode_vote_script, get_vote_script(vote_id, vote_type, vote)
+            ),
+        )
+        results = store_decoded_vote(
+            vote_id, vote_type, vote, ipfs_hash, actions, use_cache
+        )
+    else:
+        ipfs_hash, actions, results = cached
+        description = await asyncio.to_thread(
+            get_description_from_ipfs_hash,
+            ipfs_hash,
+            offline=offline,
+            gateways=gateways,
+        )
+
+    return DecodedVote(
+        vote_type=vote_type,
+        vote_id=vote_id,
+        description=description,
+        actions=actions,
+        results=results,
+    )
+
+
+async def decode_votes_async(
+    vote_type: str,
+    votes: Mapping[int, Optional[object]],
+    concurrency: int = DECODE_CONCURRENCY,
+    offline: bool = False,
+    gateways: Sequence[str] = (),
+    use_cache: bool = True,
+) -> AsyncIterator[Union[DecodedVote, Dict]]:
+    """Decodes many votes, at most `concurrency` at a time.
+
+    Args:
+        vote_type (str): ownership / parameter / emergency
+        votes (dict): vote ID -> `getVote` result, or None to fetch it.
+        concurrency (int): maximum number of votes in flight.
+
+    Yields:
+        DecodedVote: `decode_vote` results in completion order. Votes that
+            fail to decode yield a {"vote_type", "vote_id", "error"} dict.
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def _decode(vote_id, vote):
+        async with semaphore:
+            try:
+                return await decode_vote_async(
+                    vote_id,
+                    vote_type,
+                    vote=vote,
+                    offline=offline,
+                    gateways=gateways,
+                    use_cache=use_cache,
+                )
+            except Exception as e:
+                return {"vote_type": vote_type, "vote_id": vote_id, "error": repr(e)}
+
+    tasks = [asyncio.create_task(_decode(*item)) for item in votes.items()]
+    for task in asyncio.as_completed(tasks):
+        yield await task
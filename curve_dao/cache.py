@@ -0,0 +1,129 @@
+import json
+import math
+import os
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Optional
+
+from eth_hash.auto import keccak
+
+CACHE_DIR = Path(
+    os.getenv("CURVE_DAO_CACHE_DIR", Path.home() / ".cache" / "curve_dao")
+).expanduser()
+# share of `max_entries` kept when a full cache is evicted
+EVICT_TO_FRACTION = 0.9
+
+
+class DiskCache:
+    """Content-addressed JSON cache on disk.
+
+    Every entry is stored in its own file named after the keccak hash of
+    its key. Entries older than `ttl` seconds are treated as misses, and
+    once the cache holds more than `max_entries` the least recently used
+    entries are evicted.
+
+    Args:
+        name (str): sub-directory of `CACHE_DIR` to store entries in.
+        ttl (int): seconds an entry stays valid. None never expires.
+        max_entries (int): maximum number of entries. None is unbounded.
+        cache_dir (Path): overrides `CACHE_DIR`.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        ttl: Optional[int] = None,
+        max_entries: Optional[int] = None,
+        cache_dir: Optional[Path] = None,
+    ):
+        self.path = Path(cache_dir or CACHE_DIR) / name
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._num_entries: Optional[int] = None
+
+    def _entry_path(self, key: str) -> Path:
+        digest = keccak(key.encode()).hex()
+        return self.path / digest[:2] / f"{digest}.json"
+
+    def _entry_paths(self):
+        if not self.path.exists():
+            return []
+        return list(self.path.glob("*/*.json"))
+
+    def get(self, key: str, default: Any = None) -> Any:
+        path = self._entry_path(key)
+        try:
+            entry = json.loads(path.read_text())
+        except (FileNotFoundError, json.JSONDecodeError):
+            return default
+
+        if entry["key"] != key:
+            return default
+
+        if self.ttl is not None and time.time() - entry["cached_at"] > self.ttl:
+            return default
+
+        # bump mtime so eviction drops the least recently used entries first
+        os.utime(path)
+        return entry["value"]
+
+    def set(self, key: str, value: Any):
+        path = self._entry_path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        is_new = not path.exists()
+
+        entry = {"key": key, "cached_at": time.time(), "value": value}
+        # a temp file per write: threads and processes may set the same key
+        fd, tmp_path = tempfile.mkstemp(suffix=".tmp", dir=path.parent)
+        try:
+            with os.fdopen(fd, "w") as f:
+                f.write(json.dumps(entry))
+            os.replace(tmp_path, path)
+        except FileNotFoundError:
+            # the directory was cleared meanwhile: the entry is just not cached
+            return
+        finally:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+
+        if is_new and self._num_entries is not None:
+            self._num_entries += 1
+        self._evict()
+
+    def __contains__(self, key: str) -> bool:
+        return self.get(key) is not None
+
+    def __len__(self) -> int:
+        return len(self._entry_paths())
+
+    def items(self):
+        for path in self._entry_paths():
+            try:
+                entry = json.loads(path.read_text())
+            except (FileNotFoundError, json.JSONDecodeError):
+                continue
+            yield entry["key"], entry["value"]
+
+    def clear(self):
+        for path in self._entry_paths():
+            path.unlink(missing_ok=True)
+        self._num_entries = 0
+
+    def _evict(self):
+        if self.max_entries is None:
+            return
+
+        if self._num_entries is None:
+            self._num_entries = len(self)
+
+        if self._num_entries <= self.max_entries:
+            return
+
+        # evict down to a fraction of `max_entries`, so the scan below runs
+        # once per many inserts instead of on every insert past the limit
+        target = math.ceil(self.max_entries * EVICT_TO_FRACTION)
+        paths = sorted(self._entry_paths(), key=lambda p: p.stat().st_mtime)
+        for path in paths[: len(paths) - target]:
+            path.unlink(missing_ok=True)
+        self._num_entries = min(len(paths), target)
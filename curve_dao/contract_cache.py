@@ -0,0 +1,172 @@
+import json
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, Optional
+
+from eth_hash.auto import keccak
+from eth_utils import to_checksum_address
+from ethpm_types import ContractType
+
+from .cache import DiskCache
+
+if TYPE_CHECKING:
+    from ape.contracts import ContractInstance
+
+CONTRACT_CACHE_TTL = 7 * 86400
+CONTRACT_CACHE_MAX_ENTRIES = 10_000
+
+# address -> codehash of the code behind it (the implementation, for proxies)
+CONTRACT_CACHE = DiskCache(
+    "contracts",
+    ttl=CONTRACT_CACHE_TTL,
+    max_entries=CONTRACT_CACHE_MAX_ENTRIES,
+)
+# codehash -> contract type; code never changes, so entries never expire
+CONTRACT_TYPE_CACHE = DiskCache(
+    "contract_types",
+    max_entries=CONTRACT_CACHE_MAX_ENTRIES,
+)
+
+# codehash -> contract type parsed once per process and shared by all clones,
+# which then share one selector index in `decoder_utils` too
+_CONTRACT_TYPES: Dict[str, ContractType] = {}
+
+
+def _cache_key(chain_id: int, address: str) -> str:
+    return f"{chain_id}:{address}"
+
+
+def get_codehash(address: str) -> Optional[str]:
+    """keccak of the code behind `address`: the implementation's for proxies.
+
+    Factory-deployed pools and gauges (minimal proxies of one blueprint)
+    and proxies of one implementation all get the same codehash. Proxy
+    detection is ape's (EIP-1167, EIP-1967, ERC-897 as used by Aragon
+    apps, ...) and only reads the node, never the explorer.
+
+    Returns:
+        str: the codehash, or None if there is no code at `address`.
+    """
+    import ape
+
+    proxy_info = ape.chain.contracts.get_proxy_info(address)
+    code_address = proxy_info.target if proxy_info else address
+    code = bytes(ape.chain.provider.get_code(code_address))
+    if not code:
+        return None
+
+    return keccak(code).hex()
+
+
+def get_contract_type(codehash: str) -> Optional[ContractType]:
+    """Contract type cached for a codehash, parsed at most once per process."""
+    contract_type = _CONTRACT_TYPES.get(codehash)
+    if contract_type is None:
+        cached = CONTRACT_TYPE_CACHE.get(codehash)
+        if cached is None:
+            return None
+        contract_type = _CONTRACT_TYPES[codehash] = ContractType.parse_obj(cached)
+
+    return contract_type
+
+
+def _set_contract_type(codehash: str, contract_type: ContractType):
+    _CONTRACT_TYPES[codehash] = contract_type
+    CONTRACT_TYPE_CACHE.set(codehash, json.loads(contract_type.json()))
+
+
+def _cached_contract_type(entry: Dict) -> Optional[ContractType]:
+    if "codehash" in entry:
+        return get_contract_type(entry["codehash"])
+    # entries from before contract types were keyed by codehash
+    return ContractType.parse_obj(entry["contract_type"])
+
+
+def get_contract(address, chain_id: Optional[int] = None) -> "ContractInstance":
+    """Drop-in replacement for `ape.Contract` backed by `CONTRACT_CACHE`.
+
+    On a hit the contract is built from the cached contract type without
+    touching the explorer or the node. On a miss the codehash behind the
+    address is read from the node (see `get_codehash`): contracts sharing
+    code share one contract type, so only the first of many factory clones
+    is resolved through ape and the explorer.
+
+    Args:
+        address (str | bytes): contract address.
+        chain_id (int): defaults to the connected chain.
+
+    Returns:
+        ContractInstance: the contract at `address`.
+    """
+    import ape
+    from ape.contracts import ContractInstance
+
+    address = to_checksum_address(address)
+    if chain_id is None:
+        chain_id = ape.chain.chain_id
+
+    key = _cache_key(chain_id, address)
+    cached = CONTRACT_CACHE.get(key)
+    if cached is not None:
+        contract_type = _cached_contract_type(cached)
+        if contract_type is not None:
+            return ContractInstance(address, contract_type)
+
+    codehash = get_codehash(address)
+    if codehash is None:
+        # not a contract: let ape raise its usual error
+        return ape.Contract(address)
+
+    contract_type = get_contract_type(codehash)
+    if contract_type is None:
+        # ape returns the implementation's contract type for proxies
+        contract_type = ape.Contract(address).contract_type
+        _set_contract_type(codehash, contract_type)
+
+    CONTRACT_CACHE.set(
+        key, {"address": address, "chain_id": chain_id, "codehash": codehash}
+    )
+    return ContractInstance(address, contract_type)
+
+
+def warm_contract_cache(bundle_path: Path) -> int:
+    """Loads a contract bundle written by `export_contract_cache`.
+
+    Returns:
+        int: number of contracts added to the cache.
+    """
+    bundle = json.loads(Path(bundle_path).read_text())
+    for codehash, contract_type in bundle.get("contract_types", {}).items():
+        CONTRACT_TYPE_CACHE.set(codehash, contract_type)
+    for entry in bundle["contracts"]:
+        address = to_checksum_address(entry["address"])
+        CONTRACT_CACHE.set(_cache_key(entry["chain_id"], address), entry)
+
+    return len(bundle["contracts"])
+
+
+def export_contract_cache(bundle_path: Path) -> int:
+    """Writes every cached contract to a single bundle file.
+
+    Contracts sharing code share one entry in the bundle's
+    `contract_types`, keyed by codehash.
+
+    Returns:
+        int: number of contracts in the bundle.
+    """
+    contracts = []
+    contract_types: Dict[str, Dict] = {}
+    for _, entry in CONTRACT_CACHE.items():
+        codehash = entry.get("codehash")
+        if codehash is not None and codehash not in contract_types:
+            contract_type = CONTRACT_TYPE_CACHE.get(codehash)
+            if contract_type is None:
+                # evicted: the address is resolved again on its next lookup
+                continue
+            contract_types[codehash] = contract_type
+        contracts.append(entry)
+
+    contracts.sort(key=lambda entry: (entry["chain_id"], entry["address"]))
+    bundle: Dict = {"contracts": contracts, "contract_types": contract_types}
+    Path(bundle_path).write_text(json.dumps(bundle, indent=2))
+
+    return len(contracts)
@@ -0,0 +1,324 @@
+import json
+import textwrap
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
+
+if TYPE_CHECKING:
+    from ethpm_types.abi import MethodABI
+
+VOTE_TIME = 604800
+# Aragon percentages (supportRequired, minAcceptQuorum) are scaled by 10**18
+PCT_BASE = 10**18
+# `--format` choices of the decode commands
+OUTPUT_FORMATS = ("rich", "json", "ndjson")
+
+
+def _guessed_tag(guessed: bool, undecoded: bool = False) -> str:
+    if undecoded:
+        return " [red](unknown selector, not decoded)[/]"
+    return " [red](guessed from signature database)[/]" if guessed else ""
+
+
+def is_value_pct(value, total, pct):
+    """Aragon's `_isValuePct`: `value` is strictly above `pct` of `total`.
+
+    Integer math, exactly as the Voting contract, on python ints or
+    elementwise on pandas Series. `total` must not be zero.
+    """
+    return value * PCT_BASE // total > pct
+
+
+def format_fn_inputs(inputs_with_names):
+    if len(inputs_with_names) == 0:
+        return ""
+
+    if len(inputs_with_names) == 1:
+        name, arg = inputs_with_names[0]
+        return f"    └─ [bold]{name}[/]: [yellow]{arg}[/]"
+
+    formatted_args = ""
+    for name, arg in inputs_with_names[:-1]:
+        formatted_args += f"    ├─ [bold]{name}[/]: [yellow]{arg}[/]\n"
+    name, arg = inputs_with_names[-1]
+    formatted_args += f"    └─ [bold]{name}[/]: [yellow]{arg}[/]"
+    return formatted_args
+
+
+class _Record(ABC):
+    """Dict-style read access, so results can be used like the old dicts."""
+
+    __slots__ = ()
+
+    _KEYS: Dict[str, str] = {}
+
+    def __getitem__(self, key: str):
+        return getattr(self, self._KEYS.get(key, key))
+
+    @abstractmethod
+    def to_dict(self) -> Dict:
+        """Plain, lossless JSON-serializable values, without any markup."""
+
+    def __rich__(self) -> str:
+        # rich calls this when printing, so markup is only built when shown
+        return self.formatted_output
+
+
+@dataclass(slots=True)
+class DecodedAction(_Record):
+    """One decoded call of a vote script.
+
+    Holds the raw ABI values (addresses as 20 bytes, see
+    `decoder_utils.compact_values`) and the shared MethodABI; `agent`,
+    `target` and `inputs` are converted for display when read. The
+    decoder is imported on first read, so `--help` and JSON-only callers
+    of this module start fast (see `__main__`).
+    """
+
+    raw_target: bytes
+    method: "MethodABI"
+    raw_inputs: Optional[Tuple]
+    raw_agent: Optional[bytes] = None
+    # calls forwarded by this one, e.g. through a multicall
+    calls: Tuple["DecodedAction", ...] = ()
+
+    @property
+    def agent(self) -> Optional[str]:
+        from eth_utils import to_checksum_address
+
+        if self.raw_agent is None:
+            return None
+        return to_checksum_address(self.raw_agent)
+
+    @property
+    def target(self) -> str:
+        from eth_utils import to_checksum_address
+
+        return to_checksum_address(self.raw_target)
+
+    @property
+    def function(self) -> str:
+        return self.method.name
+
+    @property
+    def guessed(self) -> bool:
+        from .decoder_utils import GuessedMethodABI
+
+        return isinstance(self.method, GuessedMethodABI)
+
+    @property
+    def undecoded(self) -> bool:
+        from .decoder_utils import UndecodedMethodABI
+
+        return isinstance(self.method, UndecodedMethodABI)
+
+    @property
+    def inputs(self) -> List[Tuple[str, Any]]:
+        from .decoder_utils import expand_values
+
+        input_types = [i.canonical_type for i in self.method.inputs]
+        values = expand_values(input_types, self.raw_inputs)
+        return [(i.name, value) for i, value in zip(self.method.inputs, values)]
+
+    @property
+    def json_inputs(self) -> List[Tuple[str, Any]]:
+        from .decoder_utils import json_values
+
+        input_types = [i.canonical_type for i in self.method.inputs]
+        values = json_values(input_types, self.raw_inputs)
+        return [(i.name, value) for i, value in zip(self.method.inputs, values)]
+
+    def to_dict(self) -> Dict:
+        return {
+            "agent": self.agent,
+            "target": self.target,
+            "function": self.function,
+            "inputs": self.json_inputs,
+            "guessed": self.guessed,
+            "undecoded": self.undecoded,
+            "calls": [call.to_dict() for call in self.calls],
+        }
+
+    @property
+    def formatted_output(self) -> str:
+        formatted_inputs = format_fn_inputs(self.inputs)
+        function = (
+            f"[yellow]{self.function}[/]{_guessed_tag(self.guessed, self.undecoded)}"
+        )
+        inputs_branch = "├─" if self.calls else "└─"
+        if self.raw_agent is not None:
+            output = (
+                f"Call via agent: [yellow]{self.agent}[/]\n"
+                f" ├─ [bold]To[/]: [green]{self.target}[/]\n"
+                f" ├─ [bold]Function[/]: {function}\n"
+                f" {inputs_branch} [bold]Inputs[/]: \n{formatted_inputs}\n"
+            )
+        else:
+            output = (
+                f"Direct call\n"
+                f" ├─ [bold]To[/]: [green]{self.target}[/]\n"
+                f" ├─ [bold]Function[/]: {function}\n"
+                f" {inputs_branch} [bold]Inputs[/]: {formatted_inputs}\n"
+            )
+
+        if self.calls:
+            nested = "".join(call.formatted_output for call in self.calls)
+            output += f" └─ [bold]Calls[/]:\n{textwrap.indent(nested, '     ')}"
+        return output
+
+
+@dataclass(slots=True)
+class VoteTally(_Record):
+    """Results of a vote: raw `getVote` integers, with ratios computed on read.
+
+    `support_required` and `min_accept_quorum` are scaled by `PCT_BASE`.
+    """
+
+    _KEYS = {
+        "votingPower": "voting_power",
+        "supportRequired": "support_required",
+        "minAcceptQuorum": "min_accept_quorum",
+    }
+
+    start: int
+    voting_power: int
+    open: bool
+    executed: bool
+    yes: int
+    no: int
+    support_required: int
+    min_accept_quorum: int
+
+    @property
+    def end(self) -> int:
+        return self.start + VOTE_TIME
+
+    @property
+    def support(self) -> float:
+        total = self.yes + self.no
+        if total == 0 or self.voting_power == 0:
+            return 0
+        return self.yes / total
+
+    @property
+    def quorum(self) -> float:
+        # Aragon's quorum counts yes votes only
+        if self.yes + self.no == 0 or self.voting_power == 0:
+            return 0
+        return self.yes / self.voting_power
+
+    @property
+    def required_support(self) -> float:
+        return self.support_required / PCT_BASE
+
+    @property
+    def required_quorum(self) -> float:
+        return self.min_accept_quorum / PCT_BASE
+
+    @property
+    def status(self) -> str:
+        if self.open:
+            return "Voting Ongoing"
+        if self.yes + self.no == 0 or self.voting_power == 0:
+            return "Vote Invalid: No Votes"
+
+        support_met = is_value_pct(self.yes, self.yes + self.no, self.support_required)
+        quorum_met = is_value_pct(self.yes, self.voting_power, self.min_accept_quorum)
+        if support_met and quorum_met:
+            return "Vote Passed"
+        if not support_met and not quorum_met:
+            return "Vote Failed: Both Support and Quorum Not Met"
+        if not support_met:
+            return "Vote Failed: Support Not Met"
+        return "Vote Failed: Quorum Not Met"
+
+    def to_dict(self) -> Dict:
+        return {
+            "start": self.start,
+            "end": self.end,
+            "voting_power": self.voting_power,
+            "open": self.open,
+            "executed": self.executed,
+            "yes": self.yes,
+            "no": self.no,
+            "support": self.support,
+            "quorum": self.quorum,
+            "required_support": self.required_support,
+            "required_quorum": self.required_quorum,
+        }
+
+    @property
+    def formatted_output(self) -> str:
+        status = self.status
+        if status == "Voting Ongoing":
+            pass_status = f"[yellow]{status}[/]"
+        elif status == "Vote Passed":
+            execution_status = (
+                "[green]Executed[/]" if self.executed else "[red]Not Executed[/]"
+            )
+            pass_status = (
+                f"[green]Vote Passed[/] ([grey]Execution Status[/]: {execution_status})"
+            )
+        else:
+            pass_status = f"[red]{status}[/]"
+
+        start = datetime.utcfromtimestamp(self.start).strftime("%Y-%m-%d %H:%M:%S")
+        end = datetime.utcfromtimestamp(self.end).strftime("%Y-%m-%d %H:%M:%S")
+        yes = round(self.yes / 1e18, 2)
+        no = round(self.no / 1e18, 2)
+        support = round(self.support * 100, 2)
+        quorum = round(self.quorum * 100, 2)
+
+        return (
+            f"[bold]Results[/]: {pass_status}\n"
+            f" ├─ [grey]Voting Start Time[/]: {start}\n"
+            f" ├─ [grey]Voting End Time[/]: {end}\n"
+            f" ├─ [green]Votes For[/]: {yes}\n"
+            f" ├─ [red]Votes Against[/]: {no}\n"
+            f" ├─ [blue]Support[/]: {support}% (Required: {self.required_support * 100:g}%)\n"
+            f" └─ [purple]Quorum[/]: {quorum}% (Minimum: {self.required_quorum * 100:g}%)\n"
+        )
+
+
+@dataclass(slots=True)
+class DecodedVote(_Record):
+    """A decoded vote: its description, actions and results."""
+
+    vote_type: str
+    vote_id: int
+    description: Any
+    actions: List[DecodedAction] = field(default_factory=list)
+    results: Optional[VoteTally] = None
+
+    def to_dict(self) -> Dict:
+        return {
+            "vote_type": self.vote_type,
+            "vote_id": self.vote_id,
+            "description": self.description,
+            "actions": [action.to_dict() for action in self.actions],
+            "results": None if self.results is None else self.results.to_dict(),
+        }
+
+    def __rich__(self):
+        from rich.console import Group
+        from rich.pretty import Pretty
+
+        description = self.description
+        if not isinstance(description, str):
+            description = Pretty(description)
+
+        renderables = [description, *self.actions]
+        if self.results is not None:
+            renderables.append(self.results)
+        return Group(*renderables)
+
+
+def to_json(value, indent: Optional[int] = None) -> str:
+    """Serializes decoded results (or lists of them) without any markup."""
+    if isinstance(value, _Record):
+        value = value.to_dict()
+    elif isinstance(value, list):
+        value = [v.to_dict() if isinstance(v, _Record) else v for v in value]
+
+    return json.dumps(value, indent=indent, default=str)
@@ -1,18 +1,36 @@
-from typing import Any, Dict, List, Optional, Tuple, Union
+import sys
+from collections import OrderedDict
+from functools import lru_cache
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple, Union
 
-import ape
-from ape.exceptions import DecodingError
-from ape.utils.abi import Struct
 from eth_abi.exceptions import InsufficientDataBytes
+from eth_abi.grammar import TupleType, parse
 from eth_hash.auto import keccak
-from eth_utils import humanize_hash, is_hex_address, to_checksum_address
+from eth_utils import (
+    humanize_hash,
+    is_hex_address,
+    to_canonical_address,
+    to_checksum_address,
+)
 from ethpm_types import HexBytes
-from ethpm_types.abi import MethodABI
+from ethpm_types.abi import ABIType, MethodABI
+
+from .signature_db import get_signature_db
 
 try:
-    from eth_abi import decode_abi
+    from eth_abi import decode_abi, encode_abi
 except ImportError:
     from eth_abi import decode as decode_abi
+    from eth_abi import encode as encode_abi
+
+if TYPE_CHECKING:
+    from ape.contracts import ContractInstance
+
+
+def _is_struct(value) -> bool:
+    # ape is only imported when needed: a Struct can't exist before that
+    abi_utils = sys.modules.get("ape.utils.abi")
+    return abi_utils is not None and isinstance(value, abi_utils.Struct)
 
 
 def get_type_strings(abi_params: List, substitutions: Optional[Dict] = None) -> List:
@@ -45,6 +63,56 @@ def build_function_selector(abi: Dict) -> str:
     return "0x" + keccak(sig.encode()).hex()[:8]
 
 
+# ABI hash -> {4-byte selector: MethodABI}, shared by every contract with that ABI
+_SELECTOR_INDEXES: Dict[str, Dict[str, MethodABI]] = {}
+# id(contract_type) -> (contract_type, index), least recently used first. Holds
+# a reference so ids stay unique; ContractType supports neither weak references
+# nor hashing, so the map is bounded instead and old contract types are freed.
+_CONTRACT_TYPE_INDEXES: "OrderedDict[int, Tuple[Any, Dict[str, MethodABI]]]" = (
+    OrderedDict()
+)
+CONTRACT_TYPE_INDEXES_SIZE = 1024
+
+
+def get_abi_hash(abi: List) -> str:
+    abi_json = "[" + ",".join(i.json() for i in abi) + "]"
+    return keccak(abi_json.encode()).hex()
+
+
+def build_selector_index(abi: List) -> Dict[str, MethodABI]:
+    index = {}
+    for i in abi:
+        if i.type == "function":
+            # keep the first match, like a linear scan over the ABI would
+            index.setdefault(build_function_selector(i), i)
+
+    return index
+
+
+def get_selector_index(contract_type) -> Dict[str, MethodABI]:
+    """Returns the selector -> MethodABI index for a contract type.
+
+    The index is built once per distinct ABI and shared across all
+    contract types (and hence all contracts) with the same ABI.
+    """
+    cached = _CONTRACT_TYPE_INDEXES.get(id(contract_type))
+    if cached is not None and cached[0] is contract_type:
+        _CONTRACT_TYPE_INDEXES.move_to_end(id(contract_type))
+        return cached[1]
+
+    abi_hash = get_abi_hash(contract_type.abi)
+    index = _SELECTOR_INDEXES.get(abi_hash)
+    if index is None:
+        index = build_selector_index(contract_type.abi)
+        _SELECTOR_INDEXES[abi_hash] = index
+
+    _CONTRACT_TYPE_INDEXES[id(contract_type)] = (contract_type, index)
+    _CONTRACT_TYPE_INDEXES.move_to_end(id(contract_type))
+    if len(_CONTRACT_TYPE_INDEXES) > CONTRACT_TYPE_INDEXES_SIZE:
+        _CONTRACT_TYPE_INDEXES.popitem(last=False)
+    return index
+
+
 def decode_address(raw_address):
     if isinstance(raw_address, int):
         raw_address = HexBytes(raw_address)
@@ -79,49 +147,223 @@ def decode_value(value):
         decoded_values = [decode_value(v) for v in value]
         return decoded_values
 
-    elif isinstance(value, Struct):
+    elif _is_struct(value):
         decoded_values = {k: decode_value(v) for k, v in value.items()}
         return decoded_values
 
     return value
 
 
-def decode_calldata(
-    method: MethodABI,
-    raw_data: bytes,
-) -> List:
+@lru_cache(maxsize=None)
+def _parse_type(type_str: str):
+    return parse(type_str)
+
+
+def _compact(abi_type, value):
+    if abi_type.is_array:
+        return tuple(_compact(abi_type.item_type, v) for v in value)
+    if isinstance(abi_type, TupleType):
+        return tuple(_compact(t, v) for t, v in zip(abi_type.components, value))
+    if abi_type.base == "address":
+        return to_canonical_address(value)
+    return value
+
+
+def _expand(abi_type, value):
+    if abi_type.is_array:
+        return [_expand(abi_type.item_type, v) for v in value]
+    if isinstance(abi_type, TupleType):
+        return [_expand(t, v) for t, v in zip(abi_type.components, value)]
+    if abi_type.base == "address":
+        return to_checksum_address(value)
+    if abi_type.base == "bytes":
+        # shown like ape-decoded bytes: as text, or hex / a humanized hash
+        return HexBytes(value)
+    return value
+
+
+def compact_values(input_types: List[str], values) -> Tuple:
+    """Raw ABI values, with addresses (at any depth) as their 20 bytes."""
+    return tuple(_compact(_parse_type(t), v) for t, v in zip(input_types, values))
+
+
+def expand_values(input_types: List[str], raw_values: Optional[Tuple]) -> List:
+    """Converts `compact_values` output to the values `decode_calldata` returns."""
+    if raw_values is None:
+        return ["<?>" for _ in input_types]
+
+    return [
+        decode_value(_expand(_parse_type(t), v))
+        for t, v in zip(input_types, raw_values)
+    ]
+
+
+def _to_json(abi_type, value):
+    if abi_type.is_array:
+        return [_to_json(abi_type.item_type, v) for v in value]
+    if isinstance(abi_type, TupleType):
+        return [_to_json(t, v) for t, v in zip(abi_type.components, value)]
+    if abi_type.base == "address":
+        return to_checksum_address(value)
+    if abi_type.base == "bytes":
+        return "0x" + bytes(value).hex()
+    return value
+
+
+def json_values(input_types: List[str], raw_values: Optional[Tuple]) -> List:
+    """Converts `compact_values` output to lossless JSON-serializable values.
+
+    Unlike `expand_values`, nothing is converted for display: addresses are
+    checksummed, bytes are full 0x-prefixed hex and strings are unquoted.
+    """
+    if raw_values is None:
+        return [None for _ in input_types]
+
+    return [_to_json(_parse_type(t), v) for t, v in zip(input_types, raw_values)]
+
+
+def encode_values(input_types: List[str], raw_values: Tuple) -> bytes:
+    """ABI-encodes `compact_values` output (inverse of `decode_calldata`)."""
+    return encode_abi(
+        input_types,
+        [_expand(_parse_type(t), v) for t, v in zip(input_types, raw_values)],
+    )
+
+
+def decode_calldata(method: MethodABI, raw_data: bytes, convert: bool = True):
+    """Decodes the arguments of a call to `method`.
+
+    Args:
+        method (MethodABI): the called function.
+        raw_data (bytes): calldata without the selector.
+        convert (bool): convert values for display (see `decode_value`).
+            If False, returns `compact_values` output, or None when the
+            calldata is too short.
+
+    Returns:
+        list: converted values, or a tuple of raw values.
+    """
     input_types = [i.canonical_type for i in method.inputs]  # type: ignore
 
     try:
 
         raw_input_values = decode_abi(input_types, raw_data)
-        input_values = [decode_value(v) for v in raw_input_values]
 
-    except (DecodingError, InsufficientDataBytes):
+    except InsufficientDataBytes:
+
+        return ["<?>" for _ in input_types] if convert else None
+
+    if not convert:
+        return compact_values(input_types, raw_input_values)
+    return [decode_value(v) for v in raw_input_values]
 
-        input_values = ["<?>" for _ in input_types]
 
-    return input_values
+class GuessedMethodABI(MethodABI):
+    """MethodABI rebuilt from a text signature in the signature database.
+
+    Argument names are unknown (`arg0`, `arg1`, ...) and the signature is
+    only the first one that decodes the calldata, so it may be wrong.
+    """
+
+
+class UndecodedMethodABI(MethodABI):
+    """Stand-in for a selector found neither in the ABI nor the signature DB.
+
+    Named after the selector, with the calldata after it as a single
+    `calldata` bytes input, so the call is kept but flagged as undecoded.
+    """
+
+
+@lru_cache(maxsize=None)
+def undecoded_method(selector: str) -> UndecodedMethodABI:
+    return UndecodedMethodABI(
+        type="function",
+        name=selector,
+        inputs=[ABIType(name="calldata", type="bytes")],
+    )
+
+
+def split_type_list(types_str: str) -> List[str]:
+    """Splits "uint256,(address,bool)[],bytes" at its top-level commas."""
+    types, depth, start = [], 0, 0
+    for i, c in enumerate(types_str):
+        if c == "(":
+            depth += 1
+        elif c == ")":
+            depth -= 1
+        elif c == "," and depth == 0:
+            types.append(types_str[start:i])
+            start = i + 1
+
+    if types_str:
+        types.append(types_str[start:])
+    return types
+
+
+def _abi_type_from_string(type_str: str, name: str = "") -> ABIType:
+    if not type_str.startswith("("):
+        return ABIType(name=name, type=type_str)
+
+    end = type_str.rindex(")")
+    components = [_abi_type_from_string(t) for t in split_type_list(type_str[1:end])]
+    return ABIType(name=name, type=f"tuple{type_str[end + 1:]}", components=components)
+
+
+def method_abi_from_signature(signature: str) -> GuessedMethodABI:
+    name, _, types_str = signature.partition("(")
+    if not types_str.endswith(")"):
+        raise ValueError(f"Invalid function signature: {signature}")
+
+    inputs = [
+        _abi_type_from_string(type_str, f"arg{i}")
+        for i, type_str in enumerate(split_type_list(types_str[:-1]))
+    ]
+    return GuessedMethodABI(type="function", name=name, inputs=inputs)
+
+
+def guess_method(
+    calldata: HexBytes, convert: bool = True
+) -> Optional[Tuple[GuessedMethodABI, List]]:
+    """Decodes calldata with the first matching signature in the signature DB."""
+    signature_db = get_signature_db()
+    if signature_db is None:
+        return None
+
+    for signature in signature_db.lookup(bytes(calldata[:4])):
+        try:
+            abi = method_abi_from_signature(signature)
+            input_types = [i.canonical_type for i in abi.inputs]
+            raw_input_values = decode_abi(input_types, bytes(calldata[4:]))
+        except Exception:
+            # malformed signature, or calldata that doesn't fit it
+            continue
+
+        if not convert:
+            return abi, compact_values(input_types, raw_input_values)
+        return abi, [decode_value(v) for v in raw_input_values]
+
+    return None
 
 
 def decode_input(
-    contract: ape.Contract, calldata: Union[str, bytes]
+    contract: "ContractInstance", calldata: Union[str, bytes], convert: bool = True
 ) -> Tuple[str, Any]:
 
     if not isinstance(calldata, HexBytes):
         calldata = HexBytes(calldata)
 
     fn_selector = calldata[:4].hex()  # type: ignore
-    abi = next(
-        (
-            i
-            for i in contract.contract_type.abi
-            if i.type == "function" and build_function_selector(i) == fn_selector
-        ),
-        None,
-    )
+    abi = get_selector_index(contract.contract_type).get(fn_selector)
 
     if abi is None:
-        raise ValueError("Four byte selector does not match the ABI for this contract")
+        guess = guess_method(calldata, convert)
+        if guess is not None:
+            return guess
+
+        # unknown selector: keep the raw calldata instead of failing the vote
+        data = bytes(calldata[4:])
+        if not convert:
+            return undecoded_method(fn_selector), (data,)
+        return undecoded_method(fn_selector), [decode_value(HexBytes(data))]
 
-    return abi, decode_calldata(abi, calldata[4:])
+    return abi, decode_calldata(abi, calldata[4:], convert)
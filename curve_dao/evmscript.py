@@ -0,0 +1,101 @@
+"""Codec for Aragon EVM scripts (CallsScript, spec ID 1).
+
+A script is the 4-byte spec ID followed by one segment per call:
+
+    [ 20 bytes target address ][ 4 bytes calldata length ][ calldata ]
+"""
+from typing import Iterable, Iterator, List, Tuple, Union
+
+from eth_utils import to_canonical_address
+
+CALLSCRIPT_ID = b"\x00\x00\x00\x01"
+ADDRESS_LENGTH = 20
+LENGTH_SIZE = 4
+MAX_CALLDATA_LENGTH = 2**32 - 1
+
+
+class InvalidEVMScript(ValueError):
+    """Exception raised when an EVM script cannot be decoded."""
+
+
+def _address_bytes(address: Union[str, bytes]) -> bytes:
+    if isinstance(address, str) and len(address) == 42:
+        address_bytes = bytes.fromhex(address[2:])
+    elif isinstance(address, (bytes, bytearray)) and len(address) == ADDRESS_LENGTH:
+        address_bytes = bytes(address)
+    else:
+        address_bytes = to_canonical_address(address)
+
+    return address_bytes
+
+
+def encode_call(address: Union[str, bytes], calldata: bytes) -> bytes:
+    """Encodes a single call segment (without the spec ID)."""
+    if len(calldata) > MAX_CALLDATA_LENGTH:
+        raise InvalidEVMScript(f"Calldata of {len(calldata)} bytes is too long")
+
+    return b"".join(
+        (
+            _address_bytes(address),
+            len(calldata).to_bytes(LENGTH_SIZE, "big"),
+            calldata,
+        )
+    )
+
+
+def join_calls(segments: Iterable[bytes]) -> bytes:
+    """Builds a script from call segments produced by `encode_call`."""
+    return b"".join((CALLSCRIPT_ID, *segments))
+
+
+def encode_evm_script(calls: Iterable[Tuple[Union[str, bytes], bytes]]) -> bytes:
+    """Encodes (address, calldata) pairs into an EVM script.
+
+    Args:
+        calls (list(tuple)): ("target addr", calldata)
+
+    Returns:
+        bytes: the EVM script.
+    """
+    return join_calls(encode_call(address, calldata) for address, calldata in calls)
+
+
+def iter_evm_script(script: bytes) -> Iterator[Tuple[bytes, memoryview]]:
+    """Lazily decodes an EVM script into (address, calldata) pairs.
+
+    Addresses are returned as 20 raw bytes and calldata as a `memoryview`
+    into `script`, so no calldata is copied until the caller needs it. An
+    empty script (a vote without actions) has no calls.
+
+    Raises:
+        InvalidEVMScript: on an unknown spec ID or a truncated segment.
+    """
+    view = memoryview(script)
+    if len(view) == 0:
+        return
+
+    if len(view) < len(CALLSCRIPT_ID) or view[: len(CALLSCRIPT_ID)] != CALLSCRIPT_ID:
+        raise InvalidEVMScript(f"Unsupported spec ID: {bytes(view[:4]).hex()}")
+
+    idx = len(CALLSCRIPT_ID)
+    end = len(view)
+    while idx < end:
+        calldata_start = idx + ADDRESS_LENGTH + LENGTH_SIZE
+        if calldata_start > end:
+            raise InvalidEVMScript(f"Truncated call segment at byte {idx}")
+
+        address = bytes(view[idx : idx + ADDRESS_LENGTH])
+        length = int.from_bytes(view[idx + ADDRESS_LENGTH : calldata_start], "big")
+
+        idx = calldata_start + length
+        if idx > end:
+            raise InvalidEVMScript(
+                f"Calldata of {length} bytes at byte {calldata_start} exceeds the script"
+            )
+
+        yield address, view[calldata_start:idx]
+
+
+def decode_evm_script(script: bytes) -> List[Tuple[bytes, memoryview]]:
+    """Decodes an EVM script into a list of (address, calldata) pairs."""
+    return list(iter_evm_script(script))
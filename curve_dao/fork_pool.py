@@ -0,0 +1,220 @@
+import multiprocessing
+import os
+import subprocess
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Callable, List, Optional, Sequence
+
+import requests
+
+from .simulate import SimulationResult, simulate_batch
+
+# command lines starting a fork node, keyed by the ape provider that talks to it
+NODE_COMMANDS = {
+    "hardhat": [
+        "npx", "hardhat", "node",
+        "--fork", "{fork_url}",
+        "--fork-block-number", "{block_number}",
+        "--port", "{port}",
+    ],
+    "foundry": [
+        "anvil",
+        "--fork-url", "{fork_url}",
+        "--fork-block-number", "{block_number}",
+        "--port", "{port}",
+    ],
+}  # fmt: skip
+# nodes start from the project root, where `hardhat.config.js` lives
+PROJECT_DIR = Path(__file__).parent.parent
+# first port of the pool; node i listens on BASE_PORT + i
+BASE_PORT = 8600
+NODE_START_TIMEOUT = 120
+DEFAULT_NUM_NODES = 4
+# pin forks this far behind the upstream head so every node can serve it
+FORK_CONFIRMATIONS = 12
+
+# set in each worker process by `_connect_worker`
+_NETWORK_CONTEXT = None
+
+
+def get_default_fork_url() -> str:
+    return f"https://eth-mainnet.g.alchemy.com/v2/{os.environ['WEB3_ALCHEMY_API_KEY']}"
+
+
+def _rpc(url: str, method: str, params=()):
+    response = requests.post(
+        url,
+        json={"jsonrpc": "2.0", "id": 1, "method": method, "params": list(params)},
+        timeout=10,
+    )
+    response.raise_for_status()
+    return response.json()["result"]
+
+
+def _connect_worker(ports, provider: str):
+    # every worker process owns one node for its whole lifetime
+    import ape
+
+    global _NETWORK_CONTEXT
+
+    port = ports.get()
+    _NETWORK_CONTEXT = ape.networks.parse_network_choice(
+        f"ethereum:mainnet-fork:{provider}",
+        provider_settings={"host": f"http://127.0.0.1:{port}"},
+    )
+    _NETWORK_CONTEXT.__enter__()
+
+
+class ForkPool:
+    """Pool of local mainnet fork nodes, one worker process per node.
+
+    Nodes listen on distinct ports and are all pinned to the same block,
+    so any job gives the same result on any node. Use as a context
+    manager: nodes are started on enter and stopped on exit.
+
+    Args:
+        num_nodes (int): number of nodes (and worker processes).
+        fork_url (str): upstream RPC. Defaults to Alchemy via
+            `WEB3_ALCHEMY_API_KEY`.
+        block_number (int): block to fork at. Defaults to the upstream
+            head minus `FORK_CONFIRMATIONS`.
+        provider (str): "hardhat", or "foundry" to run anvil (needs the
+            ape-foundry plugin).
+        base_port (int): port of the first node.
+    """
+
+    def __init__(
+        self,
+        num_nodes: int,
+        fork_url: Optional[str] = None,
+        block_number: Optional[int] = None,
+        provider: str = "hardhat",
+        base_port: int = BASE_PORT,
+    ):
+        if provider not in NODE_COMMANDS:
+            raise ValueError(f"Unsupported fork provider: {provider}")
+
+        self.num_nodes = num_nodes
+        self.fork_url = fork_url or get_default_fork_url()
+        self.block_number = block_number
+        self.provider = provider
+        self.ports = [base_port + i for i in range(num_nodes)]
+        self._nodes: List[subprocess.Popen] = []
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    def __enter__(self) -> "ForkPool":
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def start(self):
+        if self.block_number is None:
+            head = int(_rpc(self.fork_url, "eth_blockNumber"), 16)
+            self.block_number = head - FORK_CONFIRMATIONS
+
+        try:
+            for port in self.ports:
+                command = [
+                    arg.format(
+                        fork_url=self.fork_url,
+                        block_number=self.block_number,
+                        port=port,
+                    )
+                    for arg in NODE_COMMANDS[self.provider]
+                ]
+                self._nodes.append(
+                    subprocess.Popen(
+                        command,
+                        cwd=PROJECT_DIR,
+                        stdout=subprocess.DEVNULL,
+                        stderr=subprocess.DEVNULL,
+                    )
+                )
+            for port in self.ports:
+                self._wait_for_node(port)
+        except BaseException:
+            self.close()
+            raise
+
+        # spawn: forking a process with a live provider connection is unsafe
+        context = multiprocessing.get_context("spawn")
+        ports = context.Queue()
+        for port in self.ports:
+            ports.put(port)
+        self._executor = ProcessPoolExecutor(
+            max_workers=self.num_nodes,
+            mp_context=context,
+            initializer=_connect_worker,
+            initargs=(ports, self.provider),
+        )
+
+    def _wait_for_node(self, port: int):
+        url = f"http://127.0.0.1:{port}"
+        deadline = time.monotonic() + NODE_START_TIMEOUT
+        while True:
+            try:
+                _rpc(url, "eth_blockNumber")
+                return
+            except requests.RequestException:
+                if time.monotonic() > deadline:
+                    raise TimeoutError(f"Fork node on port {port} did not start")
+                time.sleep(0.5)
+
+    def close(self):
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+        for node in self._nodes:
+            node.terminate()
+        for node in self._nodes:
+            node.wait()
+        self._nodes = []
+
+    def map(self, fn: Callable, jobs: Sequence) -> List:
+        """Runs `fn(job)` for every job across the nodes, in order.
+
+        `fn` must be picklable (a module-level function) and should revert
+        any state it changes, as later jobs reuse the same node.
+        """
+        return list(self._executor.map(fn, jobs))
+
+    def map_batches(self, fn: Callable, jobs: Sequence, *args) -> List:
+        """Splits `jobs` into one batch per node and runs `fn(batch, *args)`.
+
+        `fn` returns a list per batch; the lists are concatenated in job
+        order. Suits functions like `simulate_batch` that amortise one
+        snapshot over many jobs.
+        """
+        if not jobs:
+            return []
+
+        batch_size = -(-len(jobs) // self.num_nodes)
+        batches = [jobs[i : i + batch_size] for i in range(0, len(jobs), batch_size)]
+        futures = [self._executor.submit(fn, batch, *args) for batch in batches]
+        return [result for future in futures for result in future.result()]
+
+
+def simulate_votes_parallel(
+    vote_ids: Sequence[int],
+    voting_contract: str,
+    num_nodes: int = DEFAULT_NUM_NODES,
+    watch: Sequence = (),
+    **pool_kwargs,
+) -> List[SimulationResult]:
+    """Simulates many existing votes across `num_nodes` fork nodes.
+
+    Returns:
+        list(SimulationResult): one result per vote, in order.
+    """
+    if not vote_ids:
+        return []
+
+    num_nodes = min(num_nodes, len(vote_ids))
+    with ForkPool(num_nodes, **pool_kwargs) as pool:
+        return pool.map_batches(
+            simulate_batch, list(vote_ids), voting_contract, list(watch)
+        )
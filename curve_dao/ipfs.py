@@ -1,10 +1,78 @@
 import json
 import os
+import threading
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from pathlib import Path
+from typing import Iterable, Optional, Sequence
 
-import ape
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 from .addresses import get_dao_voting_contract
+from .cache import DiskCache
+from .contract_cache import get_contract
+from .vote_index import get_vote_index
+
+IPFS_API_URL = "https://ipfs.infura.io:5001/api/v0"
+# public gateways raced against the API when fetching descriptions
+IPFS_GATEWAYS = (
+    "https://ipfs.io/ipfs",
+    "https://cloudflare-ipfs.com/ipfs",
+    "https://gateway.pinata.cloud/ipfs",
+)
+IPFS_TIMEOUT = 5
+# retries with exponential backoff on connection errors and 429 / 5xx responses
+IPFS_RETRIES = 3
+IPFS_BACKOFF_FACTOR = 0.5
+IPFS_POOL_SIZE = 32
+
+# seconds before a hash that could not be fetched is requested again
+IPFS_RETRY_AFTER = 6 * 3600
+
+# descriptions larger than this are rejected instead of read into memory
+MAX_DESCRIPTION_BYTES = 4 * 1024 * 1024
+IPFS_CHUNK_SIZE = 64 * 1024
+
+# IPFS content is immutable by hash: descriptions never expire
+IPFS_CACHE = DiskCache("ipfs")
+IPFS_MISSES = DiskCache("ipfs_misses", ttl=IPFS_RETRY_AFTER)
+
+
+_SESSION: Optional[requests.Session] = None
+_SESSION_LOCK = threading.Lock()
+
+
+def get_session() -> requests.Session:
+    """Returns the shared, connection-pooled session for IPFS requests."""
+    global _SESSION
+
+    with _SESSION_LOCK:
+        if _SESSION is None:
+            retry = Retry(
+                total=IPFS_RETRIES,
+                # read timeouts usually mean an unpinned hash: don't retry those
+                read=0,
+                status_forcelist=(429, 500, 502, 503, 504),
+                allowed_methods=None,
+                backoff_factor=IPFS_BACKOFF_FACTOR,
+                raise_on_status=False,
+            )
+            adapter = HTTPAdapter(
+                pool_connections=len(IPFS_GATEWAYS) + 1,
+                pool_maxsize=IPFS_POOL_SIZE,
+                max_retries=retry,
+            )
+            session = requests.Session()
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            _SESSION = session
+
+    return _SESSION
+
+
+def _ipfs_auth():
+    return (os.getenv("IPFS_PROJECT_ID"), os.getenv("IPFS_PROJECT_SECRET"))
 
 
 def get_ipfs_hash_from_description(description: str):
@@ -14,10 +82,10 @@ def get_ipfs_hash_from_description(description: str):
     set up an IPFS project to generate project id and project secret!
     """
     text = json.dumps({"text": description})
-    response = requests.post(
-        "https://ipfs.infura.io:5001/api/v0/add",
+    response = get_session().post(
+        f"{IPFS_API_URL}/add",
         files={"file": text},
-        auth=(os.getenv("IPFS_PROJECT_ID"), os.getenv("IPFS_PROJECT_SECRET")),
+        auth=_ipfs_auth(),
     )
     assert (
         200 <= response.status_code < 400
@@ -25,39 +93,148 @@ def get_ipfs_hash_from_description(description: str):
     return response.json()["Hash"]
 
 
-def get_description_from_ipfs_hash(ipfs_hash: str):
-    try:
-        response = requests.post(
-            f"https://ipfs.infura.io:5001/api/v0/get?arg={ipfs_hash}",
-            auth=(os.getenv("IPFS_PROJECT_ID"), os.getenv("IPFS_PROJECT_SECRET")),
-            timeout=5,
-        )
+def seed_ipfs_cache(archive_path: Path) -> int:
+    """Loads a JSON archive of {ipfs hash: description} into the IPFS cache.
+
+    Returns:
+        int: number of descriptions added to the cache.
+    """
+    archive = json.loads(Path(archive_path).read_text())
+    for ipfs_hash, description in archive.items():
+        IPFS_CACHE.set(ipfs_hash, description)
+
+    return len(archive)
+
+
+def extract_json(chunks: Iterable[bytes], max_bytes: int = MAX_DESCRIPTION_BYTES):
+    """Decodes the first JSON object from a stream of byte chunks.
+
+    Reading stops as soon as a complete object has been decoded, so any
+    trailing data (e.g. tar padding from `api/v0/get`) is never read.
+
+    Raises:
+        ValueError: if the stream exceeds `max_bytes` before a complete
+            object was read, or holds no JSON object at all.
+    """
+    decoder = json.JSONDecoder()
+    buffer = bytearray()
+    start = -1
+
+    for chunk in chunks:
+        buffer += chunk
+        if len(buffer) > max_bytes:
+            raise ValueError(f"IPFS description exceeds {max_bytes} bytes")
+
+        if start == -1:
+            start = buffer.find(b"{")
+            if start == -1:
+                continue
+
+        # an object can only be complete once a closing brace came in
+        if b"}" not in chunk:
+            continue
+
+        try:
+            description, _ = decoder.raw_decode(buffer[start:].decode("utf-8"))
+            return description
+        except (json.JSONDecodeError, UnicodeDecodeError):
+            continue
+
+    raise ValueError("IPFS response does not contain a JSON description")
+
+
+def _fetch_description_from_api(ipfs_hash: str):
+    # `cat` returns the raw file instead of a tar archive like `get` does
+    with get_session().post(
+        f"{IPFS_API_URL}/cat?arg={ipfs_hash}",
+        auth=_ipfs_auth(),
+        timeout=IPFS_TIMEOUT,
+        stream=True,
+    ) as response:
+        response.raise_for_status()
+        return extract_json(response.iter_content(IPFS_CHUNK_SIZE))
+
+
+def _fetch_description_from_gateway(gateway: str, ipfs_hash: str):
+    with get_session().get(
+        f"{gateway}/{ipfs_hash}", timeout=IPFS_TIMEOUT, stream=True
+    ) as response:
         response.raise_for_status()
+        return extract_json(response.iter_content(IPFS_CHUNK_SIZE))
+
+
+def _fetch_description_from_ipfs(ipfs_hash: str, gateways: Sequence[str] = ()):
+    if not gateways:
+        return _fetch_description_from_api(ipfs_hash)
+
+    # race the API against the gateways: the first successful response wins
+    executor = ThreadPoolExecutor(max_workers=len(gateways) + 1)
+    pending = {executor.submit(_fetch_description_from_api, ipfs_hash)}
+    pending.update(
+        executor.submit(_fetch_description_from_gateway, gateway, ipfs_hash)
+        for gateway in gateways
+    )
+    try:
+        error = None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is None:
+                    return future.result()
+                error = future.exception()
+        raise error
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+def get_description_from_ipfs_hash(
+    ipfs_hash: str, offline: bool = False, gateways: Sequence[str] = ()
+):
+    description = IPFS_CACHE.get(ipfs_hash)
+    if description is not None:
+        return description
+
+    if offline:
+        return "IPFS description not cached (offline mode)."
+
+    # hashes that recently timed out or were not found are not retried until
+    # IPFS_RETRY_AFTER expires
+    failure = IPFS_MISSES.get(ipfs_hash)
+    if failure is not None:
+        return failure
+
+    try:
+        description = _fetch_description_from_ipfs(ipfs_hash, gateways)
     except requests.Timeout:
-        return "IPFS timed out.  Possibly the description is no longer pinned."
+        failure = "IPFS timed out.  Possibly the description is no longer pinned."
     except requests.ConnectionError as e:
+        # our connection failed, not the hash: don't negative-cache it
         return f"IPFS connection error: {e}"
     except requests.HTTPError as e:
-        return f"IPFS request error: {e}"
-
-    response_string = response.content.decode("utf-8")
-    json_string = []
-    in_json = False
-    for c in response_string:
-        if c == "{":
-            in_json = True
-        if in_json:
-            json_string.append(c)
-        if c == "}":
-            break
-    json_string = "".join(json_string)
-    return json.loads(json_string)
-
-
-def get_ipfs_hash_from_vote_id(vote_type, vote_id):
-    voting_contract_address = get_dao_voting_contract(vote_type)
-    voting_contract = ape.project.Voting.at(voting_contract_address)
-    snapshot_block = voting_contract.getVote(vote_id)["snapshotBlock"]
+        if e.response is None or e.response.status_code != 404:
+            # e.g. bad credentials or rate limits: not the hash, don't cache
+            return f"IPFS request error: {e}"
+        failure = f"IPFS request error: {e}"
+    except ValueError as e:
+        # may be a gateway's error page rather than the pinned file
+        return f"IPFS description error: {e}"
+    else:
+        IPFS_CACHE.set(ipfs_hash, description)
+        return description
+
+    IPFS_MISSES.set(ipfs_hash, failure)
+    return failure
+
+
+def get_ipfs_hash_from_vote_id(vote_type, vote_id, snapshot_block=None):
+    vote_index = get_vote_index()
+    metadata = vote_index.get_metadata(vote_type, vote_id) if vote_index else None
+    if metadata is not None:
+        return metadata[5:]
+
+    voting_contract = get_contract(get_dao_voting_contract(vote_type))
+    if snapshot_block is None:
+        snapshot_block = voting_contract.getVote(vote_id)["snapshotBlock"]
     vote_events = voting_contract.StartVote.query(
         "voteId",
         "metadata",
@@ -70,7 +247,11 @@ def get_ipfs_hash_from_vote_id(vote_type, vote_id):
     return ipfs_hash
 
 
-def get_description_from_vote_id(vote_id, target):
-    ipfs_hash = get_ipfs_hash_from_vote_id(target, vote_id)
-    description = get_description_from_ipfs_hash(ipfs_hash)
+def get_description_from_vote_id(
+    vote_id, target, snapshot_block=None, offline=False, gateways=()
+):
+    ipfs_hash = get_ipfs_hash_from_vote_id(target, vote_id, snapshot_block)
+    description = get_description_from_ipfs_hash(
+        ipfs_hash, offline=offline, gateways=gateways
+    )
     return description
@@ -0,0 +1,63 @@
+from typing import List, Optional, Sequence, Tuple
+
+from eth_hash.auto import keccak
+from eth_utils import to_checksum_address
+from ethpm_types import HexBytes
+
+from .addresses import MULTICALL3
+
+try:
+    from eth_abi import decode_abi, encode_abi
+except ImportError:
+    from eth_abi import decode as decode_abi
+    from eth_abi import encode as encode_abi
+
+AGGREGATE3_SELECTOR = keccak(b"aggregate3((address,bool,bytes)[])")[:4]
+
+# Calls per `eth_call`: keeps request and response sizes well below node limits.
+MULTICALL_BATCH_SIZE = 100
+
+
+def build_calldata(selector: bytes, types: Sequence[str], args: Sequence) -> bytes:
+    return selector + encode_abi(list(types), list(args))
+
+
+def aggregate3(
+    calls: Sequence[Tuple[str, bytes]],
+    batch_size: int = MULTICALL_BATCH_SIZE,
+    block_identifier: Optional[int] = None,
+) -> List[Tuple[bool, bytes]]:
+    """Executes read-only calls through Multicall3, `batch_size` per `eth_call`.
+
+    Failing calls do not revert the batch; their success flag is False.
+
+    Args:
+        calls (list(tuple)): ("target addr", calldata)
+        batch_size (int): calls aggregated into a single `eth_call`.
+        block_identifier (int): block to read at. Defaults to latest.
+
+    Returns:
+        list(tuple): (success, returndata) for every call, in order.
+    """
+    import ape
+
+    web3 = ape.chain.provider.web3
+    multicall = to_checksum_address(MULTICALL3)
+
+    results = []
+    for i in range(0, len(calls), batch_size):
+        batch = [
+            (to_checksum_address(target), True, bytes(calldata))
+            for target, calldata in calls[i : i + batch_size]
+        ]
+        data = AGGREGATE3_SELECTOR + encode_abi(["(address,bool,bytes)[]"], [batch])
+        tx = {"to": multicall, "data": HexBytes(data)}
+        if block_identifier is None:
+            response = web3.eth.call(tx)
+        else:
+            response = web3.eth.call(tx, block_identifier)
+
+        (batch_results,) = decode_abi(["(bool,bytes)[]"], bytes(response))
+        results.extend((success, bytes(data)) for success, data in batch_results)
+
+    return results
@@ -0,0 +1,186 @@
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple, Union
+
+import ape
+from ape.exceptions import ApeException
+from eth_hash.auto import keccak
+
+from .addresses import CONVEX_VOTERPROXY
+from .contract_cache import get_contract
+from .evmscript import ADDRESS_LENGTH, LENGTH_SIZE, join_calls
+from .simulate import preflight
+from .vote_utils import encode_action_segment
+
+try:
+    from eth_abi import encode_abi
+except ImportError:
+    from eth_abi import encode as encode_abi
+
+NEW_VOTE_SELECTOR = keccak(b"newVote(bytes,string,bool,bool)")[:4]
+# a CIDv0 IPFS hash has the same length as any real vote metadata
+PLACEHOLDER_METADATA = "ipfs:Qm" + "1" * 44
+# `ScriptReport.errors` key of a failed `executeVote` estimation
+EXECUTE_VOTE_ERROR = "executeVote"
+
+TX_BASE_GAS = 21_000
+# EIP-2028 calldata costs
+ZERO_BYTE_GAS = 4
+NONZERO_BYTE_GAS = 16
+# Voting stores the script: one new storage slot per 32-byte word, plus its length
+SSTORE_SET_GAS = 20_000
+# leave headroom: a vote whose execution fills most of a block is hard to include
+SAFE_GAS_FRACTION = 0.5
+
+
+def calldata_gas(data: bytes) -> int:
+    """Intrinsic gas paid for transaction data."""
+    zero_bytes = data.count(0)
+    return zero_bytes * ZERO_BYTE_GAS + (len(data) - zero_bytes) * NONZERO_BYTE_GAS
+
+
+@dataclass
+class ScriptReport:
+    """Size and gas figures of a vote script.
+
+    `new_vote_gas`, `execute_gas` and `action_gas` need a fork and are None
+    when not estimated. `execute_gas` is the `executeVote` estimate for a
+    vote created from the script, passed and past its end; `action_gas` is
+    each action's share of it, from dry runs. `errors` is keyed by action
+    index, or by `EXECUTE_VOTE_ERROR` when the vote itself could not be
+    executed. `batches` lists action indexes per suggested vote and is empty
+    when the script fits in one vote.
+    """
+
+    script_size: int
+    action_calldata_sizes: List[int]
+    new_vote_calldata_gas: int
+    script_storage_gas: int
+    block_gas_limit: Optional[int] = None
+    new_vote_gas: Optional[int] = None
+    execute_gas: Optional[int] = None
+    action_gas: List[Optional[int]] = field(default_factory=list)
+    errors: Dict[Union[int, str], str] = field(default_factory=dict)
+    batches: List[List[int]] = field(default_factory=list)
+
+
+def _new_vote_calldata(script: bytes) -> bytes:
+    return NEW_VOTE_SELECTOR + encode_abi(
+        ["bytes", "string", "bool", "bool"],
+        [script, PLACEHOLDER_METADATA, False, False],
+    )
+
+
+def _action_execute_gas(tx_gas_used: int, segment: bytes) -> int:
+    # `preflight` runs every action as its own transaction; inside
+    # executeVote it is a call, without the base fee or its own calldata
+    agent_calldata = segment[ADDRESS_LENGTH + LENGTH_SIZE :]
+    return tx_gas_used - TX_BASE_GAS - calldata_gas(agent_calldata)
+
+
+def _execute_vote_gas(target: Dict, script: bytes, vote_creator) -> int:
+    # create the vote, pass it and estimate its execution, then revert
+    aragon = get_contract(target["voting"])
+    snapshot_id = ape.chain.snapshot()
+    try:
+        tx = aragon.newVote(
+            script, PLACEHOLDER_METADATA, False, False, sender=vote_creator
+        )
+        start_vote = next(
+            log for log in tx.decode_logs() if log.event_name == "StartVote"
+        )
+        vote_id = start_vote.event_arguments["voteId"]
+
+        voter = ape.accounts[CONVEX_VOTERPROXY]
+        aragon.vote(vote_id, True, False, sender=voter)
+        ape.chain.mine(deltatime=aragon.voteTime())
+
+        return aragon.executeVote.estimate_gas_cost(vote_id, sender=voter)
+    finally:
+        ape.chain.restore(snapshot_id)
+
+
+def split_actions(action_gas: List[int], max_gas: int) -> List[List[int]]:
+    """Greedily groups consecutive actions into batches of at most `max_gas`."""
+    batches: List[List[int]] = [[]]
+    batch_gas = 0
+    for idx, gas in enumerate(action_gas):
+        if batches[-1] and batch_gas + gas > max_gas:
+            batches.append([])
+            batch_gas = 0
+        batches[-1].append(idx)
+        batch_gas += gas
+
+    return batches
+
+
+def script_report(
+    target: Dict,
+    actions: List[Tuple],
+    vote_creator=None,
+    estimate: bool = True,
+) -> ScriptReport:
+    """Reports script size and estimated gas for a list of vote actions.
+
+    Sizes and the intrinsic `newVote` calldata / script storage costs are
+    computed offline. With `estimate`, every action is dry-run on the fork
+    through the agent (see `simulate.preflight`) to estimate its gas. With a
+    `vote_creator`, `newVote` gas is estimated on the fork too, and so is
+    `executeVote`: the vote is created, voted for and warped past its end on
+    a snapshot. Splitting into several votes is suggested when that exceeds
+    `SAFE_GAS_FRACTION` of the block gas limit.
+
+    Args:
+        target (dict): CURVE_DAO_OWNERSHIP / CURVE_DAO_PARAMS / EMERGENCY_DAO
+        actions (list(tuple)): ("target addr", "fn_name", *args)
+        vote_creator: account able to create votes, for `newVote` estimation.
+        estimate (bool): estimate execution gas on the fork.
+
+    Returns:
+        ScriptReport: the report.
+    """
+    segments = [encode_action_segment(target["agent"], action) for action in actions]
+    script = join_calls(segments)
+    new_vote_calldata = _new_vote_calldata(script)
+
+    report = ScriptReport(
+        script_size=len(script),
+        action_calldata_sizes=[
+            len(segment) - ADDRESS_LENGTH - LENGTH_SIZE for segment in segments
+        ],
+        new_vote_calldata_gas=TX_BASE_GAS + calldata_gas(new_vote_calldata),
+        script_storage_gas=(-(-len(script) // 32) + 1) * SSTORE_SET_GAS,
+    )
+    if not estimate:
+        return report
+
+    report.block_gas_limit = ape.chain.blocks.head.gas_limit
+    if vote_creator is not None:
+        aragon = get_contract(target["voting"])
+        report.new_vote_gas = aragon.newVote.estimate_gas_cost(
+            script, PLACEHOLDER_METADATA, False, False, sender=vote_creator
+        )
+
+    for idx, (result, segment) in enumerate(zip(preflight(target, actions), segments)):
+        if result.success:
+            report.action_gas.append(_action_execute_gas(result.gas_used, segment))
+        else:
+            report.action_gas.append(None)
+            report.errors[idx] = result.error
+
+    if report.errors or vote_creator is None:
+        return report
+
+    try:
+        report.execute_gas = _execute_vote_gas(target, script, vote_creator)
+    except ApeException as e:
+        # e.g. Convex alone does not pass the vote, so executeVote reverts
+        report.errors[EXECUTE_VOTE_ERROR] = str(e)
+        return report
+
+    # what executeVote spends besides the actions: base fee, script reads
+    execute_overhead = report.execute_gas - sum(report.action_gas)
+    max_gas = int(report.block_gas_limit * SAFE_GAS_FRACTION)
+    if report.execute_gas > max_gas:
+        report.batches = split_actions(report.action_gas, max_gas - execute_overhead)
+
+    return report
@@ -0,0 +1,123 @@
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+from eth_hash.auto import keccak
+
+from .cache import CACHE_DIR
+
+SIGNATURE_DB_PATH = CACHE_DIR / "signatures.sqlite"
+
+# rows per INSERT batch when loading a dump
+LOAD_BATCH_SIZE = 100_000
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS signatures (
+    selector INTEGER NOT NULL,
+    signature TEXT NOT NULL,
+    PRIMARY KEY (selector, signature)
+) WITHOUT ROWID;
+"""
+
+
+def _selector_to_int(selector) -> int:
+    if isinstance(selector, str):
+        return int(selector, 16)
+    return int.from_bytes(selector, "big")
+
+
+def parse_signature_dump(lines: Iterable[str]) -> Iterator[Tuple[int, str]]:
+    """Parses a 4-byte signature dump into (selector, signature) rows.
+
+    Each line is either `0x<selector> <signature>`, `0x<selector>,<signature>`
+    or a bare text signature, whose selector is computed. Blank lines and
+    lines starting with `#` are skipped.
+    """
+    for line in lines:
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+
+        if line.startswith("0x") and len(line) > 11 and line[10] in " \t,":
+            yield int(line[2:10], 16), line[11:].strip()
+        else:
+            yield _selector_to_int(keccak(line.encode())[:4]), line
+
+
+class SignatureDB:
+    """Local 4-byte selector -> text signature database.
+
+    Backed by a SQLite table clustered on the selector, so lookups are
+    O(log n) B-tree reads however many millions of signatures it holds,
+    and nothing is read into memory up front.
+
+    Args:
+        path (Path): sqlite database file. Defaults to `SIGNATURE_DB_PATH`.
+    """
+
+    def __init__(self, path: Optional[Path] = None):
+        self.path = Path(path or SIGNATURE_DB_PATH)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(self.path, check_same_thread=False)
+        self._db.executescript(_SCHEMA)
+
+    def close(self):
+        self._db.close()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM signatures").fetchone()[0]
+
+    def load_dump(self, dump_path: Path) -> int:
+        """Loads a signature dump (see `parse_signature_dump`).
+
+        Returns:
+            int: number of rows read from the dump.
+        """
+        num_rows = 0
+        with open(dump_path) as f:
+            rows = parse_signature_dump(f)
+            while True:
+                batch = [row for _, row in zip(range(LOAD_BATCH_SIZE), rows)]
+                if not batch:
+                    break
+                with self._lock, self._db:
+                    self._db.executemany(
+                        "INSERT OR IGNORE INTO signatures VALUES (?, ?)", batch
+                    )
+                num_rows += len(batch)
+
+        return num_rows
+
+    def lookup(self, selector) -> List[str]:
+        """Returns every known signature for a 4-byte selector.
+
+        Args:
+            selector (str | bytes): e.g. "0xa9059cbb" or its 4 raw bytes.
+        """
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT signature FROM signatures WHERE selector = ?",
+                (_selector_to_int(selector),),
+            ).fetchall()
+
+        return [signature for (signature,) in rows]
+
+
+_SIGNATURE_DB: Optional[SignatureDB] = None
+
+
+def get_signature_db() -> Optional[SignatureDB]:
+    """Opens the default signature database on first use.
+
+    Returns:
+        SignatureDB: or None if no dump was ever loaded.
+    """
+    global _SIGNATURE_DB
+
+    if _SIGNATURE_DB is None and SIGNATURE_DB_PATH.exists():
+        _SIGNATURE_DB = SignatureDB()
+
+    return _SIGNATURE_DB
@@ -1,16 +1,52 @@
 import pprint
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
 
 import ape
+from ape.exceptions import ApeException
 from ape.logging import logger
 
 from .addresses import CONVEX_VOTERPROXY
+from .contract_cache import get_contract
+from .vote_utils import prepare_vote_script
+
+# newVote metadata for simulated votes: nothing is uploaded to IPFS
+SIMULATION_METADATA = "simulation"
+
+
+@dataclass
+class SimulationResult:
+    """Outcome of simulating one vote on a fork.
+
+    `state_diff` maps each watched view call that changed to its
+    (before, after) values.
+    """
+
+    vote_id: Optional[int]
+    executed: bool
+    gas_used: Optional[int] = None
+    error: Optional[str] = None
+    events: List[str] = field(default_factory=list)
+    state_diff: Dict[str, Tuple] = field(default_factory=dict)
+
+
+@dataclass
+class ActionResult:
+    """Outcome of dry-running one vote action through the agent."""
+
+    action: Tuple
+    success: bool
+    gas_used: Optional[int] = None
+    error: Optional[str] = None
+    events: List[str] = field(default_factory=list)
+    state_diff: Dict[str, Tuple] = field(default_factory=dict)
 
 
 def simulate(vote_id: int, voting_contract: str):
     """Simulate passing vote on mainnet-fork"""
     logger.info("--------- SIMULATE VOTE ---------")
 
-    aragon = ape.project.Voting.at(voting_contract)
+    aragon = get_contract(voting_contract)
 
     # print vote details to console first:
     logger.info("Vote stats before Convex Vote:")
@@ -33,5 +69,180 @@ def simulate(vote_id: int, voting_contract: str):
     # moment of truth - execute the vote!
     logger.info("Simulate proposal execution")
     enacter = ape.accounts[CONVEX_VOTERPROXY]
-    aragon.executeVote(vote_id, sender=enacter)
+    tx = aragon.executeVote(vote_id, sender=enacter)
     logger.info("Vote Executed!")
+
+    return tx
+
+
+def _watch_key(address: str, fn_name: str, *args) -> str:
+    return f"{address}.{fn_name}({', '.join(map(str, args))})"
+
+
+def read_state(watch: Sequence[Tuple]) -> Dict[str, object]:
+    """Reads view calls given as ("target addr", "fn_name", *args) tuples."""
+    state = {}
+    for address, fn_name, *args in watch:
+        fn = getattr(get_contract(address), fn_name)
+        state[_watch_key(address, fn_name, *args)] = fn(*args)
+
+    return state
+
+
+def diff_state(before: Dict[str, object], after: Dict[str, object]) -> Dict:
+    return {
+        key: (before[key], after[key]) for key in before if before[key] != after[key]
+    }
+
+
+def _run_batch(
+    jobs: Sequence, run_job: Callable, watch: Sequence[Tuple]
+) -> List[SimulationResult]:
+    # hardhat and anvil drop a snapshot once it is reverted to, so a new one
+    # is taken after every restore
+    snapshot_id = ape.chain.snapshot()
+    results = []
+    try:
+        for job in jobs:
+            before = read_state(watch)
+            result = run_job(job)
+            if result.executed:
+                result.state_diff = diff_state(before, read_state(watch))
+            results.append(result)
+
+            ape.chain.restore(snapshot_id)
+            snapshot_id = ape.chain.snapshot()
+    finally:
+        ape.chain.restore(snapshot_id)
+
+    return results
+
+
+def _simulate_vote(vote_id: int, voting_contract: str) -> SimulationResult:
+    try:
+        tx = simulate(vote_id, voting_contract)
+    except ApeException as e:
+        return SimulationResult(vote_id, False, error=str(e))
+
+    return SimulationResult(
+        vote_id,
+        True,
+        gas_used=tx.gas_used,
+        events=[log.event_name for log in tx.decode_logs()],
+    )
+
+
+def simulate_batch(
+    vote_ids: Sequence[int], voting_contract: str, watch: Sequence[Tuple] = ()
+) -> List[SimulationResult]:
+    """Simulates several existing votes, each from the same fork state.
+
+    A snapshot is taken once and the fork reverted to it after every vote,
+    so N votes cost one fork instead of N. The fork is left as it was.
+
+    Args:
+        vote_ids (list(int)): votes to vote for, warp past and execute.
+        voting_contract (str): voting contract address.
+        watch (list(tuple)): view calls ("target addr", "fn_name", *args)
+            compared before voting and after execution.
+
+    Returns:
+        list(SimulationResult): one result per vote, in order.
+    """
+    return _run_batch(
+        vote_ids, lambda vote_id: _simulate_vote(vote_id, voting_contract), watch
+    )
+
+
+def simulate_actions_batch(
+    target: Dict,
+    action_lists: Sequence[List[Tuple]],
+    vote_creator,
+    watch: Sequence[Tuple] = (),
+) -> List[SimulationResult]:
+    """Like `simulate_batch`, for candidate votes that do not exist yet.
+
+    Votes are created straight through `newVote` with placeholder metadata,
+    so nothing is uploaded to IPFS.
+
+    Args:
+        target (dict): CURVE_DAO_OWNERSHIP / CURVE_DAO_PARAMS / EMERGENCY_DAO
+        action_lists (list(list(tuple))): one list of
+            ("target addr", "fn_name", *args) actions per candidate vote.
+        vote_creator: account creating the votes.
+        watch (list(tuple)): see `simulate_batch`.
+    """
+
+    aragon = get_contract(target["voting"])
+
+    def _simulate_actions(actions):
+        try:
+            evm_script = prepare_vote_script(target, actions)
+            tx = aragon.newVote(
+                evm_script, SIMULATION_METADATA, False, False, sender=vote_creator
+            )
+        except ApeException as e:
+            return SimulationResult(None, False, error=str(e))
+
+        start_vote = next(
+            log for log in tx.decode_logs() if log.event_name == "StartVote"
+        )
+        return _simulate_vote(start_vote.event_arguments["voteId"], target["voting"])
+
+    return _run_batch(action_lists, _simulate_actions, watch)
+
+
+def preflight(
+    target: Dict, actions: List[Tuple], watch: Sequence[Tuple] = ()
+) -> List[ActionResult]:
+    """Dry-runs vote actions on a fork without creating a vote.
+
+    The voting contract is impersonated to call `agent.execute` for each
+    action directly, in order, exactly as `executeVote` would, so each
+    action sees the effects of the previous ones. Nothing is uploaded to
+    IPFS and no time passes; the fork is reverted afterwards.
+
+    Args:
+        target (dict): CURVE_DAO_OWNERSHIP / CURVE_DAO_PARAMS / EMERGENCY_DAO
+        actions (list(tuple)): ("target addr", "fn_name", *args)
+        watch (list(tuple)): view calls ("target addr", "fn_name", *args)
+            compared before and after every action.
+
+    Returns:
+        list(ActionResult): one result per action. The vote would only
+            execute if every action succeeds.
+    """
+    agent = get_contract(target["agent"])
+    voting = ape.accounts[target["voting"]]
+
+    snapshot_id = ape.chain.snapshot()
+    results = []
+    try:
+        # the voting contract holds no ETH to pay for gas
+        voting.balance += 10**18
+
+        for action in actions:
+            address, fn_name, *args = action
+            fn = getattr(get_contract(address), fn_name)
+            calldata = bytes(fn.encode_input(*args))
+
+            before = read_state(watch)
+            try:
+                tx = agent.execute(address, 0, calldata, sender=voting)
+            except ApeException as e:
+                results.append(ActionResult(action, False, error=str(e)))
+                continue
+
+            results.append(
+                ActionResult(
+                    action,
+                    True,
+                    gas_used=tx.gas_used,
+                    events=[log.event_name for log in tx.decode_logs()],
+                    state_diff=diff_state(before, read_state(watch)),
+                )
+            )
+    finally:
+        ape.chain.restore(snapshot_id)
+
+    return results
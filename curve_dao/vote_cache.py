@@ -0,0 +1,135 @@
+"""Disk cache of decoded votes.
+
+A vote's script and description never change, so decoded actions are
+cached by (voting contract, vote ID, script hash) and a vote is only
+decoded once. Votes with guessed or undecoded calls are decoded again
+every time, so they pick up a newer signature database or a newly
+verified contract. Tallies are cached too once they are final; those of votes
+still open (or passed and awaiting execution) are rebuilt from the
+`getVote` result on every lookup.
+"""
+import json
+from typing import Dict, List, Optional, Tuple
+
+from eth_hash.auto import keccak
+from ethpm_types.abi import MethodABI
+
+from .addresses import get_dao_voting_contract
+from .cache import DiskCache
+from .decoded import DecodedAction, VoteTally
+from .decoder_utils import decode_calldata, encode_values
+
+VOTE_CACHE = DiskCache("votes")
+# bumped when entries change format or were cached with a wrong verdict
+VOTE_CACHE_VERSION = 2
+
+
+def vote_cache_key(vote_type: str, vote_id: int, script: bytes) -> str:
+    voting_contract = get_dao_voting_contract(vote_type).lower()
+    script_hash = keccak(bytes(script)).hex()
+    return f"v{VOTE_CACHE_VERSION}:{voting_contract}:{vote_id}:{script_hash}"
+
+
+def is_final(results: VoteTally) -> bool:
+    """Whether a tally can no longer change: closed, and executed unless it failed."""
+    return not results.open and (results.executed or results.status != "Vote Passed")
+
+
+def _action_to_json(action: DecodedAction) -> Dict:
+    input_types = [i.canonical_type for i in action.method.inputs]
+    if action.raw_inputs is None:
+        args = None
+    else:
+        args = encode_values(input_types, action.raw_inputs).hex()
+
+    return {
+        "target": action.raw_target.hex(),
+        "agent": None if action.raw_agent is None else action.raw_agent.hex(),
+        "method": json.loads(action.method.json()),
+        "args": args,
+        "calls": [_action_to_json(call) for call in action.calls],
+    }
+
+
+def _action_from_json(entry: Dict, methods: Dict) -> DecodedAction:
+    # actions calling the same function share one MethodABI, like when decoded
+    method_key = json.dumps(entry["method"], sort_keys=True)
+    method = methods.get(method_key)
+    if method is None:
+        method = methods[method_key] = MethodABI.parse_obj(entry["method"])
+
+    raw_inputs = None
+    if entry["args"] is not None:
+        raw_inputs = decode_calldata(method, bytes.fromhex(entry["args"]), False)
+
+    return DecodedAction(
+        raw_target=bytes.fromhex(entry["target"]),
+        method=method,
+        raw_inputs=raw_inputs,
+        raw_agent=None if entry["agent"] is None else bytes.fromhex(entry["agent"]),
+        calls=tuple(_action_from_json(call, methods) for call in entry["calls"]),
+    )
+
+
+def load_vote(
+    vote_type: str, vote_id: int, script: bytes
+) -> Optional[Tuple[str, List[DecodedAction], Optional[VoteTally]]]:
+    """Reads a decoded vote from `VOTE_CACHE`.
+
+    Returns:
+        tuple: (IPFS hash of the description, actions, results), with
+            results None unless final. None if the vote is not cached.
+    """
+    entry = VOTE_CACHE.get(vote_cache_key(vote_type, vote_id, script))
+    if entry is None:
+        return None
+
+    methods: Dict = {}
+    actions = [_action_from_json(action, methods) for action in entry["actions"]]
+    results = entry["results"]
+    if results is not None:
+        results = VoteTally(**results)
+
+    return entry["ipfs_hash"], actions, results
+
+
+def _is_decoded(action: DecodedAction) -> bool:
+    if action.guessed or action.undecoded:
+        return False
+    return all(_is_decoded(call) for call in action.calls)
+
+
+def store_vote(
+    vote_type: str,
+    vote_id: int,
+    script: bytes,
+    ipfs_hash: str,
+    actions: List[DecodedAction],
+    results: VoteTally,
+):
+    """Writes a decoded vote to `VOTE_CACHE`, with its results if final.
+
+    Votes with guessed or undecoded calls, at any depth, are not cached.
+    """
+    if not all(_is_decoded(action) for action in actions):
+        return
+
+    VOTE_CACHE.set(
+        vote_cache_key(vote_type, vote_id, script),
+        {
+            "ipfs_hash": ipfs_hash,
+            "actions": [_action_to_json(action) for action in actions],
+            "results": {
+                "start": results.start,
+                "voting_power": results.voting_power,
+                "open": results.open,
+                "executed": results.executed,
+                "yes": results.yes,
+                "no": results.no,
+                "support_required": results.support_required,
+                "min_accept_quorum": results.min_accept_quorum,
+            }
+            if is_final(results)
+            else None,
+        },
+    )
@@ -0,0 +1,266 @@
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+
+from ethpm_types import HexBytes
+
+from .addresses import get_dao_voting_contract
+from .cache import CACHE_DIR
+from .contract_cache import get_contract
+
+VOTE_INDEX_PATH = CACHE_DIR / "vote_index.sqlite"
+
+# before any of the Curve DAO voting contracts were deployed
+VOTING_START_BLOCK = 10_640_000
+# blocks per log query
+SYNC_STEP = 50_000
+# stay this far behind the head so reorgs can't invalidate the checkpoint
+SYNC_CONFIRMATIONS = 12
+# rows per fetch when streaming from the index
+FETCH_BATCH_SIZE = 10_000
+
+# uint256 values are stored as TEXT: sqlite integers are only 64 bits wide
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS checkpoints (
+    vote_type TEXT PRIMARY KEY,
+    last_block INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS start_vote (
+    vote_type TEXT NOT NULL,
+    vote_id INTEGER NOT NULL,
+    creator TEXT NOT NULL,
+    metadata TEXT NOT NULL,
+    min_balance TEXT NOT NULL,
+    min_time TEXT NOT NULL,
+    total_supply TEXT NOT NULL,
+    creator_voting_power TEXT NOT NULL,
+    block_number INTEGER NOT NULL,
+    transaction_hash TEXT NOT NULL,
+    PRIMARY KEY (vote_type, vote_id)
+);
+CREATE TABLE IF NOT EXISTS cast_vote (
+    vote_type TEXT NOT NULL,
+    vote_id INTEGER NOT NULL,
+    voter TEXT NOT NULL,
+    supports INTEGER NOT NULL,
+    stake TEXT NOT NULL,
+    block_number INTEGER NOT NULL,
+    log_index INTEGER NOT NULL,
+    transaction_hash TEXT NOT NULL,
+    PRIMARY KEY (vote_type, block_number, log_index)
+);
+CREATE INDEX IF NOT EXISTS cast_vote_by_vote ON cast_vote (vote_type, vote_id);
+CREATE TABLE IF NOT EXISTS execute_vote (
+    vote_type TEXT NOT NULL,
+    vote_id INTEGER NOT NULL,
+    block_number INTEGER NOT NULL,
+    transaction_hash TEXT NOT NULL,
+    PRIMARY KEY (vote_type, vote_id)
+);
+"""
+
+
+def _hex(value) -> str:
+    return HexBytes(value).hex()
+
+
+def _cast_vote_from_row(row: sqlite3.Row) -> Dict:
+    cast_vote = dict(row)
+    cast_vote["supports"] = bool(cast_vote["supports"])
+    cast_vote["stake"] = int(cast_vote["stake"])
+    return cast_vote
+
+
+class VoteIndex:
+    """Local SQLite index of Voting contract events.
+
+    `sync` fetches `StartVote`, `CastVote` and `ExecuteVote` logs block
+    range by block range and records a checkpoint after every range, so
+    later syncs only fetch blocks that were not indexed yet. Lookups are
+    primary-key reads keyed by (vote_type, vote_id).
+
+    Args:
+        path (Path): sqlite database file. Defaults to `VOTE_INDEX_PATH`.
+    """
+
+    def __init__(self, path: Optional[Path] = None):
+        self.path = Path(path or VOTE_INDEX_PATH)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(self.path, check_same_thread=False)
+        self._db.row_factory = sqlite3.Row
+        self._db.executescript(_SCHEMA)
+
+    def close(self):
+        self._db.close()
+
+    def _query(self, sql: str, params=()) -> List[sqlite3.Row]:
+        with self._lock:
+            return self._db.execute(sql, params).fetchall()
+
+    def get_checkpoint(self, vote_type: str) -> Optional[int]:
+        rows = self._query(
+            "SELECT last_block FROM checkpoints WHERE vote_type = ?", (vote_type,)
+        )
+        return rows[0]["last_block"] if rows else None
+
+    def sync(
+        self,
+        vote_type: str,
+        stop_block: Optional[int] = None,
+        step: int = SYNC_STEP,
+    ) -> int:
+        """Indexes events of the `vote_type` voting contract up to `stop_block`.
+
+        Args:
+            vote_type (str): ownership / parameter / emergency
+            stop_block (int): last block to index. Defaults to the chain head
+                minus `SYNC_CONFIRMATIONS`.
+            step (int): blocks per log query.
+
+        Returns:
+            int: last indexed block.
+        """
+        import ape
+        from ape.logging import logger
+
+        voting_contract = get_contract(get_dao_voting_contract(vote_type))
+        if stop_block is None:
+            stop_block = ape.chain.blocks.height - SYNC_CONFIRMATIONS
+
+        checkpoint = self.get_checkpoint(vote_type)
+        start_block = VOTING_START_BLOCK if checkpoint is None else checkpoint + 1
+
+        for from_block in range(start_block, stop_block + 1, step):
+            to_block = min(from_block + step - 1, stop_block)
+            logger.info(f"Indexing {vote_type} votes: blocks {from_block}-{to_block}")
+            self._index_range(vote_type, voting_contract, from_block, to_block)
+
+        return self.get_checkpoint(vote_type) or stop_block
+
+    def _index_range(self, vote_type, voting_contract, from_block, to_block):
+        start_votes = [
+            (
+                vote_type,
+                log.event_arguments["voteId"],
+                log.event_arguments["creator"],
+                log.event_arguments["metadata"],
+                str(log.event_arguments["minBalance"]),
+                str(log.event_arguments["minTime"]),
+                str(log.event_arguments["totalSupply"]),
+                str(log.event_arguments["creatorVotingPower"]),
+                log.block_number,
+                _hex(log.transaction_hash),
+            )
+            for log in voting_contract.StartVote.range(from_block, to_block + 1)
+        ]
+        cast_votes = [
+            (
+                vote_type,
+                log.event_arguments["voteId"],
+                log.event_arguments["voter"],
+                int(log.event_arguments["supports"]),
+                str(log.event_arguments["stake"]),
+                log.block_number,
+                log.log_index,
+                _hex(log.transaction_hash),
+            )
+            for log in voting_contract.CastVote.range(from_block, to_block + 1)
+        ]
+        execute_votes = [
+            (
+                vote_type,
+                log.event_arguments["voteId"],
+                log.block_number,
+                _hex(log.transaction_hash),
+            )
+            for log in voting_contract.ExecuteVote.range(from_block, to_block + 1)
+        ]
+
+        # events and checkpoint are committed together, so a sync can resume
+        with self._lock, self._db:
+            self._db.executemany(
+                "INSERT OR REPLACE INTO start_vote VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                start_votes,
+            )
+            self._db.executemany(
+                "INSERT OR REPLACE INTO cast_vote VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                cast_votes,
+            )
+            self._db.executemany(
+                "INSERT OR REPLACE INTO execute_vote VALUES (?, ?, ?, ?)",
+                execute_votes,
+            )
+            self._db.execute(
+                "INSERT OR REPLACE INTO checkpoints VALUES (?, ?)",
+                (vote_type, to_block),
+            )
+
+    def get_start_vote(self, vote_type: str, vote_id: int) -> Optional[Dict]:
+        rows = self._query(
+            "SELECT * FROM start_vote WHERE vote_type = ? AND vote_id = ?",
+            (vote_type, vote_id),
+        )
+        if not rows:
+            return None
+
+        start_vote = dict(rows[0])
+        for key in ("min_balance", "min_time", "total_supply", "creator_voting_power"):
+            start_vote[key] = int(start_vote[key])
+        return start_vote
+
+    def get_metadata(self, vote_type: str, vote_id: int) -> Optional[str]:
+        start_vote = self.get_start_vote(vote_type, vote_id)
+        return start_vote["metadata"] if start_vote else None
+
+    def get_cast_votes(self, vote_type: str, vote_id: int) -> List[Dict]:
+        rows = self._query(
+            "SELECT * FROM cast_vote WHERE vote_type = ? AND vote_id = ? "
+            "ORDER BY block_number, log_index",
+            (vote_type, vote_id),
+        )
+        return [_cast_vote_from_row(row) for row in rows]
+
+    def iter_cast_votes(
+        self, vote_type: str, batch_size: int = FETCH_BATCH_SIZE
+    ) -> Iterator[Dict]:
+        """Streams every indexed `CastVote` of a DAO in chain order.
+
+        Rows are fetched `batch_size` at a time, so the whole history never
+        has to fit in memory.
+        """
+        with self._lock:
+            cursor = self._db.execute(
+                "SELECT * FROM cast_vote WHERE vote_type = ? "
+                "ORDER BY block_number, log_index",
+                (vote_type,),
+            )
+
+        while True:
+            with self._lock:
+                rows = cursor.fetchmany(batch_size)
+            if not rows:
+                break
+            for row in rows:
+                yield _cast_vote_from_row(row)
+
+    def get_execute_vote(self, vote_type: str, vote_id: int) -> Optional[Dict]:
+        rows = self._query(
+            "SELECT * FROM execute_vote WHERE vote_type = ? AND vote_id = ?",
+            (vote_type, vote_id),
+        )
+        return dict(rows[0]) if rows else None
+
+
+_VOTE_INDEX: Optional[VoteIndex] = None
+
+
+def get_vote_index() -> Optional[VoteIndex]:
+    """Returns the default vote index, or None if it was never synced."""
+    global _VOTE_INDEX
+
+    if _VOTE_INDEX is None and VOTE_INDEX_PATH.exists():
+        _VOTE_INDEX = VoteIndex()
+
+    return _VOTE_INDEX
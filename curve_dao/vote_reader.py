@@ -0,0 +1,135 @@
+from dataclasses import dataclass
+from typing import Dict, Iterable, Optional
+
+from eth_hash.auto import keccak
+from ethpm_types import HexBytes
+
+from .addresses import get_dao_voting_contract
+from .multicall import MULTICALL_BATCH_SIZE, aggregate3, build_calldata
+
+try:
+    from eth_abi import decode_abi
+except ImportError:
+    from eth_abi import decode as decode_abi
+
+GET_VOTE_SELECTOR = keccak(b"getVote(uint256)")[:4]
+GET_VOTE_OUTPUT_TYPES = [
+    "bool",  # open
+    "bool",  # executed
+    "uint64",  # startDate
+    "uint64",  # snapshotBlock
+    "uint64",  # supportRequired
+    "uint64",  # minAcceptQuorum
+    "uint256",  # yea
+    "uint256",  # nay
+    "uint256",  # votingPower
+    "bytes",  # script
+]
+
+VOTING_PARAMS = ("votesLength", "voteTime", "supportRequiredPct", "minAcceptQuorumPct")
+
+# `getVote` output names -> VoteRecord attributes
+_GET_VOTE_KEYS = {
+    "open": "open",
+    "executed": "executed",
+    "startDate": "start_date",
+    "snapshotBlock": "snapshot_block",
+    "supportRequired": "support_required",
+    "minAcceptQuorum": "min_accept_quorum",
+    "yea": "yea",
+    "nay": "nay",
+    "votingPower": "voting_power",
+    "script": "script",
+}
+
+
+@dataclass(frozen=True)
+class VoteRecord:
+    """A single `Voting.getVote` result.
+
+    Supports item access with the `getVote` output names, so it can be
+    passed wherever the raw `getVote` struct is expected.
+    """
+
+    vote_type: str
+    vote_id: int
+    open: bool
+    executed: bool
+    start_date: int
+    snapshot_block: int
+    support_required: int
+    min_accept_quorum: int
+    yea: int
+    nay: int
+    voting_power: int
+    script: bytes
+
+    def __getitem__(self, key: str):
+        return getattr(self, _GET_VOTE_KEYS[key])
+
+
+@dataclass(frozen=True)
+class VotingParams:
+    vote_type: str
+    votes_length: int
+    vote_time: int
+    support_required_pct: int
+    min_accept_quorum_pct: int
+
+
+def get_voting_params(
+    vote_type: str, block_identifier: Optional[int] = None
+) -> VotingParams:
+    """Reads vote count, vote time and thresholds in a single `eth_call`."""
+    voting_contract = get_dao_voting_contract(vote_type)
+    calls = [
+        (voting_contract, keccak(f"{name}()".encode())[:4]) for name in VOTING_PARAMS
+    ]
+    results = aggregate3(calls, block_identifier=block_identifier)
+
+    values = []
+    for name, (success, data) in zip(VOTING_PARAMS, results):
+        if not success:
+            raise ValueError(
+                f"{name}() call failed for the {vote_type} voting contract"
+            )
+        values.append(decode_abi(["uint256"], data)[0])
+
+    return VotingParams(vote_type, *values)
+
+
+def get_votes(
+    vote_type: str,
+    vote_ids: Iterable[int],
+    batch_size: int = MULTICALL_BATCH_SIZE,
+    block_identifier: Optional[int] = None,
+) -> Dict[int, VoteRecord]:
+    """Reads `getVote` for many vote IDs, `batch_size` votes per `eth_call`.
+
+    Args:
+        vote_type (str): ownership / parameter / emergency
+        vote_ids (iterable(int)): vote IDs to read.
+        batch_size (int): votes aggregated into a single `eth_call`.
+        block_identifier (int): block to read at. Defaults to latest.
+
+    Returns:
+        dict: vote ID -> VoteRecord. IDs that do not exist are left out.
+    """
+    voting_contract = get_dao_voting_contract(vote_type)
+    vote_ids = list(vote_ids)
+    calls = [
+        (voting_contract, build_calldata(GET_VOTE_SELECTOR, ["uint256"], [vote_id]))
+        for vote_id in vote_ids
+    ]
+    results = aggregate3(
+        calls, batch_size=batch_size, block_identifier=block_identifier
+    )
+
+    votes = {}
+    for vote_id, (success, data) in zip(vote_ids, results):
+        if not success:
+            continue
+        *values, script = decode_abi(GET_VOTE_OUTPUT_TYPES, data)
+        votes[vote_id] = VoteRecord(vote_type, vote_id, *values, HexBytes(script))
+
+    return votes
@@ -1,23 +1,83 @@
+import sys
 import warnings
-from datetime import datetime
-from typing import Dict, List, Tuple
+from functools import lru_cache
+from typing import Callable, Dict, List, Optional, Tuple
 
-import ape
-from ape.exceptions import ContractLogicError
-from ape.logging import logger
+from eth_hash.auto import keccak
+from eth_utils import to_canonical_address, to_checksum_address
+from ethpm_types import HexBytes
 
+from .abi_registry import AbiRegistry, UnknownContract
 from .addresses import get_dao_voting_contract
-from .decoder_utils import decode_input
-from .ipfs import get_ipfs_hash_from_description
+from .contract_cache import get_contract
+from .decoded import (  # noqa: F401
+    DecodedAction,
+    DecodedVote,
+    VoteTally,
+    format_fn_inputs,
+)
+from .decoder_utils import GuessedMethodABI, UndecodedMethodABI, decode_input
+from .evmscript import InvalidEVMScript, encode_call, iter_evm_script, join_calls
+from .ipfs import (
+    get_description_from_ipfs_hash,
+    get_ipfs_hash_from_description,
+    get_ipfs_hash_from_vote_id,
+)
+from .vote_cache import load_vote, store_vote
 
 warnings.filterwarnings("ignore")
 
+# encoded script segments kept by `encode_action_segment`
+ACTION_CACHE_SIZE = 4096
+
 
 class MissingVote(Exception):
     """Exception raised when a vote ID is invalid."""
 
 
-def prepare_vote_script(target: Dict, actions: List[Tuple]) -> str:
+@lru_cache(maxsize=ACTION_CACHE_SIZE)
+def _encode_action_segment(chain_id: int, agent_address: str, action: Tuple) -> bytes:
+    agent = get_contract(agent_address, chain_id)
+    address, fn_name, *args = action
+    contract = get_contract(address, chain_id)
+    fn = getattr(contract, fn_name)
+    calldata = bytes(fn.encode_input(*args))
+    agent_calldata = bytes(agent.execute.encode_input(address, 0, calldata))
+    return encode_call(agent.address, agent_calldata)
+
+
+def encode_action_segment(
+    agent_address: str, action: Tuple, chain_id: Optional[int] = None
+) -> bytes:
+    """Encodes an action as an EVM script segment calling `agent.execute`.
+
+    Segments are memoized by (chain id, agent, action), so rebuilding a
+    script after editing one action only encodes that action. Actions
+    with unhashable arguments (e.g. lists) are encoded every time.
+
+    Args:
+        agent_address (str): DAO agent executing the action.
+        action (tuple): ("target addr", "fn_name", *args)
+        chain_id (int): defaults to the connected chain.
+
+    Returns:
+        bytes: the segment, see `evmscript.encode_call`.
+    """
+    if chain_id is None:
+        import ape
+
+        chain_id = ape.chain.chain_id
+
+    key = (chain_id, to_checksum_address(agent_address), tuple(action))
+    try:
+        hash(key)
+    except TypeError:
+        return _encode_action_segment.__wrapped__(*key)
+
+    return _encode_action_segment(*key)
+
+
+def prepare_vote_script(target: Dict, actions: List[Tuple]) -> bytes:
     """Generates EVM script to be executed by AragonDAO contracts.
 
     Args:
@@ -25,27 +85,21 @@ def prepare_vote_script(target: Dict, actions: List[Tuple]) -> str:
         actions (list(tuple)): ("target addr", "fn_name", *args)
 
     Returns:
-        str: Generated EVM script.
+        bytes: Generated EVM script.
     """
-    agent = ape.Contract(target["agent"])
+    import ape
+    from ape.logging import logger
+
+    agent = target["agent"]
     voting = target["voting"]
 
-    logger.info(f"Agent Contract: {agent.address}")
+    logger.info(f"Agent Contract: {agent}")
     logger.info(f"Voting Contract: {voting}")
 
-    evm_script = bytes.fromhex("00000001")
-
-    for address, fn_name, *args in actions:
-        contract = ape.Contract(address)
-        fn = getattr(contract, fn_name)
-        calldata = bytes(fn.encode_input(*args))
-        agent_calldata = bytes(agent.execute.encode_input(address, 0, calldata))
-        length = bytes.fromhex(hex(len(agent_calldata.hex()) // 2)[2:].zfill(8))
-        evm_script = (
-            evm_script + bytes.fromhex(agent.address[2:]) + length + agent_calldata
-        )
-
-    return evm_script
+    chain_id = ape.chain.chain_id
+    return join_calls(
+        encode_action_segment(agent, action, chain_id) for action in actions
+    )
 
 
 def make_vote(target: Dict, actions: List[Tuple], description: str, vote_creator: str):
@@ -60,7 +114,9 @@ def make_vote(target: Dict, actions: List[Tuple], description: str, vote_creator
     Returns:
         str: vote ID of the created vote.
     """
-    aragon = ape.project.Voting.at(target["voting"])
+    from ape.logging import logger
+
+    aragon = get_contract(target["voting"])
     assert aragon.canCreateNewVote(vote_creator), "dev: user cannot create new vote"
 
     evm_script = prepare_vote_script(target, actions)
@@ -78,13 +134,14 @@ def make_vote(target: Dict, actions: List[Tuple], description: str, vote_creator
     return tx
 
 
-def get_vote_script(vote_id: str, vote_type: str) -> str:
+def get_vote(vote_id: str, vote_type: str):
+    from ape.exceptions import ContractLogicError
+
     try:
         voting_contract_address = get_dao_voting_contract(vote_type)
-        voting_contract = ape.project.Voting.at(voting_contract_address)
-        vote = voting_contract.getVote(vote_id)
-        script = vote["script"]
-        return script
+        # not ape.project: the decoder also runs outside the repo checkout
+        voting_contract = get_contract(voting_contract_address)
+        return voting_contract.getVote(vote_id)
     except ContractLogicError as e:
         if "VOTING_NO_VOTE" in str(e):
             raise MissingVote(f"Vote ID {vote_id} not found")
@@ -92,148 +149,265 @@ def get_vote_script(vote_id: str, vote_type: str) -> str:
             raise
 
 
-def get_vote_data(vote_id: str, vote_type: str) -> str:
-    voting_contract_address = get_dao_voting_contract(vote_type)
-    voting_contract = ape.project.Voting.at(voting_contract_address)
-    vote_data = voting_contract.getVote(vote_id)
+def get_vote_script(vote_id: str, vote_type: str, vote=None) -> str:
+    if vote is None:
+        vote = get_vote(vote_id, vote_type)
 
-    return {
-        "yea": vote_data["yea"],
-        "nay": vote_data["nay"],
-        "votingPower": vote_data["votingPower"],
-        "open": vote_data["open"],
-        "executed": vote_data["executed"],
-        "startDate": vote_data["startDate"],
-    }
+    return vote["script"]
 
 
-def decode_vote_script(script):
-    idx = 4
+def get_vote_data(vote_id: str, vote_type: str, vote=None) -> str:
+    if vote is None:
+        vote = get_vote(vote_id, vote_type)
 
-    votes = []
-    while idx < len(script):
+    return {
+        "yea": vote["yea"],
+        "nay": vote["nay"],
+        "votingPower": vote["votingPower"],
+        "open": vote["open"],
+        "executed": vote["executed"],
+        "startDate": vote["startDate"],
+        "supportRequired": vote["supportRequired"],
+        "minAcceptQuorum": vote["minAcceptQuorum"],
+    }
 
-        # get target contract address:
-        target = ape.Contract(script[idx : idx + 20])
-        idx += 20
 
-        length = int(script[idx : idx + 4].hex(), 16)
-        idx += 4
+def _selector(signature: str) -> str:
+    return "0x" + keccak(signature.encode())[:4].hex()
+
+
+# Aragon Agent: the inner call is shown in place of the `execute` call
+AGENT_EXECUTE = _selector("execute(address,uint256,bytes)")
+# other calls whose arguments hold calls: selector -> (args -> [(target, calldata)])
+FORWARDERS: Dict[str, Callable[[Tuple], List[Tuple[bytes, bytes]]]] = {
+    # Aragon forwarders (e.g. the emergency DAO's), the argument is an EVM script
+    _selector("forward(bytes)"): lambda args: list(iter_evm_script(args[0])),
+    # Multicall / Multicall2 / Multicall3
+    _selector("aggregate((address,bytes)[])"): lambda args: list(args[0]),
+    _selector("tryAggregate(bool,(address,bytes)[])"): lambda args: list(args[1]),
+    _selector("aggregate3((address,bool,bytes)[])"): lambda args: [
+        (target, calldata) for target, _, calldata in args[0]
+    ],
+    _selector("aggregate3Value((address,bool,uint256,bytes)[])"): lambda args: [
+        (target, calldata) for target, _, _, calldata in args[0]
+    ],
+}
+
+
+def _forwarded_call_errors() -> Tuple:
+    # inner targets that can't be resolved, or malformed inner scripts; ape
+    # is only imported when needed, so its errors can't occur before that
+    ape_exceptions = sys.modules.get("ape.exceptions")
+    if ape_exceptions is None:
+        return (UnknownContract, InvalidEVMScript)
+    return (UnknownContract, InvalidEVMScript, ape_exceptions.ApeException)
+
+
+def decode_call(
+    address, calldata, resolve_contract: Callable = get_contract, memo=None
+) -> DecodedAction:
+    """Decodes a call, and the calls it forwards, to any depth.
+
+    Calls through an agent's `execute` are shown as calls to the inner
+    target, with the agent set. Other `FORWARDERS` keep the inner calls in
+    `calls`. Results are memoized in `memo` by (target, calldata hash), so
+    repeated calls, e.g. the same inner call in many actions of a batch
+    proposal, are decoded once.
 
-        # calldata to execute for the dao:
-        calldata = script[idx : idx + length]
-        idx += length
+    Args:
+        address: target address, as a string or 20 bytes.
+        calldata (bytes): calldata sent to the target.
+        resolve_contract: address -> contract, e.g. `AbiRegistry.get_contract`.
+        memo (dict): decoded calls, shared across calls to reuse results.
 
-        fn, inputs = decode_input(target, calldata)
-        agent = None
+    Returns:
+        DecodedAction: the decoded call.
+    """
+    raw_target = to_canonical_address(address)
+    calldata = HexBytes(calldata)
+    key = (raw_target, keccak(calldata))
+    if memo is not None and key in memo:
+        return memo[key]
+
+    target = resolve_contract(to_checksum_address(raw_target))
+    fn, inputs = decode_input(target, calldata, convert=False)
+    selector = calldata[:4].hex()
+    action = DecodedAction(raw_target=raw_target, method=fn, raw_inputs=inputs)
+    # only unwrap calls decoded with the target's own ABI
+    decoded = inputs is not None and not isinstance(
+        fn, (GuessedMethodABI, UndecodedMethodABI)
+    )
 
-        # print decoded vote:
-        if calldata[:4].hex() == "0xb61d27f6":
-            agent = target
-            target = ape.Contract(inputs[0])
-            fn, inputs = decode_input(target, inputs[2])
-            inputs_with_names = get_inputs_with_names(fn, inputs)
-            formatted_inputs = format_fn_inputs(inputs_with_names)
-            formatted_output = (
-                f"Call via agent: [yellow]{agent}[/]\n"
-                f" ├─ [bold]To[/]: [green]{target}[/]\n"
-                f" ├─ [bold]Function[/]: [yellow]{fn.name}[/]\n"
-                f" └─ [bold]Inputs[/]: \n{formatted_inputs}\n"
+    if selector == AGENT_EXECUTE and decoded and len(inputs) == 3:
+        inner = decode_call(inputs[0], inputs[2], resolve_contract, memo)
+        if inner.raw_agent is None:
+            action = DecodedAction(
+                raw_target=inner.raw_target,
+                method=inner.method,
+                raw_inputs=inner.raw_inputs,
+                raw_agent=raw_target,
+                calls=inner.calls,
             )
         else:
-            inputs_with_names = get_inputs_with_names(fn, inputs)
-            formatted_inputs = format_fn_inputs(inputs_with_names)
-            formatted_output = (
-                f"Direct call\n "
-                f" ├─ [bold]To[/]: [green]{target}[/]\n"
-                f" ├─ [bold]Function[/]: [yellow]{fn.name}[/]\n"
-                f" └─ [bold]Inputs[/]: {formatted_inputs}\n"
+            action.calls = (inner,)
+
+    elif selector in FORWARDERS and decoded:
+        try:
+            action.calls = tuple(
+                decode_call(inner_address, inner_calldata, resolve_contract, memo)
+                for inner_address, inner_calldata in FORWARDERS[selector](inputs)
             )
+        except _forwarded_call_errors():
+            # opaque inner calls (e.g. unverified targets): keep the outer call
+            pass
 
-        vote = {
-            "agent": agent.address if agent else None,
-            "target": target.address,
-            "function": fn.name,
-            "inputs": inputs_with_names,
-            "formatted_output": formatted_output,
-        }
-        votes.append(vote)
+    if memo is not None:
+        memo[key] = action
+    return action
 
-    return votes
 
+def decode_vote_script(
+    script, registry: Optional[AbiRegistry] = None, memo: Optional[Dict] = None
+) -> List[DecodedAction]:
+    """Decodes the actions of an EVM script, see `decode_call`.
 
-def decode_vote_data(data: dict, vote_type: str):
-    yes = round(data["yea"] / 1e18, 2)
-    no = round(data["nay"] / 1e18, 2)
-    total_votes = data["yea"] + data["nay"]
-    total_voting_power = data["votingPower"]
+    Args:
+        script (bytes): EVM script, e.g. from `get_vote_script`.
+        registry (AbiRegistry): if given, contracts are resolved from the
+            registry only and decoding never touches the provider.
+        memo (dict): decoded calls; pass the same dict to share them
+            across scripts. Defaults to one memo per script.
 
-    VOTE_TIME = 604800
+    Returns:
+        list(DecodedAction): one decoded action per call in the script.
+    """
+    resolve_contract = registry.get_contract if registry else get_contract
+    if memo is None:
+        memo = {}
 
-    # Handle edge case where there are no votes at all
-    if total_votes == 0 or total_voting_power == 0:
-        quorum = 0
-        support = 0
-    else:
-        quorum = total_votes / total_voting_power
-        support = data["yea"] / total_votes
-
-    required_support = 0.51 if vote_type == "ownership" else 0.30
-    required_quorum = 0.30 if vote_type == "ownership" else 0.15
-
-    if data["open"]:  # Voting is ongoing
-        pass_status = "[yellow]Voting Ongoing[/]"
-    else:  # Voting is closed
-        if total_votes == 0 or total_voting_power == 0:
-            pass_status = "[red]Vote Invalid: No Votes[/]"
-        elif support >= required_support and quorum >= required_quorum:
-            # Check if the vote has been executed
-            execution_status = (
-                "[green]Executed[/]" if data["executed"] else "[red]Not Executed[/]"
-            )
-            pass_status = (
-                f"[green]Vote Passed[/] ([grey]Execution Status[/]: {execution_status})"
-            )
-        else:
-            if support < required_support and quorum < required_quorum:
-                failure_reason = "Both Support and Quorum Not Met"
-            elif support < required_support:
-                failure_reason = "Support Not Met"
-            else:
-                failure_reason = "Quorum Not Met"
-            pass_status = f"[red]Vote Failed: {failure_reason}[/]"
-
-    start = datetime.utcfromtimestamp(data["startDate"]).strftime("%Y-%m-%d %H:%M:%S")
-    end = datetime.utcfromtimestamp(data["startDate"] + VOTE_TIME).strftime(
-        "%Y-%m-%d %H:%M:%S"
-    )
+    return [
+        decode_call(address, calldata, resolve_contract, memo)
+        for address, calldata in iter_evm_script(script)
+    ]
+
+
+def decode_vote_data(data: dict, vote_type: str) -> VoteTally:
+    """Tallies a vote against its own thresholds, as stored by `newVote`.
+
+    Args:
+        data (dict): `get_vote_data` result.
+        vote_type (str): ownership / parameter / emergency
 
-    formatted_output = (
-        f"[bold]Results[/]: {pass_status}\n"
-        f" ├─ [grey]Voting Start Time[/]: {start}\n"
-        f" ├─ [grey]Voting End Time[/]: {end}\n"
-        f" ├─ [green]Votes For[/]: {yes}\n"
-        f" ├─ [red]Votes Against[/]: {no}\n"
-        f" ├─ [blue]Support[/]: {round(support * 100, 2)}% (Required: {int(required_support * 100)}%)\n"
-        f" └─ [purple]Quorum[/]: {round(quorum * 100, 2)}% (Minimum: {int(required_quorum * 100)}%)\n"
+    Returns:
+        VoteTally: the vote's results.
+    """
+    return VoteTally(
+        start=data["startDate"],
+        voting_power=data["votingPower"],
+        open=data["open"],
+        executed=data["executed"],
+        yes=data["yea"],
+        no=data["nay"],
+        support_required=data["supportRequired"],
+        min_accept_quorum=data["minAcceptQuorum"],
     )
 
-    results = {
-        "start": data["startDate"],
-        "end": data["startDate"] + VOTE_TIME,
-        "votingPower": data["votingPower"],
-        "open": data["open"],
-        "executed": data["executed"],
-        "yes": data["yea"],
-        "no": data["nay"],
-        "support": support,
-        "quorum": quorum,
-        "formatted_output": formatted_output,
-    }
 
+def load_decoded_vote(
+    vote_id: int, vote_type: str, vote, use_cache: bool = True
+) -> Optional[Tuple[str, List[DecodedAction], VoteTally]]:
+    """Reads a decoded vote from `vote_cache`, or None on a miss.
+
+    Results are only cached once final, so for votes still open or awaiting
+    execution they are decoded from `vote` (a `getVote` result) instead.
+
+    Returns:
+        tuple: (ipfs hash, actions, results), or None.
+    """
+    if not use_cache:
+        return None
+
+    cached = load_vote(vote_type, vote_id, get_vote_script(vote_id, vote_type, vote))
+    if cached is None:
+        return None
+
+    ipfs_hash, actions, results = cached
+    if results is None:
+        results = decode_vote_data(get_vote_data(vote_id, vote_type, vote), vote_type)
+    return ipfs_hash, actions, results
+
+
+def store_decoded_vote(
+    vote_id: int,
+    vote_type: str,
+    vote,
+    ipfs_hash: str,
+    actions: List[DecodedAction],
+    use_cache: bool = True,
+) -> VoteTally:
+    """Decodes the results of a freshly decoded vote and caches the vote.
+
+    Returns:
+        VoteTally: results of the vote.
+    """
+    script = get_vote_script(vote_id, vote_type, vote)
+    results = decode_vote_data(get_vote_data(vote_id, vote_type, vote), vote_type)
+    if use_cache:
+        store_vote(vote_type, vote_id, script, ipfs_hash, actions, results)
     return results
 
 
+def decode_vote(
+    vote_id: int,
+    vote_type: str,
+    vote=None,
+    offline=False,
+    gateways=(),
+    use_cache: bool = True,
+) -> DecodedVote:
+    """Fetches and decodes a vote with at most a single `getVote` call.
+
+    Decoded actions are read from (and written to) `vote_cache`, so only
+    the first decode of a vote resolves contracts and queries its
+    description's IPFS hash.
+
+    Args:
+        vote_id (int): vote ID in the `vote_type` voting contract.
+        vote_type (str): ownership / parameter / emergency
+        vote: `getVote` result (e.g. a VoteRecord) if already fetched.
+        offline (bool): only read the description from the IPFS cache.
+        gateways (list(str)): IPFS gateways to race the IPFS API against.
+        use_cache (bool): read and write the decoded vote cache.
+
+    Returns:
+        DecodedVote: description, decoded actions and results of the vote.
+    """
+    if vote is None:
+        vote = get_vote(vote_id, vote_type)
+
+    cached = load_decoded_vote(vote_id, vote_type, vote, use_cache)
+    if cached is None:
+        ipfs_hash = get_ipfs_hash_from_vote_id(
+            vote_type, vote_id, snapshot_block=vote["snapshotBlock"]
+        )
+        actions = decode_vote_script(get_vote_script(vote_id, vote_type, vote))
+        results = store_decoded_vote(
+            vote_id, vote_type, vote, ipfs_hash, actions, use_cache
+        )
+    else:
+        ipfs_hash, actions, results = cached
+
+    return DecodedVote(
+        vote_type=vote_type,
+        vote_id=vote_id,
+        description=get_description_from_ipfs_hash(
+            ipfs_hash, offline=offline, gateways=gateways
+        ),
+        actions=actions,
+        results=results,
+    )
+
+
 def get_inputs_with_names(abi, inputs):
     arg_names = []
     for i in range(len(inputs)):
@@ -242,19 +416,3 @@ def get_inputs_with_names(abi, inputs):
 
     inputs_with_names = list(zip(arg_names, inputs))
     return inputs_with_names
-
-
-def format_fn_inputs(inputs_with_names):
-    if len(inputs_with_names) == 0:
-        return ""
-
-    if len(inputs_with_names) == 1:
-        name, arg = inputs_with_names[0]
-        return f"    └─ [bold]{name}[/]: [yellow]{arg}[/]"
-
-    formatted_args = ""
-    for name, arg in inputs_with_names[:-1]:
-        formatted_args += f"    ├─ [bold]{name}[/]: [yellow]{arg}[/]\n"
-    name, arg = inputs_with_names[-1]
-    formatted_args += f"    └─ [bold]{name}[/]: [yellow]{arg}[/]"
-    return formatted_args
@@ -0,0 +1,243 @@
+from array import array
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+from . import vote_index as vote_index_module
+from .addresses import CONVEX_VOTERPROXY, get_dao_voting_contract
+from .contract_cache import get_contract
+from .vote_index import SYNC_STEP, VoteIndex
+
+# stakes are veCRV balances in wei
+WEI = 10**18
+
+
+class CastVote(NamedTuple):
+    vote_id: int
+    voter: str
+    supports: bool
+    stake: int
+    block_number: int
+
+
+def iter_cast_votes(
+    vote_type: str,
+    start_block: Optional[int] = None,
+    stop_block: Optional[int] = None,
+    step: int = SYNC_STEP,
+) -> Iterator[CastVote]:
+    """Streams `CastVote` logs of a voting contract, `step` blocks at a time.
+
+    Args:
+        vote_type (str): ownership / parameter / emergency
+        start_block (int): defaults to `vote_index.VOTING_START_BLOCK`.
+        stop_block (int): last block to read. Defaults to the chain head.
+        step (int): blocks per log query.
+    """
+    import ape
+
+    voting_contract = get_contract(get_dao_voting_contract(vote_type))
+    if start_block is None:
+        start_block = vote_index_module.VOTING_START_BLOCK
+    if stop_block is None:
+        stop_block = ape.chain.blocks.height
+
+    for from_block in range(start_block, stop_block + 1, step):
+        to_block = min(from_block + step - 1, stop_block)
+        for log in voting_contract.CastVote.range(from_block, to_block + 1):
+            yield CastVote(
+                log.event_arguments["voteId"],
+                log.event_arguments["voter"],
+                bool(log.event_arguments["supports"]),
+                int(log.event_arguments["stake"]),
+                log.block_number,
+            )
+
+
+def iter_indexed_cast_votes(vote_type: str, index: VoteIndex) -> Iterator[CastVote]:
+    """Streams `CastVote` events from a synced `VoteIndex`."""
+    for row in index.iter_cast_votes(vote_type):
+        yield CastVote(
+            row["vote_id"],
+            row["voter"],
+            row["supports"],
+            row["stake"],
+            row["block_number"],
+        )
+
+
+class _VoteTally:
+
+    __slots__ = ("yea", "nay", "ballots", "blocks", "cumulative_stake")
+
+    def __init__(self):
+        self.yea = 0
+        self.nay = 0
+        # voter id -> (supports, stake) of the voter's latest ballot
+        self.ballots: Dict[int, Tuple[bool, int]] = {}
+        # turnout curve: one point per first ballot of a voter
+        self.blocks = array("Q")
+        self.cumulative_stake = array("d")
+
+
+class VoterAggregator:
+    """Aggregates `CastVote` events per voter and per vote.
+
+    Voters are interned to integer IDs and their totals kept in flat
+    arrays, so memory grows with the number of distinct voters and ballots,
+    not with the number of logs streamed through `update`. Aragon lets a
+    voter change their vote: a later ballot replaces the earlier one.
+
+    Per-vote yea / nay stakes are exact integers; per-voter stake totals
+    and turnout curves are floats in veCRV, which is all ranking and
+    plotting need.
+    """
+
+    def __init__(self):
+        self.voters: List[str] = []
+        self._voter_ids: Dict[str, int] = {}
+        # indexed by voter id
+        self._num_votes = array("Q")
+        self._num_yea = array("Q")
+        self._stake = array("d")
+
+        self._votes: Dict[int, _VoteTally] = {}
+
+    def __len__(self) -> int:
+        return len(self._votes)
+
+    def _voter_id(self, voter: str) -> int:
+        key = voter.lower()
+        voter_id = self._voter_ids.get(key)
+        if voter_id is None:
+            voter_id = self._voter_ids[key] = len(self.voters)
+            self.voters.append(voter)
+            self._num_votes.append(0)
+            self._num_yea.append(0)
+            self._stake.append(0.0)
+
+        return voter_id
+
+    def add(self, cast_vote: CastVote):
+        voter_id = self._voter_id(cast_vote.voter)
+        tally = self._votes.get(cast_vote.vote_id)
+        if tally is None:
+            tally = self._votes[cast_vote.vote_id] = _VoteTally()
+
+        previous = tally.ballots.get(voter_id)
+        if previous is None:
+            stake = cast_vote.stake / WEI
+            self._num_votes[voter_id] += 1
+            self._stake[voter_id] += stake
+            turnout = tally.cumulative_stake[-1] if tally.cumulative_stake else 0.0
+            tally.blocks.append(cast_vote.block_number)
+            tally.cumulative_stake.append(turnout + stake)
+        else:
+            supports, stake = previous
+            if supports:
+                tally.yea -= stake
+                self._num_yea[voter_id] -= 1
+            else:
+                tally.nay -= stake
+
+        if cast_vote.supports:
+            tally.yea += cast_vote.stake
+            self._num_yea[voter_id] += 1
+        else:
+            tally.nay += cast_vote.stake
+        tally.ballots[voter_id] = (cast_vote.supports, cast_vote.stake)
+
+    def update(self, cast_votes: Iterable[CastVote]) -> "VoterAggregator":
+        for cast_vote in cast_votes:
+            self.add(cast_vote)
+        return self
+
+    def top_voters(self, n: int = 10, by: str = "stake") -> List[Dict]:
+        """Voters ranked by summed stake or by number of votes cast.
+
+        Args:
+            n (int): number of voters to return.
+            by (str): "stake" or "votes".
+        """
+        match by:
+            case "stake":
+                keys = np.frombuffer(self._stake, dtype=np.float64)
+            case "votes":
+                keys = np.frombuffer(self._num_votes, dtype=np.uint64)
+            case _:
+                raise ValueError(f"Unknown ranking: {by}")
+
+        ranked = np.argsort(keys, kind="stable")[::-1][:n]
+        return [
+            {
+                "voter": self.voters[voter_id],
+                "votes": self._num_votes[voter_id],
+                "yea": self._num_yea[voter_id],
+                "nay": self._num_votes[voter_id] - self._num_yea[voter_id],
+                "stake": self._stake[voter_id],
+            }
+            for voter_id in ranked.tolist()
+        ]
+
+    def vote_summary(self, vote_id: int, voter: str = CONVEX_VOTERPROXY) -> Dict:
+        """Yea / nay stakes of a vote and the share cast by `voter`.
+
+        Returns:
+            dict: {vote_id, voters, yea, nay, voter_stake, voter_share}, with
+                `voter` defaulting to Convex's voter proxy.
+        """
+        tally = self._votes[vote_id]
+        voter_id = self._voter_ids.get(voter.lower())
+        _, voter_stake = tally.ballots.get(voter_id, (False, 0))
+        total = tally.yea + tally.nay
+
+        return {
+            "vote_id": vote_id,
+            "voters": len(tally.ballots),
+            "yea": tally.yea,
+            "nay": tally.nay,
+            "voter_stake": voter_stake,
+            "voter_share": voter_stake / total if total else 0.0,
+        }
+
+    def convex_shares(self) -> Dict[int, float]:
+        """Share of each vote's stake cast by Convex's voter proxy."""
+        return {
+            vote_id: self.vote_summary(vote_id)["voter_share"]
+            for vote_id in sorted(self._votes)
+        }
+
+    def turnout(
+        self, vote_id: int, voting_power: Optional[int] = None
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Cumulative turnout of a vote over its voting window.
+
+        Args:
+            vote_id (int): vote ID.
+            voting_power (int): total voting power at the vote's snapshot
+                (`getVote`'s `votingPower`). If set, turnout is returned as
+                a fraction of it instead of in veCRV.
+
+        Returns:
+            tuple: (block numbers, cumulative stake) arrays.
+        """
+        tally = self._votes[vote_id]
+        # copies: a live view would stop `add` from growing the arrays
+        blocks = np.frombuffer(tally.blocks, dtype=np.uint64).copy()
+        turnout = np.frombuffer(tally.cumulative_stake, dtype=np.float64).copy()
+        if voting_power:
+            turnout = turnout / (voting_power / WEI)
+
+        return blocks, turnout
+
+
+def aggregate_cast_votes(
+    vote_type: str, index: Optional[VoteIndex] = None
+) -> VoterAggregator:
+    """Aggregates every `CastVote` of a DAO, from `index` if set."""
+    if index is None:
+        cast_votes = iter_cast_votes(vote_type)
+    else:
+        cast_votes = iter_indexed_cast_votes(vote_type, index)
+
+    return VoterAggregator().update(cast_votes)
@@ -1,18 +1,31 @@
+import asyncio
+import json
 import sys
 import warnings
 
 import ape
 import click
+from ethpm_types import HexBytes
 from rich.console import Console as RichConsole
 
-from curve_dao.ipfs import get_description_from_vote_id
-from curve_dao.vote_utils import (
-    MissingVote,
-    decode_vote_data,
-    decode_vote_script,
-    get_vote_data,
-    get_vote_script,
+from curve_dao.abi_registry import get_default_registry
+from curve_dao.addresses import get_dao_voting_contract, select_target
+from curve_dao.async_decode import (
+    DECODE_CONCURRENCY,
+    decode_vote_async,
+    decode_votes_async,
 )
+from curve_dao.contract_cache import export_contract_cache, warm_contract_cache
+from curve_dao.decoded import OUTPUT_FORMATS, to_json
+from curve_dao.fork_pool import DEFAULT_NUM_NODES, simulate_votes_parallel
+from curve_dao.ipfs import IPFS_GATEWAYS, seed_ipfs_cache
+from curve_dao.multicall import MULTICALL_BATCH_SIZE
+from curve_dao.script_report import script_report
+from curve_dao.signature_db import SignatureDB
+from curve_dao.vote_index import VoteIndex, get_vote_index
+from curve_dao.vote_reader import get_votes, get_voting_params
+from curve_dao.vote_utils import MissingVote, decode_vote_script, get_vote
+from curve_dao.voters import aggregate_cast_votes
 
 warnings.filterwarnings("ignore")
 
@@ -37,33 +50,332 @@ def cli():
 @click.option(
     "--vote-type",
     "-t",
-    type=click.Choice(["ownership", "parameter"]),
+    type=click.Choice(["ownership", "parameter", "emergency"]),
     required=True,
 )
 @click.option("--vote-id", "-v", type=int, required=True)
-def decode(network, vote_type: str, vote_id: int):
-
-    RICH_CONSOLE.log(f"Decoding {vote_type} VoteID: {vote_id}")
+@click.option("--offline", is_flag=True, help="Never fetch the description from IPFS.")
+@click.option(
+    "--race-gateways", is_flag=True, help="Race public IPFS gateways against the API."
+)
+@click.option(
+    "--format", "output_format", type=click.Choice(OUTPUT_FORMATS), default="rich"
+)
+@click.option("--no-cache", is_flag=True, help="Decode again, ignoring cached votes.")
+def decode(
+    network,
+    vote_type: str,
+    vote_id: int,
+    offline: bool,
+    race_gateways: bool,
+    output_format: str,
+    no_cache: bool,
+):
+    if output_format == "rich":
+        RICH_CONSOLE.log(f"Decoding {vote_type} VoteID: {vote_id}")
 
     try:
-        script = get_vote_script(vote_id, vote_type)
-    except MissingVote:
-        RICH_CONSOLE.log(
-            f"[red] VoteID not found in the {vote_type} DAO voting contract [/red]"
-        )
+        vote = get_vote(vote_id, vote_type)
+    except MissingVote as e:
+        if output_format == "rich":
+            RICH_CONSOLE.log(
+                f"[red] VoteID not found in the {vote_type} DAO voting contract [/red]"
+            )
+        else:
+            # same shape as the errors decode-range writes
+            click.echo(
+                to_json({"vote_type": vote_type, "vote_id": vote_id, "error": repr(e)})
+            )
+            raise SystemExit(1)
         return
 
-    description = get_description_from_vote_id(vote_id, vote_type)
-    RICH_CONSOLE.log(description)
+    gateways = IPFS_GATEWAYS if race_gateways else ()
+    decoded = asyncio.run(
+        decode_vote_async(
+            vote_id,
+            vote_type,
+            vote=vote,
+            offline=offline,
+            gateways=gateways,
+            use_cache=not no_cache,
+        )
+    )
+
+    if output_format == "json":
+        click.echo(to_json(decoded, indent=2))
+    elif output_format == "ndjson":
+        for action in decoded.actions:
+            click.echo(to_json(action))
+    else:
+        RICH_CONSOLE.log(decoded)
+
+
+@cli.command(
+    cls=ape.cli.NetworkBoundCommand,
+    name="decode-range",
+    short_help="Decode a range of Curve DAO proposals as JSON lines",
+)
+@ape.cli.network_option()
+@click.option(
+    "--vote-type",
+    "-t",
+    type=click.Choice(["ownership", "parameter", "emergency"]),
+    multiple=True,
+    required=True,
+)
+@click.option("--start", "-s", type=int, default=0, help="First vote ID.")
+@click.option(
+    "--end", "-e", type=int, default=None, help="Last vote ID (default: latest)."
+)
+@click.option(
+    "--workers", "-w", type=int, default=DECODE_CONCURRENCY, help="Parallel decodes."
+)
+@click.option("--offline", is_flag=True, help="Never fetch descriptions from IPFS.")
+@click.option(
+    "--race-gateways", is_flag=True, help="Race public IPFS gateways against the API."
+)
+@click.option("--no-cache", is_flag=True, help="Decode again, ignoring cached votes.")
+def decode_range(
+    network,
+    vote_type,
+    start: int,
+    end: int,
+    workers: int,
+    offline: bool,
+    race_gateways: bool,
+    no_cache: bool,
+):
+    gateways = IPFS_GATEWAYS if race_gateways else ()
+
+    asyncio.run(
+        _decode_range(
+            vote_type, start, end, workers, offline, gateways, use_cache=not no_cache
+        )
+    )
+
+
+async def _decode_range(
+    vote_type, start, end, workers, offline, gateways, use_cache=True
+):
+    for _vote_type in vote_type:
+        last_vote_id = end
+        if last_vote_id is None:
+            last_vote_id = get_voting_params(_vote_type).votes_length - 1
+
+        # one multicall per batch of votes; the next batch is read while
+        # the current one is decoded
+        stop = last_vote_id + 1
+        batches = [
+            range(batch_start, min(batch_start + MULTICALL_BATCH_SIZE, stop))
+            for batch_start in range(start, stop, MULTICALL_BATCH_SIZE)
+        ]
+        if not batches:
+            continue
+
+        next_votes = asyncio.create_task(
+            asyncio.to_thread(get_votes, _vote_type, batches[0])
+        )
+        for idx in range(len(batches)):
+            votes = await next_votes
+            if idx + 1 < len(batches):
+                next_votes = asyncio.create_task(
+                    asyncio.to_thread(get_votes, _vote_type, batches[idx + 1])
+                )
+
+            async for record in decode_votes_async(
+                _vote_type,
+                votes,
+                concurrency=workers,
+                offline=offline,
+                gateways=gateways,
+                use_cache=use_cache,
+            ):
+                click.echo(to_json(record))
+
+
+@cli.command(
+    name="decode-script",
+    short_help="Decode a raw EVM script offline from the local ABI registry",
+)
+@click.argument("script")
+@click.option(
+    "--bundle",
+    "-b",
+    type=click.Path(exists=True, dir_okay=False),
+    default=None,
+    help="Contract bundle to add to the registry.",
+)
+@click.option(
+    "--format", "output_format", type=click.Choice(OUTPUT_FORMATS), default="rich"
+)
+def decode_script(script: str, bundle, output_format: str):
+
+    registry = get_default_registry(bundle_path=bundle)
+    actions = decode_vote_script(HexBytes(script), registry=registry)
+
+    if output_format == "json":
+        click.echo(to_json(actions, indent=2))
+    elif output_format == "ndjson":
+        for action in actions:
+            click.echo(to_json(action))
+    else:
+        for action in actions:
+            RICH_CONSOLE.log(action)
+
+
+@cli.command(
+    cls=ape.cli.NetworkBoundCommand,
+    name="sync-index",
+    short_help="Index StartVote / CastVote / ExecuteVote events locally",
+)
+@ape.cli.network_option()
+@click.option(
+    "--vote-type",
+    "-t",
+    type=click.Choice(["ownership", "parameter", "emergency"]),
+    multiple=True,
+    default=["ownership", "parameter", "emergency"],
+)
+@click.option("--stop-block", type=int, default=None)
+def sync_index(network, vote_type, stop_block: int):
+
+    vote_index = VoteIndex()
+    for _vote_type in vote_type:
+        last_block = vote_index.sync(_vote_type, stop_block=stop_block)
+        RICH_CONSOLE.log(f"Indexed {_vote_type} votes up to block {last_block}")
 
-    votes = decode_vote_script(script)
-    for vote in votes:
-        formatted_output = vote["formatted_output"]
-        RICH_CONSOLE.log(formatted_output)
 
-    # get vote data
-    data = get_vote_data(vote_id, vote_type)
+@cli.command(
+    cls=ape.cli.NetworkBoundCommand,
+    name="voters",
+    short_help="Top voters and Convex share per vote, from CastVote events",
+)
+@ape.cli.network_option()
+@click.option(
+    "--vote-type",
+    "-t",
+    type=click.Choice(["ownership", "parameter", "emergency"]),
+    default="ownership",
+)
+@click.option("--top", type=int, default=20, help="Number of voters to list.")
+@click.option("--by", type=click.Choice(["stake", "votes"]), default="stake")
+def voters(network, vote_type: str, top: int, by: str):
+
+    # the local index is much faster than fetching every log from the node
+    vote_index = get_vote_index()
+    if vote_index is not None and vote_index.get_checkpoint(vote_type) is None:
+        vote_index = None
+
+    aggregator = aggregate_cast_votes(vote_type, index=vote_index)
+    for voter in aggregator.top_voters(top, by=by):
+        RICH_CONSOLE.log(voter)
+    for vote_id, share in aggregator.convex_shares().items():
+        RICH_CONSOLE.log(f"Vote {vote_id}: Convex share {share:.2%}")
+
+
+@cli.command(
+    name="simulate",
+    short_help="Simulate passing votes on parallel mainnet fork nodes",
+)
+@click.option(
+    "--vote-type",
+    "-t",
+    type=click.Choice(["ownership", "parameter", "emergency"]),
+    default="ownership",
+)
+@click.option("--vote-id", "-v", type=int, multiple=True, required=True)
+@click.option("--nodes", type=int, default=DEFAULT_NUM_NODES, show_default=True)
+@click.option("--block", type=int, default=None, help="Block to fork at.")
+def simulate_votes(vote_type: str, vote_id, nodes: int, block: int):
+
+    results = simulate_votes_parallel(
+        vote_id,
+        get_dao_voting_contract(vote_type),
+        num_nodes=nodes,
+        block_number=block,
+    )
+    for result in results:
+        RICH_CONSOLE.log(result)
+
+
+@cli.command(
+    cls=ape.cli.NetworkBoundCommand,
+    name="script-report",
+    short_help="Script size and gas estimates for a list of vote actions",
+)
+@ape.cli.network_option()
+@click.argument("actions_file", type=click.Path(exists=True, dir_okay=False))
+@click.option(
+    "--vote-type",
+    "-t",
+    type=click.Choice(["ownership", "parameter", "emergency"]),
+    default="ownership",
+)
+@click.option(
+    "--vote-creator",
+    default=None,
+    help="Address able to create votes, to estimate newVote and executeVote.",
+)
+@click.option("--no-estimate", is_flag=True, help="Only compute sizes, offline.")
+def script_report_cmd(
+    network, actions_file, vote_type: str, vote_creator: str, no_estimate: bool
+):
+
+    # a JSON list of ["target addr", "fn_name", *args] actions
+    with open(actions_file) as f:
+        actions = [tuple(action) for action in json.load(f)]
+
+    if vote_creator is not None:
+        vote_creator = ape.accounts[vote_creator]
+
+    report = script_report(
+        select_target(vote_type),
+        actions,
+        vote_creator=vote_creator,
+        estimate=not no_estimate,
+    )
+    RICH_CONSOLE.log(report)
+
+
+@cli.command(
+    name="warm-cache",
+    short_help="Load a contract bundle into the local contract cache",
+)
+@click.argument("bundle", type=click.Path(exists=True, dir_okay=False))
+def warm_cache(bundle):
+
+    num_contracts = warm_contract_cache(bundle)
+    RICH_CONSOLE.log(f"Cached {num_contracts} contracts from {bundle}")
+
+
+@cli.command(
+    name="seed-ipfs",
+    short_help="Load a JSON archive of IPFS descriptions into the local cache",
+)
+@click.argument("archive", type=click.Path(exists=True, dir_okay=False))
+def seed_ipfs(archive):
+
+    num_descriptions = seed_ipfs_cache(archive)
+    RICH_CONSOLE.log(f"Cached {num_descriptions} IPFS descriptions from {archive}")
+
+
+@cli.command(
+    name="load-signatures",
+    short_help="Load a 4-byte signature dump into the local signature database",
+)
+@click.argument("dump", type=click.Path(exists=True, dir_okay=False))
+def load_signatures(dump):
+
+    num_signatures = SignatureDB().load_dump(dump)
+    RICH_CONSOLE.log(f"Loaded {num_signatures} signatures from {dump}")
+
+
+@cli.command(
+    name="export-cache",
+    short_help="Write the local contract cache to a bundle file",
+)
+@click.argument("bundle", type=click.Path(dir_okay=False))
+def export_cache(bundle):
 
-    # decode vote data
-    results = decode_vote_data(data, vote_type)
-    RICH_CONSOLE.log(results["formatted_output"])
+    num_contracts = export_contract_cache(bundle)
+    RICH_CONSOLE.log(f"Exported {num_contracts} contracts to {bundle}")
@@ -1,8 +1,30 @@
 import ape
 import pytest
 
+from curve_dao import cache, contract_cache, ipfs, vote_cache
 from curve_dao.addresses import CRV, CURVE_DAO_OWNERSHIP, CURVE_DAO_PARAM, VOTING_ESCROW
 
+# module-level disk caches, kept out of the user's cache directory in tests
+DISK_CACHES = [
+    contract_cache.CONTRACT_CACHE,
+    contract_cache.CONTRACT_TYPE_CACHE,
+    ipfs.IPFS_CACHE,
+    ipfs.IPFS_MISSES,
+    vote_cache.VOTE_CACHE,
+]
+
+
+@pytest.fixture(autouse=True)
+def tmp_cache_dir(tmp_path, monkeypatch):
+    """Points every disk cache at a fresh directory, so tests always decode."""
+    cache_dir = tmp_path / "cache"
+    monkeypatch.setenv("CURVE_DAO_CACHE_DIR", str(cache_dir))
+    monkeypatch.setattr(cache, "CACHE_DIR", cache_dir)
+    for disk_cache in DISK_CACHES:
+        monkeypatch.setattr(disk_cache, "path", cache_dir / disk_cache.path.name)
+        monkeypatch.setattr(disk_cache, "_num_entries", None)
+    yield cache_dir
+
 
 @pytest.fixture(scope="module")
 def ownership_agent():
@@ -0,0 +1,135 @@
+import pytest
+from eth_hash.auto import keccak
+from eth_utils import to_checksum_address
+
+from curve_dao.abi_registry import AbiRegistry, UnknownContract
+from curve_dao.addresses import (
+    CURVE_DAO_OWNERSHIP,
+    CURVE_DAO_PARAM,
+    MULTICALL3,
+    VOTING_ESCROW,
+)
+from curve_dao.evmscript import encode_evm_script
+from curve_dao.vote_utils import decode_vote_script
+
+try:
+    from eth_abi import encode_abi
+except ImportError:
+    from eth_abi import encode as encode_abi
+
+
+@pytest.fixture(scope="module")
+def registry():
+    registry = AbiRegistry()
+    registry.load_bundled_abis()
+    return registry
+
+
+def agent_execute(target, selector, types, args):
+    calldata = keccak(selector.encode())[:4] + encode_abi(types, args)
+    return keccak(b"execute(address,uint256,bytes)")[:4] + encode_abi(
+        ["address", "uint256", "bytes"], [target, 0, calldata]
+    )
+
+
+def test_decode_offline(registry):
+    new_admin = CURVE_DAO_OWNERSHIP["voting"]
+    calldata = agent_execute(
+        VOTING_ESCROW, "commit_transfer_ownership(address)", ["address"], [new_admin]
+    )
+    script = encode_evm_script([(CURVE_DAO_OWNERSHIP["agent"], calldata)] * 2)
+
+    votes = decode_vote_script(script, registry=registry)
+
+    assert len(votes) == 2
+    for vote in votes:
+        assert vote["agent"] == CURVE_DAO_OWNERSHIP["agent"]
+        assert vote["target"] == VOTING_ESCROW
+        assert vote["function"] == "commit_transfer_ownership"
+        assert vote["inputs"] == [("addr", new_admin)]
+
+
+def test_decode_empty_script(registry):
+    assert decode_vote_script(b"", registry=registry) == []
+
+
+def test_unknown_contract(registry):
+    calldata = agent_execute(
+        "0x0000000000000000000000000000000000000001", "kill()", [], []
+    )
+    script = encode_evm_script([(CURVE_DAO_OWNERSHIP["agent"], calldata)])
+
+    with pytest.raises(UnknownContract):
+        decode_vote_script(script, registry=registry)
+
+
+MULTICALL_AGGREGATE_ABI = [
+    {
+        "type": "function",
+        "name": "aggregate",
+        "stateMutability": "payable",
+        "inputs": [
+            {
+                "name": "calls",
+                "type": "tuple[]",
+                "components": [
+                    {"name": "target", "type": "address"},
+                    {"name": "callData", "type": "bytes"},
+                ],
+            }
+        ],
+        "outputs": [],
+    }
+]
+
+
+def test_decode_nested_calls(registry):
+    registry.register(MULTICALL3, MULTICALL_AGGREGATE_ABI)
+    new_admin = CURVE_DAO_OWNERSHIP["voting"]
+    commit = keccak(b"commit_transfer_ownership(address)")[:4] + encode_abi(
+        ["address"], [new_admin]
+    )
+    multicall = keccak(b"aggregate((address,bytes)[])")[:4] + encode_abi(
+        ["(address,bytes)[]"], [[(VOTING_ESCROW, commit)] * 2]
+    )
+    forward = keccak(b"forward(bytes)")[:4] + encode_abi(
+        ["bytes"], [encode_evm_script([(MULTICALL3, multicall)])]
+    )
+    calldata = keccak(b"execute(address,uint256,bytes)")[:4] + encode_abi(
+        ["address", "uint256", "bytes"], [CURVE_DAO_PARAM["agent"], 0, forward]
+    )
+    script = encode_evm_script([(CURVE_DAO_OWNERSHIP["agent"], calldata)])
+
+    memo = {}
+    (action,) = decode_vote_script(script, registry=registry, memo=memo)
+
+    # agent.execute -> agent.forward -> multicall.aggregate -> 2x commit
+    assert action["agent"] == CURVE_DAO_OWNERSHIP["agent"]
+    assert action["target"] == to_checksum_address(CURVE_DAO_PARAM["agent"])
+    assert action["function"] == "forward"
+    (aggregate,) = action.calls
+    assert aggregate["target"] == MULTICALL3
+    assert aggregate["function"] == "aggregate"
+    assert [call["function"] for call in aggregate.calls] == [
+        "commit_transfer_ownership"
+    ] * 2
+    assert aggregate.calls[0] is aggregate.calls[1]
+    assert aggregate.calls[0]["inputs"] == [("addr", new_admin)]
+    # outer call, forward, aggregate and one shared commit
+    assert len(memo) == 4
+
+
+@pytest.mark.parametrize(
+    "signature", ["execute(address,uint256,bytes)", "forward(bytes)"]
+)
+def test_forwarder_selector_not_in_abi(registry, signature):
+    # VotingEscrow has neither function: the call is kept, not unwrapped
+    calldata = keccak(signature.encode())[:4] + b"\x01\x02"
+    script = encode_evm_script([(VOTING_ESCROW, calldata)])
+
+    (action,) = decode_vote_script(script, registry=registry)
+
+    assert action["target"] == VOTING_ESCROW
+    assert action["agent"] is None
+    assert action.calls == ()
+    assert action.undecoded or action.guessed
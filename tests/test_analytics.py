@@ -0,0 +1,71 @@
+from curve_dao.analytics import summarize, tally_votes, turnout_series, votes_frame
+from curve_dao.vote_reader import VoteRecord
+
+PCT = 10**16
+OWNERSHIP_THRESHOLDS = (51 * PCT, 30 * PCT)
+PARAMETER_THRESHOLDS = (30 * PCT, 15 * PCT)
+
+
+def record(vote_type, vote_id, open, yea, nay, voting_power, thresholds):
+    return VoteRecord(
+        vote_type, vote_id, open, False, 1692475643, 0, *thresholds,
+        yea, nay, voting_power, b"",
+    )  # fmt: skip
+
+
+def test_tally_votes():
+    records = [
+        # vote 404 of the ownership DAO
+        record(
+            "ownership",
+            404,
+            False,
+            459475144503577289039481284,
+            0,
+            625546146444045385843289050,
+            OWNERSHIP_THRESHOLDS,
+        ),
+        record("ownership", 1, False, 40, 60, 100, OWNERSHIP_THRESHOLDS),
+        record("ownership", 2, True, 0, 0, 100, OWNERSHIP_THRESHOLDS),
+        record("parameter", 1, False, 0, 0, 100, PARAMETER_THRESHOLDS),
+        record("parameter", 2, False, 50, 0, 1000, PARAMETER_THRESHOLDS),
+        record("parameter", 3, False, 10, 90, 1000, PARAMETER_THRESHOLDS),
+        # exactly at the support threshold: the contract requires more
+        record("parameter", 4, False, 3 * 10**26, 7 * 10**26, 10**27, PARAMETER_THRESHOLDS),
+        # exactly at the quorum threshold (quorum counts yes votes only)
+        record("parameter", 5, False, 15 * 10**25, 0, 10**27, PARAMETER_THRESHOLDS),
+        # just above both thresholds
+        record("parameter", 6, False, 3 * 10**26 + 10**9, 7 * 10**26 - 10**9, 10**27, PARAMETER_THRESHOLDS),
+    ]  # fmt: skip
+    df = tally_votes(votes_frame(records)).set_index(["vote_type", "vote_id"])
+
+    assert df.loc[("ownership", 404), "status"] == "Vote Passed"
+    assert abs(df.loc[("ownership", 404), "quorum"] - 0.7345183838402511) < 1e-15
+    assert df.loc[("ownership", 404), "yea"] == 459475144503577289039481284
+    assert df.loc[("ownership", 1), "status"] == "Vote Failed: Support Not Met"
+    assert df.loc[("ownership", 2), "status"] == "Voting Ongoing"
+    assert df.loc[("parameter", 1), "status"] == "Vote Invalid: No Votes"
+    assert df.loc[("parameter", 2), "status"] == "Vote Failed: Quorum Not Met"
+    assert (
+        df.loc[("parameter", 3), "status"]
+        == "Vote Failed: Both Support and Quorum Not Met"
+    )
+    assert df.loc[("parameter", 4), "status"] == "Vote Failed: Support Not Met"
+    assert df.loc[("parameter", 5), "status"] == "Vote Failed: Quorum Not Met"
+    assert df.loc[("parameter", 6), "status"] == "Vote Passed"
+
+
+def test_summaries():
+    records = [
+        record("ownership", i, False, 60, 40, 100, OWNERSHIP_THRESHOLDS)
+        for i in range(3)
+    ] + [record("parameter", 0, False, 0, 0, 100, PARAMETER_THRESHOLDS)]
+    df = tally_votes(votes_frame(records))
+
+    summary = summarize(df)
+    assert summary.loc["ownership", "votes"] == 3
+    assert summary.loc["ownership", "passed"] == 3
+    assert summary.loc["parameter", "failed"] == 1
+
+    series = turnout_series(df)
+    assert series["votes"].sum() == 4
@@ -0,0 +1,64 @@
+import asyncio
+import threading
+
+from curve_dao import async_decode
+from curve_dao.async_decode import decode_vote_async, decode_votes_async
+from curve_dao.vote_utils import decode_vote
+
+# `getVote` result of a closed ownership vote
+STUB_VOTE = {
+    "open": False,
+    "executed": True,
+    "startDate": 1692475643,
+    "snapshotBlock": 17950000,
+    "supportRequired": 51 * 10**16,
+    "minAcceptQuorum": 30 * 10**16,
+    "yea": 600,
+    "nay": 0,
+    "votingPower": 1000,
+    "script": b"\x00\x00\x00\x01",
+}
+
+
+def test_decode_vote_async_matches_decode_vote(vote_deployer):
+    decoded = asyncio.run(decode_vote_async(404, "ownership"))
+    expected = decode_vote(404, "ownership")
+
+    assert decoded["description"] == expected["description"]
+    assert [a["inputs"] for a in decoded["actions"]] == [
+        a["inputs"] for a in expected["actions"]
+    ]
+    assert decoded["results"]["quorum"] == expected["results"]["quorum"]
+
+
+def test_stages_overlap(monkeypatch):
+    # two votes at a time, two stages each: all four stages must be in flight
+    # at once to get through the barrier
+    barrier = threading.Barrier(4, timeout=10)
+
+    def description(*args, **kwargs):
+        barrier.wait()
+        return {"text": "test"}
+
+    def decode(script):
+        barrier.wait()
+        return []
+
+    monkeypatch.setattr(async_decode, "get_ipfs_hash_from_vote_id", lambda *a, **k: "")
+    monkeypatch.setattr(async_decode, "get_description_from_ipfs_hash", description)
+    monkeypatch.setattr(async_decode, "decode_vote_script", decode)
+
+    async def decode_all():
+        votes = {vote_id: STUB_VOTE for vote_id in (404, 405, 406, 407)}
+        return [
+            r
+            async for r in decode_votes_async(
+                "ownership", votes, concurrency=2, use_cache=False
+            )
+        ]
+
+    records = asyncio.run(decode_all())
+
+    # failed decodes (e.g. a broken barrier) are yielded as error dicts
+    assert [r["error"] for r in records if isinstance(r, dict)] == []
+    assert sorted(r["vote_id"] for r in records) == [404, 405, 406, 407]
@@ -0,0 +1,125 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import ape
+import pytest
+
+from curve_dao import contract_cache
+from curve_dao.addresses import CURVE_DAO_OWNERSHIP
+from curve_dao.cache import DiskCache
+from curve_dao.contract_cache import (
+    export_contract_cache,
+    get_contract,
+    warm_contract_cache,
+)
+
+
+@pytest.fixture
+def tmp_contract_cache(tmp_path, monkeypatch):
+    cache = DiskCache("contracts", ttl=3600, max_entries=10, cache_dir=tmp_path)
+    type_cache = DiskCache("contract_types", max_entries=10, cache_dir=tmp_path)
+    monkeypatch.setattr(contract_cache, "CONTRACT_CACHE", cache)
+    monkeypatch.setattr(contract_cache, "CONTRACT_TYPE_CACHE", type_cache)
+    monkeypatch.setattr(contract_cache, "_CONTRACT_TYPES", {})
+    yield cache
+
+
+def test_disk_cache_ttl_and_eviction(tmp_path):
+    cache = DiskCache("test", ttl=3600, max_entries=2, cache_dir=tmp_path)
+    cache.set("a", 1)
+    time.sleep(0.01)
+    cache.set("b", 2)
+    time.sleep(0.01)
+    cache.get("a")  # "b" is now least recently used
+    cache.set("c", 3)
+
+    assert len(cache) == 2
+    assert cache.get("a") == 1
+    assert cache.get("b") is None
+    assert cache.get("c") == 3
+
+    cache.ttl = -1
+    assert cache.get("a") is None
+
+
+def test_get_contract_served_from_cache(tmp_contract_cache, monkeypatch):
+    agent = get_contract(CURVE_DAO_OWNERSHIP["agent"])
+    assert len(tmp_contract_cache) == 1
+
+    def no_lookups(address):
+        raise AssertionError("contract lookup should be served from the cache")
+
+    monkeypatch.setattr(ape, "Contract", no_lookups)
+    cached_agent = get_contract(CURVE_DAO_OWNERSHIP["agent"].lower())
+    assert cached_agent.address == agent.address
+    assert cached_agent.contract_type.abi == agent.contract_type.abi
+
+
+def test_contract_types_shared_by_codehash(tmp_contract_cache, monkeypatch):
+    agent = get_contract(CURVE_DAO_OWNERSHIP["agent"])
+    voting = get_contract(CURVE_DAO_OWNERSHIP["voting"])
+    # same Aragon proxy code, different apps behind it
+    assert voting.contract_type is not agent.contract_type
+    assert len(contract_cache.CONTRACT_TYPE_CACHE) == 2
+
+    tmp_contract_cache.clear()
+    contract_cache._CONTRACT_TYPES.clear()
+
+    def no_lookups(address):
+        raise AssertionError("known code should be served from the type cache")
+
+    monkeypatch.setattr(ape, "Contract", no_lookups)
+    cached_agent = get_contract(CURVE_DAO_OWNERSHIP["agent"])
+    assert cached_agent.contract_type.abi == agent.contract_type.abi
+    # parsed once, shared by every contract with that code
+    assert get_contract(CURVE_DAO_OWNERSHIP["agent"]).contract_type is (
+        cached_agent.contract_type
+    )
+
+
+def test_bundle_round_trip(tmp_contract_cache, tmp_path):
+    get_contract(CURVE_DAO_OWNERSHIP["agent"])
+    bundle = tmp_path / "bundle.json"
+    assert export_contract_cache(bundle) == 1
+
+    tmp_contract_cache.clear()
+    assert warm_contract_cache(bundle) == 1
+    assert len(tmp_contract_cache) == 1
+
+
+def test_disk_cache_evicts_in_chunks(tmp_path, monkeypatch):
+    cache = DiskCache("test", max_entries=10, cache_dir=tmp_path)
+    for i in range(10):
+        cache.set(str(i), i)
+
+    scans = []
+    entry_paths = cache._entry_paths
+
+    def counted_entry_paths():
+        scans.append(1)
+        return entry_paths()
+
+    monkeypatch.setattr(cache, "_entry_paths", counted_entry_paths)
+    for i in range(10, 12):
+        cache.set(str(i), i)
+
+    # the first insert past the limit evicts down to 9 entries, the next fits
+    assert len(scans) == 1
+    assert len(entry_paths()) == 10
+
+
+def test_disk_cache_concurrent_set(tmp_path):
+    cache = DiskCache("test", cache_dir=tmp_path)
+    barrier = threading.Barrier(8, timeout=10)
+
+    def write(i):
+        barrier.wait()
+        for _ in range(50):
+            cache.set("shared", i)
+
+    with ThreadPoolExecutor(8) as executor:
+        list(executor.map(write, range(8)))
+
+    assert cache.get("shared") in range(8)
+    assert list(tmp_path.glob("test/*/*.tmp")) == []
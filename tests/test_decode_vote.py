@@ -1,4 +1,4 @@
-from curve_dao.vote_utils import decode_vote_script, get_vote_script
+from curve_dao.vote_utils import decode_vote, decode_vote_script, get_vote_script
 
 
 def test_decode_vote_script_ownership(vote_deployer):
@@ -62,3 +62,16 @@ def test_decode_vote_script_parameter(vote_deployer):
         assert vote["target"] == expected_vote["target"]
         assert vote["function"] == expected_vote["function"]
         assert vote["inputs"] == expected_vote["inputs"]
+
+
+def test_decode_vote(vote_deployer):
+    vote_id = 404
+    decoded = decode_vote(vote_id, "ownership")
+
+    assert decoded["vote_id"] == vote_id
+    assert decoded["vote_type"] == "ownership"
+    assert [action["function"] for action in decoded["actions"]] == [
+        "price_w",
+        "add_market",
+    ]
+    assert decoded["results"]["executed"] is True
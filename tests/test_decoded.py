@@ -0,0 +1,137 @@
+import json
+
+import pytest
+from eth_utils import to_canonical_address
+from ethpm_types.abi import ABIType, MethodABI
+
+from curve_dao.addresses import CURVE_DAO_OWNERSHIP, VOTING_ESCROW
+from curve_dao.decoded import DecodedAction, DecodedVote, VoteTally, _Record, to_json
+from curve_dao.decoder_utils import compact_values, expand_values
+
+PCT = 10**16
+NEW_ADMIN = CURVE_DAO_OWNERSHIP["voting"]
+ACTION = DecodedAction(
+    raw_target=to_canonical_address(VOTING_ESCROW),
+    method=MethodABI(
+        type="function",
+        name="commit_transfer_ownership",
+        inputs=[ABIType(name="addr", type="address")],
+    ),
+    raw_inputs=(to_canonical_address(NEW_ADMIN),),
+    raw_agent=to_canonical_address(CURVE_DAO_OWNERSHIP["agent"]),
+)
+TALLY = VoteTally(
+    start=1692475643,
+    voting_power=1000,
+    open=False,
+    executed=True,
+    yes=600,
+    no=0,
+    support_required=51 * PCT,
+    min_accept_quorum=30 * PCT,
+)
+
+
+def test_dict_access():
+    assert ACTION["agent"] == CURVE_DAO_OWNERSHIP["agent"]
+    assert ACTION["target"] == VOTING_ESCROW
+    assert ACTION["function"] == "commit_transfer_ownership"
+    assert ACTION["inputs"] == [("addr", NEW_ADMIN)]
+    assert ACTION["guessed"] is False
+    assert TALLY["votingPower"] == TALLY.voting_power == 1000
+    assert TALLY["end"] == 1692475643 + 604800
+
+
+def test_records_have_no_dict():
+    for record in (ACTION, TALLY, DecodedVote("ownership", 1, "", [], TALLY)):
+        assert not hasattr(record, "__dict__")
+
+
+def test_compact_values_round_trip():
+    types = ["address", "(address,uint256)[]", "bytes32", "string"]
+    values = (
+        NEW_ADMIN,
+        ((VOTING_ESCROW, 1), (NEW_ADMIN, 2)),
+        b"\x01" * 32,
+        "curve",
+    )
+    raw = compact_values(types, values)
+
+    assert raw[0] == to_canonical_address(NEW_ADMIN)
+    assert raw[1][0] == (to_canonical_address(VOTING_ESCROW), 1)
+    assert expand_values(types, raw)[:2] == [
+        NEW_ADMIN,
+        [[VOTING_ESCROW, 1], [NEW_ADMIN, 2]],
+    ]
+    assert expand_values(types, None) == ["<?>"] * 4
+
+
+def test_status():
+    assert TALLY.support == 1.0
+    assert TALLY.quorum == 0.6
+    assert TALLY.status == "Vote Passed"
+    assert VoteTally(1, 1000, False, True, 100, 0, 51 * PCT, 30 * PCT).status == (
+        "Vote Failed: Quorum Not Met"
+    )
+    assert (
+        VoteTally(1, 1000, True, False, 0, 0, 51 * PCT, 30 * PCT).status
+        == "Voting Ongoing"
+    )
+
+
+def test_status_follows_aragon():
+    def status(yes, no, voting_power=10**27):
+        return VoteTally(
+            1, voting_power, False, False, yes, no, 30 * PCT, 15 * PCT
+        ).status
+
+    # yes votes are only 10% of the voting power
+    assert status(10 * 10**25, 6 * 10**25) == "Vote Failed: Quorum Not Met"
+    # exactly at a threshold is not enough
+    assert status(15 * 10**25, 0) == "Vote Failed: Quorum Not Met"
+    assert status(3 * 10**26, 7 * 10**26) == "Vote Failed: Support Not Met"
+    assert status(3 * 10**26 + 10**9, 7 * 10**26 - 10**9) == "Vote Passed"
+    assert TALLY.required_support == 0.51
+    assert TALLY["supportRequired"] == 51 * PCT
+
+
+def test_to_json_has_no_markup():
+    vote = DecodedVote("ownership", 404, "description", [ACTION], TALLY)
+    record = json.loads(to_json(vote))
+
+    assert record["actions"][0]["inputs"] == [["addr", NEW_ADMIN]]
+    assert record["results"]["voting_power"] == 1000
+    assert "formatted_output" not in record["results"]
+
+
+def test_to_json_is_lossless():
+    action = DecodedAction(
+        raw_target=to_canonical_address(VOTING_ESCROW),
+        method=MethodABI(
+            type="function",
+            name="set",
+            inputs=[
+                ABIType(name="data", type="bytes"),
+                ABIType(name="name", type="string"),
+                ABIType(name="admins", type="address[]"),
+            ],
+        ),
+        raw_inputs=(b"\x01" * 40, "curve", (to_canonical_address(NEW_ADMIN),)),
+    )
+    record = json.loads(to_json(action))
+
+    assert record["inputs"] == [
+        ["data", "0x" + "01" * 40],
+        ["name", "curve"],
+        ["admins", [NEW_ADMIN]],
+    ]
+
+
+def test_record_base_is_abstract():
+    with pytest.raises(TypeError):
+        _Record()
+
+
+def test_formatted_output():
+    assert "commit_transfer_ownership" in ACTION.formatted_output
+    assert "Vote Passed" in TALLY.formatted_output
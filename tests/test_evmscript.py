@@ -0,0 +1,57 @@
+import pytest
+from eth_utils import to_canonical_address
+
+from curve_dao.addresses import CURVE_DAO_OWNERSHIP, CURVE_DAO_PARAM
+from curve_dao.evmscript import (
+    CALLSCRIPT_ID,
+    InvalidEVMScript,
+    decode_evm_script,
+    encode_evm_script,
+)
+
+CALLS = [
+    (CURVE_DAO_OWNERSHIP["agent"], bytes.fromhex("b61d27f6") + b"\x01" * 100),
+    (CURVE_DAO_PARAM["agent"], b""),
+    (CURVE_DAO_OWNERSHIP["agent"], b"\xff" * 300),
+]
+
+
+def test_encode_layout():
+    script = encode_evm_script(CALLS[:1])
+
+    assert script[:4] == CALLSCRIPT_ID
+    assert script[4:24] == bytes.fromhex(CURVE_DAO_OWNERSHIP["agent"][2:])
+    assert script[24:28] == (104).to_bytes(4, "big")
+    assert script[28:] == CALLS[0][1]
+
+
+def test_round_trip():
+    script = encode_evm_script(CALLS)
+    decoded = decode_evm_script(script)
+
+    assert [(address, bytes(calldata)) for address, calldata in decoded] == [
+        (to_canonical_address(address), calldata) for address, calldata in CALLS
+    ]
+    assert encode_evm_script(decoded) == script
+
+
+def test_empty_script():
+    assert decode_evm_script(CALLSCRIPT_ID) == []
+    # votes without actions have no script at all
+    assert decode_evm_script(b"") == []
+    assert encode_evm_script([]) == CALLSCRIPT_ID
+
+
+@pytest.mark.parametrize(
+    "script",
+    [
+        b"\x00\x00",
+        b"\x00\x00\x00\x02",
+        encode_evm_script(CALLS)[:30],
+        encode_evm_script(CALLS)[:-1],
+        encode_evm_script(CALLS) + b"\x00",
+    ],
+)
+def test_invalid_scripts(script):
+    with pytest.raises(InvalidEVMScript):
+        decode_evm_script(script)
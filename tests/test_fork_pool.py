@@ -0,0 +1,140 @@
+import queue
+from concurrent.futures import ThreadPoolExecutor
+
+import ape
+import pytest
+
+from curve_dao import fork_pool
+from curve_dao.fork_pool import FORK_CONFIRMATIONS, ForkPool, _connect_worker
+
+
+def _double(batch, offset):
+    return [job * 2 + offset for job in batch]
+
+
+def test_map_batches_keeps_job_order():
+    pool = ForkPool(3, fork_url="http://127.0.0.1:1")
+    assert pool.ports == [8600, 8601, 8602]
+
+    with ThreadPoolExecutor(3) as executor:
+        pool._executor = executor
+        assert pool.map_batches(_double, list(range(10)), 1) == [
+            job * 2 + 1 for job in range(10)
+        ]
+
+
+def test_map_batches_no_jobs():
+    pool = ForkPool(3, fork_url="http://127.0.0.1:1")
+    assert pool.map_batches(_double, [], 1) == []
+
+
+class FakeNode:
+    def __init__(self, command, **kwargs):
+        self.command = command
+        self.terminated = False
+        self.waited = False
+
+    def terminate(self):
+        self.terminated = True
+
+    def wait(self):
+        self.waited = True
+
+
+class FakeExecutor:
+    def __init__(self, **kwargs):
+        self.kwargs = kwargs
+        self.shut_down = False
+
+    def shutdown(self):
+        self.shut_down = True
+
+
+@pytest.fixture
+def fake_nodes(monkeypatch):
+    nodes = []
+
+    def start_node(command, **kwargs):
+        nodes.append(FakeNode(command, **kwargs))
+        return nodes[-1]
+
+    monkeypatch.setattr(fork_pool.subprocess, "Popen", start_node)
+    monkeypatch.setattr(fork_pool, "ProcessPoolExecutor", FakeExecutor)
+    monkeypatch.setattr(fork_pool, "_rpc", lambda url, method: hex(1000))
+    yield nodes
+
+
+def test_start_and_close(fake_nodes):
+    pool = ForkPool(2, fork_url="http://upstream", provider="foundry")
+    pool.start()
+
+    assert pool.block_number == 1000 - FORK_CONFIRMATIONS
+    executor = pool._executor
+    assert [node.command for node in fake_nodes] == [
+        ["anvil", "--fork-url", "http://upstream"]
+        + ["--fork-block-number", str(1000 - FORK_CONFIRMATIONS)]
+        + ["--port", str(port)]
+        for port in (8600, 8601)
+    ]
+    assert executor.kwargs["max_workers"] == 2
+    assert executor.kwargs["initargs"][1] == "foundry"
+
+    pool.close()
+
+    assert executor.shut_down
+    assert all(node.terminated and node.waited for node in fake_nodes)
+    assert pool._nodes == [] and pool._executor is None
+
+
+def test_start_stops_nodes_on_failure(fake_nodes, monkeypatch):
+    def node_down(self, port):
+        raise TimeoutError(f"Fork node on port {port} did not start")
+
+    monkeypatch.setattr(ForkPool, "_wait_for_node", node_down)
+    pool = ForkPool(2, fork_url="http://upstream", block_number=123)
+
+    with pytest.raises(TimeoutError):
+        pool.start()
+
+    assert len(fake_nodes) == 2
+    assert all(node.terminated for node in fake_nodes)
+    assert pool._executor is None
+
+
+def test_connect_worker_takes_one_node_each(monkeypatch):
+    class FakeNetworkContext:
+        def __init__(self, choice, provider_settings):
+            self.choice = choice
+            self.host = provider_settings["host"]
+            self.entered = False
+
+        def __enter__(self):
+            self.entered = True
+
+    class FakeNetworks:
+        parse_network_choice = FakeNetworkContext
+
+    monkeypatch.setattr(ape, "networks", FakeNetworks)
+    monkeypatch.setattr(fork_pool, "_NETWORK_CONTEXT", None)
+    ports = queue.Queue()
+    for port in (8600, 8601):
+        ports.put(port)
+
+    contexts = []
+    for _ in range(2):
+        _connect_worker(ports, "hardhat")
+        contexts.append(fork_pool._NETWORK_CONTEXT)
+
+    assert [context.host for context in contexts] == [
+        "http://127.0.0.1:8600",
+        "http://127.0.0.1:8601",
+    ]
+    assert all(
+        context.choice == "ethereum:mainnet-fork:hardhat" for context in contexts
+    )
+    assert all(context.entered for context in contexts)
+
+
+def test_unsupported_provider():
+    with pytest.raises(ValueError):
+        ForkPool(2, fork_url="http://127.0.0.1:1", provider="ganache")
@@ -0,0 +1,34 @@
+import subprocess
+import sys
+
+# generous: ape alone takes seconds to import, the entry point takes ~50 ms
+IMPORT_TIME_BUDGET_US = 500_000
+HEAVY_MODULES = ["ape", "pandas", "numpy", "rich", "web3"]
+
+
+def _run(code: str, *flags: str) -> subprocess.CompletedProcess:
+    return subprocess.run(
+        [sys.executable, *flags, "-c", code],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+
+def test_no_heavy_imports_on_startup():
+    code = (
+        "import sys, curve_dao, curve_dao.__main__, curve_dao.vote_utils, "
+        "curve_dao.abi_registry, curve_dao.multicall, curve_dao.vote_reader, "
+        "curve_dao.vote_index; "
+        f"print(','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))"
+    )
+    assert _run(code).stdout.strip() == ""
+
+
+def test_entry_point_import_time_budget():
+    stderr = _run("import curve_dao.__main__", "-X", "importtime").stderr
+    line = next(
+        line for line in stderr.splitlines() if line.endswith("| curve_dao.__main__")
+    )
+    cumulative_us = int(line.split("|")[1])
+    assert cumulative_us < IMPORT_TIME_BUDGET_US
@@ -0,0 +1,147 @@
+import json
+import time
+
+import pytest
+import requests
+
+from curve_dao import ipfs
+from curve_dao.cache import DiskCache
+from curve_dao.ipfs import (
+    extract_json,
+    get_description_from_ipfs_hash,
+    get_session,
+    seed_ipfs_cache,
+)
+
+IPFS_HASH = "QmTestDescription"
+
+
+@pytest.fixture
+def ipfs_caches(tmp_path, monkeypatch):
+    monkeypatch.setattr(ipfs, "IPFS_CACHE", DiskCache("ipfs", cache_dir=tmp_path))
+    monkeypatch.setattr(
+        ipfs, "IPFS_MISSES", DiskCache("ipfs_misses", ttl=3600, cache_dir=tmp_path)
+    )
+
+
+@pytest.fixture
+def ipfs_requests(monkeypatch):
+    calls = []
+
+    def timeout(*args, **kwargs):
+        calls.append(args)
+        raise requests.Timeout()
+
+    monkeypatch.setattr(requests.Session, "post", timeout)
+    yield calls
+
+
+def test_seeded_description_is_served_offline(ipfs_caches, ipfs_requests, tmp_path):
+    archive = tmp_path / "archive.json"
+    archive.write_text(json.dumps({IPFS_HASH: {"text": "test"}}))
+    assert seed_ipfs_cache(archive) == 1
+
+    assert get_description_from_ipfs_hash(IPFS_HASH) == {"text": "test"}
+    assert get_description_from_ipfs_hash(IPFS_HASH, offline=True) == {"text": "test"}
+    assert len(ipfs_requests) == 0
+
+
+def test_offline_never_fetches(ipfs_caches, ipfs_requests):
+    description = get_description_from_ipfs_hash(IPFS_HASH, offline=True)
+
+    assert "offline" in description
+    assert len(ipfs_requests) == 0
+
+
+def test_unpinned_hash_is_not_retried(ipfs_caches, ipfs_requests):
+    first = get_description_from_ipfs_hash(IPFS_HASH)
+    second = get_description_from_ipfs_hash(IPFS_HASH)
+
+    assert "timed out" in first
+    assert second == first
+    assert len(ipfs_requests) == 1
+
+
+def test_extract_json_with_braces_in_text():
+    description = {"text": "set {A: 100} and {fee: 0.04%} — ✓"}
+    content = (
+        b"tar header\x00\x00"
+        + json.dumps(description, ensure_ascii=False).encode()
+        + b"\x00" * 512
+    )
+
+    # one byte per chunk: objects and multi-byte characters span chunks
+    chunks = [content[i : i + 1] for i in range(len(content))]
+    assert extract_json(chunks) == description
+
+
+def test_extract_json_caps_size():
+    chunks = [b'{"text": "' + b"a" * 1024] * 10
+
+    with pytest.raises(ValueError, match="exceeds"):
+        extract_json(chunks, max_bytes=4096)
+
+
+def test_session_is_shared():
+    assert get_session() is get_session()
+
+
+def test_gateway_race_returns_first_success(ipfs_caches, monkeypatch):
+    def api_timeout(ipfs_hash):
+        time.sleep(0.5)
+        raise requests.Timeout()
+
+    def gateway(gateway, ipfs_hash):
+        if gateway == "https://slow.gateway":
+            time.sleep(1)
+        if gateway == "https://broken.gateway":
+            raise requests.HTTPError("504")
+        return {"text": gateway}
+
+    monkeypatch.setattr(ipfs, "_fetch_description_from_api", api_timeout)
+    monkeypatch.setattr(ipfs, "_fetch_description_from_gateway", gateway)
+
+    gateways = [
+        "https://slow.gateway",
+        "https://broken.gateway",
+        "https://fast.gateway",
+    ]
+    description = get_description_from_ipfs_hash(IPFS_HASH, gateways=gateways)
+    assert description == {"text": "https://fast.gateway"}
+
+
+def test_gateway_race_all_fail(ipfs_caches, monkeypatch):
+    def api_timeout(ipfs_hash):
+        raise requests.Timeout()
+
+    def gateway_error(gateway, ipfs_hash):
+        raise requests.HTTPError("504")
+
+    monkeypatch.setattr(ipfs, "_fetch_description_from_api", api_timeout)
+    monkeypatch.setattr(ipfs, "_fetch_description_from_gateway", gateway_error)
+
+    description = get_description_from_ipfs_hash(IPFS_HASH, gateways=["https://a"])
+    assert description.startswith("IPFS")
+
+
+@pytest.mark.parametrize(
+    "status_code, cached", [(404, True), (401, False), (429, False)]
+)
+def test_only_not_found_is_negative_cached(
+    ipfs_caches, monkeypatch, status_code, cached
+):
+    calls = []
+
+    def http_error(ipfs_hash):
+        calls.append(ipfs_hash)
+        response = requests.Response()
+        response.status_code = status_code
+        raise requests.HTTPError(str(status_code), response=response)
+
+    monkeypatch.setattr(ipfs, "_fetch_description_from_api", http_error)
+
+    first = get_description_from_ipfs_hash(IPFS_HASH)
+    get_description_from_ipfs_hash(IPFS_HASH)
+
+    assert first.startswith("IPFS request error")
+    assert len(calls) == (1 if cached else 2)
@@ -0,0 +1,69 @@
+import contextlib
+import json
+from types import SimpleNamespace
+
+import ape
+import pytest
+from click.testing import CliRunner
+from eth_utils import to_canonical_address
+from ethpm_types.abi import ABIType, MethodABI
+
+from curve_dao import vote_utils
+from curve_dao.__main__ import cli
+from curve_dao.addresses import CURVE_DAO_OWNERSHIP, VOTING_ESCROW
+from curve_dao.decoded import DecodedAction, DecodedVote
+
+
+def _action(new_admin: str) -> DecodedAction:
+    return DecodedAction(
+        raw_target=to_canonical_address(VOTING_ESCROW),
+        method=MethodABI(
+            type="function",
+            name="commit_transfer_ownership",
+            inputs=[ABIType(name="addr", type="address")],
+        ),
+        raw_inputs=(to_canonical_address(new_admin),),
+        raw_agent=to_canonical_address(CURVE_DAO_OWNERSHIP["agent"]),
+    )
+
+
+@pytest.fixture
+def decode_vote(monkeypatch):
+    networks = SimpleNamespace(
+        parse_network_choice=lambda network: contextlib.nullcontext()
+    )
+    monkeypatch.setattr(ape, "networks", networks)
+
+    def decode(vote_id, vote_type, **kwargs):
+        if vote_id != 1:
+            raise vote_utils.MissingVote(f"Vote ID {vote_id} not found")
+        actions = [_action(CURVE_DAO_OWNERSHIP[key]) for key in ("voting", "agent")]
+        return DecodedVote(vote_type, vote_id, "description", actions)
+
+    monkeypatch.setattr(vote_utils, "decode_vote", decode)
+
+
+def test_decode_ndjson_one_action_per_line(decode_vote):
+    result = CliRunner().invoke(
+        cli, ["decode", "-t", "emergency", "-v", "1", "--format", "ndjson"]
+    )
+
+    assert result.exit_code == 0
+    lines = [json.loads(line) for line in result.output.splitlines()]
+    assert [line["inputs"][0][1] for line in lines] == [
+        CURVE_DAO_OWNERSHIP["voting"],
+        CURVE_DAO_OWNERSHIP["agent"],
+    ]
+
+
+@pytest.mark.parametrize("output_format", ["json", "ndjson"])
+def test_decode_missing_vote_writes_json(decode_vote, output_format):
+    result = CliRunner().invoke(
+        cli, ["decode", "-t", "ownership", "-v", "2", "--format", output_format]
+    )
+
+    assert result.exit_code == 1
+    error = json.loads(result.output)
+    assert error["vote_type"] == "ownership"
+    assert error["vote_id"] == 2
+    assert "not found" in error["error"]
@@ -0,0 +1,23 @@
+from curve_dao.addresses import CRYPTOSWAP_OWNER_PROXY, CURVE_DAO_OWNERSHIP
+from curve_dao.evmscript import decode_evm_script
+from curve_dao.vote_utils import _encode_action_segment, prepare_vote_script
+
+GAUGES = [f"0x{i:040x}" for i in range(1, 6)]
+
+
+def test_prepare_vote_script_memoizes_actions(ownership_agent):
+    actions = [(CRYPTOSWAP_OWNER_PROXY, "set_killed", gauge, True) for gauge in GAUGES]
+    _encode_action_segment.cache_clear()
+
+    script = prepare_vote_script(CURVE_DAO_OWNERSHIP, actions)
+    calls = decode_evm_script(script)
+    assert len(calls) == len(actions)
+    assert calls[0][0] == bytes.fromhex(ownership_agent.address[2:])
+    assert _encode_action_segment.cache_info().misses == len(actions)
+
+    # editing one action only encodes that action again
+    actions[2] = (CRYPTOSWAP_OWNER_PROXY, "set_killed", GAUGES[2], False)
+    edited = prepare_vote_script(CURVE_DAO_OWNERSHIP, actions)
+    assert _encode_action_segment.cache_info().misses == len(actions) + 1
+    assert edited != script
+    assert decode_evm_script(edited)[3] == calls[3]
@@ -0,0 +1,77 @@
+from types import SimpleNamespace
+
+from ape.exceptions import ApeException
+
+from curve_dao import script_report as script_report_module
+from curve_dao.addresses import CRYPTOSWAP_OWNER_PROXY, CURVE_DAO_OWNERSHIP
+from curve_dao.script_report import (
+    EXECUTE_VOTE_ERROR,
+    calldata_gas,
+    script_report,
+    split_actions,
+)
+from curve_dao.simulate import ActionResult
+
+
+def test_calldata_gas():
+    assert calldata_gas(b"") == 0
+    assert calldata_gas(b"\x00\x01\x00\xff") == 2 * 4 + 2 * 16
+
+
+def test_split_actions():
+    assert split_actions([5, 5, 5, 5], 10) == [[0, 1], [2, 3]]
+    assert split_actions([5, 20, 5], 10) == [[0], [1], [2]]
+    assert split_actions([1, 2, 3], 100) == [[0, 1, 2]]
+
+
+def test_script_report(vote_deployer):
+    gauge = "0x762648808ef8b25c6d92270b1c84ec97df3bed6b"
+    actions = [
+        (CRYPTOSWAP_OWNER_PROXY, "set_killed", gauge, True),
+        (CRYPTOSWAP_OWNER_PROXY, "set_killed", gauge, False),
+    ]
+
+    report = script_report(CURVE_DAO_OWNERSHIP, actions, vote_creator=vote_deployer)
+
+    # set_killed(address,bool) wrapped in agent.execute(address,uint256,bytes)
+    assert report.action_calldata_sizes == [228, 228]
+    assert report.script_size == 4 + 2 * (20 + 4 + 228)
+    assert report.new_vote_gas > report.new_vote_calldata_gas
+    assert all(gas > 0 for gas in report.action_gas)
+    assert report.execute_gas > sum(report.action_gas)
+    assert not report.errors
+    assert report.batches == []
+
+
+def test_script_report_execute_vote_fails(monkeypatch):
+    gauge = "0x762648808ef8b25c6d92270b1c84ec97df3bed6b"
+    actions = [(CRYPTOSWAP_OWNER_PROXY, "set_killed", gauge, True)]
+
+    def execute_vote_gas(*args):
+        raise ApeException("vote not passed")
+
+    voting = SimpleNamespace(
+        newVote=SimpleNamespace(estimate_gas_cost=lambda *a, **k: 500_000)
+    )
+    chain = SimpleNamespace(blocks=SimpleNamespace(head=SimpleNamespace(gas_limit=1)))
+    monkeypatch.setattr(script_report_module.ape, "chain", chain)
+    monkeypatch.setattr(
+        script_report_module,
+        "encode_action_segment",
+        lambda agent, action: bytes(20) + (4).to_bytes(4, "big") + b"\x01" * 4,
+    )
+    monkeypatch.setattr(script_report_module, "get_contract", lambda addr: voting)
+    monkeypatch.setattr(
+        script_report_module,
+        "preflight",
+        lambda target, actions: [
+            ActionResult(a, True, gas_used=80_000) for a in actions
+        ],
+    )
+    monkeypatch.setattr(script_report_module, "_execute_vote_gas", execute_vote_gas)
+
+    report = script_report(CURVE_DAO_OWNERSHIP, actions, vote_creator="creator")
+
+    assert report.new_vote_gas == 500_000
+    assert report.execute_gas is None
+    assert report.errors == {EXECUTE_VOTE_ERROR: "vote not passed"}
@@ -0,0 +1,52 @@
+from collections import OrderedDict
+
+import ape
+from ethpm_types import ContractType
+
+from curve_dao import decoder_utils
+from curve_dao.addresses import VOTING_ESCROW
+from curve_dao.decoder_utils import (
+    build_function_selector,
+    decode_input,
+    get_selector_index,
+)
+
+
+def test_selector_index_matches_abi():
+    voting_escrow = ape.Contract(VOTING_ESCROW)
+    index = get_selector_index(voting_escrow.contract_type)
+
+    functions = [i for i in voting_escrow.contract_type.abi if i.type == "function"]
+    assert len(index) == len(functions)
+    for fn in functions:
+        assert index[build_function_selector(fn)] == fn
+
+
+def test_selector_index_is_shared():
+    voting_escrow = ape.Contract(VOTING_ESCROW)
+    contract_type = voting_escrow.contract_type
+    copied_type = contract_type.copy()
+
+    assert get_selector_index(contract_type) is get_selector_index(copied_type)
+
+
+def test_decode_input_uses_index():
+    voting_escrow = ape.Contract(VOTING_ESCROW)
+    calldata = voting_escrow.balanceOf.encode_input(VOTING_ESCROW)
+
+    fn, inputs = decode_input(voting_escrow, calldata)
+    assert fn.name == "balanceOf"
+    assert inputs == [VOTING_ESCROW]
+
+
+def test_contract_type_indexes_are_bounded(monkeypatch):
+    monkeypatch.setattr(decoder_utils, "CONTRACT_TYPE_INDEXES_SIZE", 2)
+    monkeypatch.setattr(decoder_utils, "_CONTRACT_TYPE_INDEXES", OrderedDict())
+    abi = [{"type": "function", "name": "kill", "inputs": [], "outputs": []}]
+    contract_types = [ContractType(abi=abi) for _ in range(3)]
+
+    indexes = [get_selector_index(c) for c in contract_types]
+
+    assert all(index is indexes[0] for index in indexes)
+    assert len(decoder_utils._CONTRACT_TYPE_INDEXES) == 2
+    assert id(contract_types[0]) not in decoder_utils._CONTRACT_TYPE_INDEXES
@@ -0,0 +1,85 @@
+import pytest
+from eth_hash.auto import keccak
+
+from curve_dao import signature_db as signature_db_module
+from curve_dao.abi_registry import AbiRegistry
+from curve_dao.addresses import CURVE_DAO_OWNERSHIP, VOTING_ESCROW
+from curve_dao.decoder_utils import (
+    GuessedMethodABI,
+    UndecodedMethodABI,
+    decode_input,
+    method_abi_from_signature,
+)
+from curve_dao.signature_db import SignatureDB
+
+try:
+    from eth_abi import encode_abi
+except ImportError:
+    from eth_abi import encode as encode_abi
+
+SIGNATURE_DUMP = """\
+# selector signature
+0x4344ce71 set_killed(address,bool)
+0xa9059cbb,transfer(address,uint256)
+set_gauge_weights((address,uint256)[])
+"""
+
+
+@pytest.fixture
+def signature_db(tmp_path, monkeypatch):
+    dump = tmp_path / "signatures.txt"
+    dump.write_text(SIGNATURE_DUMP)
+
+    db = SignatureDB(tmp_path / "signatures.sqlite")
+    assert db.load_dump(dump) == 3
+    monkeypatch.setattr(signature_db_module, "_SIGNATURE_DB", db)
+    yield db
+    db.close()
+
+
+def test_lookup(signature_db):
+    assert len(signature_db) == 3
+    assert signature_db.lookup("0xa9059cbb") == ["transfer(address,uint256)"]
+    selector = keccak(b"set_gauge_weights((address,uint256)[])")[:4]
+    assert signature_db.lookup(selector) == ["set_gauge_weights((address,uint256)[])"]
+    assert signature_db.lookup("0x00000000") == []
+
+
+def test_method_abi_from_signature():
+    abi = method_abi_from_signature("f(uint256,(address,bool[])[],bytes)")
+
+    assert abi.name == "f"
+    assert [i.canonical_type for i in abi.inputs] == [
+        "uint256",
+        "(address,bool[])[]",
+        "bytes",
+    ]
+    assert method_abi_from_signature("g()").inputs == []
+
+
+def test_decode_input_falls_back_to_signature_db(signature_db):
+    registry = AbiRegistry()
+    registry.load_bundled_abis()
+    voting_escrow = registry.get_contract(VOTING_ESCROW)
+
+    # VotingEscrow has no `transfer`
+    calldata = keccak(b"transfer(address,uint256)")[:4] + encode_abi(
+        ["address", "uint256"], [CURVE_DAO_OWNERSHIP["agent"], 10**18]
+    )
+    fn, inputs = decode_input(voting_escrow, calldata)
+
+    assert isinstance(fn, GuessedMethodABI)
+    assert fn.name == "transfer"
+    assert inputs == [CURVE_DAO_OWNERSHIP["agent"], 10**18]
+
+
+def test_unknown_selector_is_undecoded(signature_db):
+    registry = AbiRegistry()
+    registry.load_bundled_abis()
+    voting_escrow = registry.get_contract(VOTING_ESCROW)
+
+    fn, inputs = decode_input(voting_escrow, bytes.fromhex("deadbeef0102"), False)
+
+    assert isinstance(fn, UndecodedMethodABI)
+    assert fn.name == "0xdeadbeef"
+    assert inputs == (b"\x01\x02",)
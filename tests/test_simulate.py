@@ -0,0 +1,72 @@
+import ape
+import pytest
+
+from curve_dao.addresses import CRYPTOSWAP_OWNER_PROXY, CURVE_DAO_OWNERSHIP
+from curve_dao.simulate import preflight, simulate_actions_batch
+
+
+@pytest.fixture(scope="module")
+def crypto_factory_gauge():
+    # JPEGpETH gauge
+    yield ape.Contract("0x762648808ef8b25c6d92270b1c84ec97df3bed6b")
+
+
+@pytest.fixture(scope="module")
+def tricrypto_ng_gauge():
+    # TriCryptoINV gauge
+    yield ape.Contract("0x4fc86cd0f9b650280fa783e3116258e0e0496a2c")
+
+
+def test_simulate_actions_batch(
+    vote_deployer, crypto_factory_gauge, tricrypto_ng_gauge
+):
+    action_lists = [
+        [(CRYPTOSWAP_OWNER_PROXY, "set_killed", crypto_factory_gauge.address, True)],
+        [(tricrypto_ng_gauge.address, "set_killed", True)],
+        # not the owner: the vote passes but execution reverts
+        [(crypto_factory_gauge.address, "set_killed", True)],
+    ]
+    watch = [
+        (crypto_factory_gauge.address, "is_killed"),
+        (tricrypto_ng_gauge.address, "is_killed"),
+    ]
+    height = ape.chain.blocks.height
+
+    results = simulate_actions_batch(
+        CURVE_DAO_OWNERSHIP, action_lists, vote_deployer, watch=watch
+    )
+
+    assert [result.executed for result in results] == [True, True, False]
+    assert results[0].gas_used > 0
+    assert list(results[0].state_diff.values()) == [(False, True)]
+    assert list(results[1].state_diff.values()) == [(False, True)]
+    assert results[2].error
+
+    # every vote ran from the same state, and the fork was reverted after
+    assert results[0].vote_id == results[1].vote_id
+    assert ape.chain.blocks.height == height
+    assert crypto_factory_gauge.is_killed() is False
+    assert tricrypto_ng_gauge.is_killed() is False
+
+
+def test_preflight(crypto_factory_gauge):
+    actions = [
+        # not the owner: reverts
+        (crypto_factory_gauge.address, "set_killed", True),
+        (CRYPTOSWAP_OWNER_PROXY, "set_killed", crypto_factory_gauge.address, True),
+    ]
+    height = ape.chain.blocks.height
+
+    results = preflight(
+        CURVE_DAO_OWNERSHIP,
+        actions,
+        watch=[(crypto_factory_gauge.address, "is_killed")],
+    )
+
+    assert [result.success for result in results] == [False, True]
+    assert results[0].error
+    assert results[1].gas_used > 0
+    assert list(results[1].state_diff.values()) == [(False, True)]
+
+    assert ape.chain.blocks.height == height
+    assert crypto_factory_gauge.is_killed() is False
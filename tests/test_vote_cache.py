@@ -0,0 +1,126 @@
+import pytest
+from eth_hash.auto import keccak
+
+from curve_dao import vote_cache
+from curve_dao.abi_registry import AbiRegistry
+from curve_dao.addresses import CURVE_DAO_OWNERSHIP, VOTING_ESCROW
+from curve_dao.cache import DiskCache
+from curve_dao.decoded import VoteTally
+from curve_dao.evmscript import encode_evm_script
+from curve_dao.vote_cache import is_final, load_vote, store_vote
+from curve_dao.vote_utils import (
+    decode_vote_script,
+    load_decoded_vote,
+    store_decoded_vote,
+)
+
+try:
+    from eth_abi import encode_abi
+except ImportError:
+    from eth_abi import encode as encode_abi
+
+
+@pytest.fixture
+def tmp_vote_cache(tmp_path, monkeypatch):
+    cache = DiskCache("votes", cache_dir=tmp_path)
+    monkeypatch.setattr(vote_cache, "VOTE_CACHE", cache)
+    yield cache
+
+
+@pytest.fixture(scope="module")
+def script():
+    calldata = keccak(b"commit_transfer_ownership(address)")[:4] + encode_abi(
+        ["address"], [CURVE_DAO_OWNERSHIP["voting"]]
+    )
+    agent_calldata = keccak(b"execute(address,uint256,bytes)")[:4] + encode_abi(
+        ["address", "uint256", "bytes"], [VOTING_ESCROW, 0, calldata]
+    )
+    return encode_evm_script([(CURVE_DAO_OWNERSHIP["agent"], agent_calldata)] * 2)
+
+
+@pytest.fixture(scope="module")
+def actions(script):
+    registry = AbiRegistry()
+    registry.load_bundled_abis()
+    return decode_vote_script(script, registry=registry)
+
+
+def tally(open=False, executed=True, yes=600):
+    return VoteTally(
+        1692475643, 1000, open, executed, yes, 0, 51 * 10**16, 30 * 10**16
+    )
+
+
+def test_is_final():
+    assert is_final(tally())
+    assert not is_final(tally(open=True, executed=False))
+    # passed, can still be executed
+    assert not is_final(tally(executed=False))
+    # failed quorum, can never be executed
+    assert is_final(tally(executed=False, yes=100))
+
+
+def test_round_trip(tmp_vote_cache, script, actions):
+    assert load_vote("ownership", 404, script) is None
+    store_vote("ownership", 404, script, "QmHash", actions, tally())
+
+    ipfs_hash, cached_actions, results = load_vote("ownership", 404, script)
+
+    assert ipfs_hash == "QmHash"
+    assert [a.to_dict() for a in cached_actions] == [a.to_dict() for a in actions]
+    assert [a.raw_inputs for a in cached_actions] == [a.raw_inputs for a in actions]
+    assert cached_actions[0].method is cached_actions[1].method
+    assert results == tally()
+    # keyed by script hash: a different script for the same vote ID misses
+    assert load_vote("ownership", 404, script + b"\x00") is None
+
+
+def test_open_vote_tally_not_cached(tmp_vote_cache, script, actions):
+    store_vote("ownership", 405, script, "QmHash", actions, tally(open=True))
+
+    _, cached_actions, results = load_vote("ownership", 405, script)
+    assert len(cached_actions) == 2
+    assert results is None
+
+
+def test_undecoded_vote_not_cached(tmp_vote_cache):
+    registry = AbiRegistry()
+    registry.load_bundled_abis()
+    agent_calldata = keccak(b"execute(address,uint256,bytes)")[:4] + encode_abi(
+        ["address", "uint256", "bytes"],
+        [VOTING_ESCROW, 0, bytes.fromhex("deadbeef0102")],
+    )
+    script = encode_evm_script([(CURVE_DAO_OWNERSHIP["agent"], agent_calldata)])
+    actions = decode_vote_script(script, registry=registry)
+    assert actions[0].undecoded
+
+    # a newer signature database or a verified contract may decode it later
+    store_vote("ownership", 406, script, "QmHash", actions, tally())
+    assert load_vote("ownership", 406, script) is None
+
+
+def test_load_decoded_vote_refreshes_open_results(tmp_vote_cache, script, actions):
+    vote = {
+        "open": True,
+        "executed": False,
+        "startDate": 1692475643,
+        "snapshotBlock": 17950000,
+        "supportRequired": 51 * 10**16,
+        "minAcceptQuorum": 30 * 10**16,
+        "yea": 600,
+        "nay": 0,
+        "votingPower": 1000,
+        "script": script,
+    }
+    assert load_decoded_vote(407, "ownership", vote) is None
+    results = store_decoded_vote(407, "ownership", vote, "QmHash", actions)
+
+    ipfs_hash, cached_actions, cached_results = load_decoded_vote(
+        407, "ownership", vote
+    )
+    assert ipfs_hash == "QmHash"
+    assert len(cached_actions) == 2
+    # not final, so not cached: decoded again from the vote
+    assert cached_results == results
+    assert cached_results.open
+    assert load_decoded_vote(407, "ownership", vote, use_cache=False) is None
@@ -29,3 +29,14 @@ def test_vote_data_ended(vote_deployer):
     assert decode["no"] == expected_data["no"]
     assert decode["support"] == expected_data["support"]
     assert decode["quorum"] == expected_data["quorum"]
+    # thresholds are read from the vote, not hard-coded per DAO
+    assert decode["required_support"] == 0.51
+    assert decode["required_quorum"] == 0.30
+
+
+def test_emergency_vote_thresholds(vote_deployer):
+    data = get_vote_data(0, "emergency")
+    decode = decode_vote_data(data, "emergency")
+
+    assert decode["required_support"] == data["supportRequired"] / 10**18
+    assert decode["required_quorum"] == data["minAcceptQuorum"] / 10**18
@@ -0,0 +1,44 @@
+import pytest
+
+from curve_dao import vote_index as vote_index_module
+from curve_dao.ipfs import get_ipfs_hash_from_vote_id
+from curve_dao.vote_index import VoteIndex
+from curve_dao.vote_utils import get_vote
+
+
+@pytest.fixture
+def vote_index(tmp_path):
+    index = VoteIndex(tmp_path / "vote_index.sqlite")
+    yield index
+    index.close()
+
+
+def test_sync_and_lookup(vote_index, monkeypatch):
+    vote_id = 404
+    snapshot_block = get_vote(vote_id, "ownership")["snapshotBlock"]
+    expected_ipfs_hash = get_ipfs_hash_from_vote_id("ownership", vote_id)
+
+    # start just before the vote so the test only fetches a few blocks
+    monkeypatch.setattr(vote_index_module, "VOTING_START_BLOCK", snapshot_block - 1)
+    last_block = vote_index.sync("ownership", stop_block=snapshot_block + 10, step=5)
+
+    assert last_block == snapshot_block + 10
+    assert vote_index.get_checkpoint("ownership") == last_block
+
+    start_vote = vote_index.get_start_vote("ownership", vote_id)
+    assert start_vote["metadata"] == f"ipfs:{expected_ipfs_hash}"
+    assert vote_index.get_start_vote("ownership", vote_id + 1) is None
+
+    # resuming from the checkpoint does not re-fetch indexed blocks
+    assert vote_index.sync("ownership", stop_block=last_block) == last_block
+
+
+def test_ipfs_hash_served_from_index(vote_index, monkeypatch):
+    monkeypatch.setattr(vote_index_module, "_VOTE_INDEX", vote_index)
+    with vote_index._db:
+        vote_index._db.execute(
+            "INSERT INTO start_vote VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            ("ownership", 404, "0x0", "ipfs:QmTest", "0", "0", "0", "0", 0, "0x"),
+        )
+
+    assert get_ipfs_hash_from_vote_id("ownership", 404) == "QmTest"
@@ -0,0 +1,32 @@
+from curve_dao.vote_reader import get_votes, get_voting_params
+from curve_dao.vote_utils import get_vote
+
+
+def test_get_votes_matches_get_vote():
+    vote_ids = [403, 404, 405]
+    votes = get_votes("ownership", vote_ids, batch_size=2)
+
+    assert list(votes) == vote_ids
+    for vote_id, record in votes.items():
+        vote = get_vote(vote_id, "ownership")
+        assert record.vote_id == vote_id
+        assert record.yea == vote["yea"]
+        assert record["votingPower"] == vote["votingPower"]
+        assert record["snapshotBlock"] == vote["snapshotBlock"]
+        assert record.script == vote["script"]
+
+
+def test_get_votes_skips_missing():
+    params = get_voting_params("parameter")
+    votes = get_votes("parameter", [params.votes_length - 1, params.votes_length])
+
+    assert list(votes) == [params.votes_length - 1]
+
+
+def test_get_voting_params():
+    params = get_voting_params("ownership")
+
+    assert params.votes_length > 404
+    assert params.vote_time == 604800
+    assert params.support_required_pct == 51 * 10**16
+    assert params.min_accept_quorum_pct == 30 * 10**16
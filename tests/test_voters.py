@@ -0,0 +1,64 @@
+import numpy as np
+import pytest
+
+from curve_dao.addresses import CONVEX_VOTERPROXY
+from curve_dao.vote_index import VoteIndex
+from curve_dao.voters import WEI, CastVote, VoterAggregator, aggregate_cast_votes
+
+ALICE = "0x00000000000000000000000000000000000A11CE"
+BOB = "0x0000000000000000000000000000000000000B0B"
+CONVEX = "0x989aEb4d175e16225E39E87d0D97A3360524AD80"
+
+
+def test_aggregate_cast_votes():
+    aggregator = VoterAggregator().update(
+        [
+            CastVote(1, ALICE, True, 10 * WEI, 100),
+            CastVote(1, CONVEX, True, 30 * WEI, 101),
+            CastVote(1, BOB, True, 10 * WEI, 102),
+            # the voter changes their vote: the ballot replaces the previous one
+            CastVote(1, BOB, False, 10 * WEI, 103),
+            CastVote(2, ALICE, False, 10 * WEI, 200),
+        ]
+    )
+
+    assert len(aggregator) == 2
+    summary = aggregator.vote_summary(1)
+    assert summary["voters"] == 3
+    assert summary["yea"] == 40 * WEI
+    assert summary["nay"] == 10 * WEI
+    assert summary["voter_stake"] == 30 * WEI
+    assert summary["voter_share"] == 0.6
+    assert aggregator.convex_shares() == {1: 0.6, 2: 0.0}
+
+    top = aggregator.top_voters(2, by="votes")
+    assert top[0] == {"voter": ALICE, "votes": 2, "yea": 1, "nay": 1, "stake": 20}
+    assert aggregator.top_voters(1)[0]["voter"] == CONVEX
+    with pytest.raises(ValueError):
+        aggregator.top_voters(by="weight")
+
+    # a changed vote does not count twice towards turnout
+    blocks, turnout = aggregator.turnout(1, voting_power=100 * WEI)
+    assert blocks.tolist() == [100, 101, 102]
+    assert np.allclose(turnout, [0.1, 0.4, 0.5])
+    assert CONVEX.lower() == CONVEX_VOTERPROXY.lower()
+
+
+def test_aggregate_from_index(tmp_path):
+    index = VoteIndex(tmp_path / "vote_index.sqlite")
+    with index._db:
+        index._db.executemany(
+            "INSERT INTO cast_vote VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            [
+                ("ownership", 1, ALICE, 1, str(10**27), 100, 0, "0x"),
+                ("ownership", 1, BOB, 0, str(10), 100, 1, "0x"),
+                ("parameter", 1, BOB, 1, str(10), 100, 2, "0x"),
+            ],
+        )
+
+    aggregator = aggregate_cast_votes("ownership", index=index)
+    summary = aggregator.vote_summary(1)
+    assert summary["yea"] == 10**27
+    assert summary["nay"] == 10
+    assert len(aggregator.voters) == 2
+    index.close()